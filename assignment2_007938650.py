@@ -1,9 +1,35 @@
+import time  # Importing time first so the startup report covers every other import
+STARTED = time.perf_counter()  # Reference point for the startup report
 import tkinter as tk  # Importing tkinter module as 'tk' to create GUI applications
 from tkinter import Tk, Canvas, Button, BOTH, Toplevel, Label, messagebox, ttk  # Importing specific tkinter classes for GUI components
 from tkinter import *  # Importing all tkinter functions and classes
-from PIL import Image, ImageTk  # Importing PIL's Image and ImageTk for handling images in GUI
+from tkinter import filedialog  # Importing the file dialog for exports
+from datetime import date, datetime  # Importing datetime for the dashboard date range
+import atexit  # Importing atexit to flush pending submissions on exit
 import json  # Importing JSON module for reading and writing JSON files
 import os  # Importing OS module for file and directory operations
+from survey_core import metrics  # Importing the latency metrics
+from survey_core.archive import Archive, ArchiveError  # Importing the memory-mapped columnar archive
+from survey_core.config import get_config  # Importing the app configuration
+from survey_core.export import ExportJob  # Importing the streaming export
+from survey_core.model import OPTIONS, QUESTIONS, ValidationError, validate_answers, validate_viewer  # Importing the survey definition and form validation
+from survey_core.storage import MigrationJob, get_storage  # Importing the append-only survey storage and the legacy migration
+from survey_core.submissions import queue_data, queue_survey_answers  # Importing the submission handling
+from survey_core.writer import close_writer  # Importing the background writer shutdown
+from survey_ui.analysis_panel import build_age_chart, build_analysis_notebook  # Importing the detailed analysis tabs and age chart
+from survey_ui.filter_bar import FilterBar  # Importing the dashboard filter controls
+from survey_ui.images import ImageCache  # Importing the illustration cache
+from survey_ui.loader import BackgroundLoader  # Importing the background loader for dashboard rows
+from survey_ui.performance import LagMonitor, open_performance_panel  # Importing the event-loop monitor and Performance panel
+from survey_ui.scene import Scene  # Importing the retained-mode canvas layout
+from survey_ui.virtual_grid import VirtualGrid  # Importing the virtualized table for the dashboard
+
+startup = metrics.Stopwatch(STARTED)  # Checkpoints for the startup report
+startup.mark("imports")
+
+ILLUSTRATION_PATH = "sculpture-removebg-preview.png"  # Replace with your image path
+ILLUSTRATION_SIZE = (400, 300)  # Size the illustration is drawn at on the landing page
+DATE_FORMAT = "%Y-%m-%d"  # Format of the dashboard date range
 
 
 def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius=25, **kwargs):  # Function to draw a rounded rectangle
@@ -50,10 +76,22 @@ def create_rounded_button(canvas, x, y, width, height, text, bg, fg, command):
     canvas.tag_bind(button_text, "<Button-1>", on_click)
 
 
+@metrics.timed("page.admin_dashboard")
 def open_admin_dashboard():
     """Open the admin dashboard to display survey data."""
     dashboard_window = Toplevel()
     dashboard_window.title("Admin Dashboard")
+
+    # Show a columnar archive instead of the live data when one is configured
+    archive = None
+    if get_config()["archive"]:
+        try:
+            archive = Archive(get_config()["archive"])
+            dashboard_window.title("Admin Dashboard (archive)")
+        except (OSError, ArchiveError) as e:
+            messagebox.showerror("Archive", f"Could not open the archive, showing live data: {str(e)}")
+    # Records parsed by an earlier dashboard stay cached; only new submissions are read
+    data = archive or get_storage().cached()
     dashboard_window.geometry("900x600")
     dashboard_window.configure(bg="#EDF2F4")
 
@@ -64,80 +102,181 @@ def open_admin_dashboard():
     # Add rounded rectangle (white card)
     create_rounded_rectangle(dashboard_canvas, 50, 50, 850, 550, radius=40, fill="#FFFFFF", outline="#FFFFFF")
 
-    # Add title
-    dashboard_canvas.create_text(450, 90, text="Admin Dashboard", font=("Arial", 26, "bold"), fill="#2B2D42")
-
-    # Create a table to display survey data
-    tree = ttk.Treeview(dashboard_window, columns=("Name", "Question", "Answer"), show="headings")
-    tree.heading("Name", text="Name")
-    tree.heading("Question", text="Question")
-    tree.heading("Answer", text="Answer")
-    tree.column("Name", width=200, anchor="center")
-    tree.column("Question", width=400, anchor="center")
-    tree.column("Answer", width=200, anchor="center")
-    tree.place(x=70, y=150, width=760, height=340)
-
-    # Add a vertical scrollbar for the Treeview
-    scrollbar = ttk.Scrollbar(dashboard_window, orient="vertical", command=tree.yview)
-    tree.configure(yscrollcommand=scrollbar.set)
-    scrollbar.place(x=830, y=150, height=340)
-
-    # Load survey data
-    filename = "survey_data.json"
-    if os.path.exists(filename):
-        try:
-            with open(filename, "r") as file:
-                # Attempt to load all JSON arrays
-                all_data = []
-                for chunk in file.read().split("]["):  # Split at ][
-                    if not chunk.startswith("["):
-                        chunk = "[" + chunk
-                    if not chunk.endswith("]"):
-                        chunk = chunk + "]"
-                    all_data.extend(json.loads(chunk))
-
-                # Insert data into the Treeview
-                for entry in all_data:
-                    name = entry.get("name", "Unknown")
-                    answers = entry.get("answers", {})
-                    if isinstance(answers, dict):  # Ensure answers are in the correct format
-                        for question, answer in answers.items():
-                            tree.insert("", "end", values=(name, question, answer))
-                    else:
-                        messagebox.showwarning("Invalid Data", f"Answers for {name} are not properly formatted.")
-        except json.JSONDecodeError as e:
-            messagebox.showerror("JSON Error", f"Error reading JSON file: {str(e)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+    # Add title; partitioned storage shows a date range next to it
+    if data.partitioned:
+        dashboard_canvas.create_text(70, 78, text="Admin Dashboard", font=("Arial", 26, "bold"), fill="#2B2D42", anchor="w")
     else:
-        messagebox.showinfo("No Data", "No survey data available.")
+        dashboard_canvas.create_text(450, 80, text="Admin Dashboard", font=("Arial", 26, "bold"), fill="#2B2D42")
+
+    # Filter bar; enabled once the rows are indexed (see survey_core.search)
+    index = None
+    sort_state = {"column": None, "descending": False}
+    filter_bar = FilterBar(dashboard_window, on_change=lambda: apply_filters())
+    filter_bar.place(x=70, y=104, width=760, height=26)
+
+    # Create a table to display survey data; only the rows in view are materialized
+    grid = VirtualGrid(
+        dashboard_window,
+        columns=("Name", "Question", "Answer"),
+        widths={"Name": 200, "Question": 400, "Answer": 200},
+        on_heading=lambda column: sort_by(column),
+    )
+    grid.place(x=70, y=162, width=760, height=328)
+
+    # Progress indicator and cancel button shown while the data loads
+    progress = ttk.Progressbar(dashboard_window, orient="horizontal", mode="determinate", maximum=1.0)
+    progress.place(x=70, y=140, width=560, height=14)
+    status_label = Label(dashboard_window, text="Loading...", font=("Arial", 10), bg="#FFFFFF", fg="#555555")
+    status_label.place(x=640, y=137)
+    cancel_button = ttk.Button(dashboard_window, text="Cancel")
+    cancel_button.place(x=740, y=134, width=90, height=24)
+
+    def on_batch(source):
+        """Show the rows loaded so far without waiting for the rest."""
+        if source is not loader.source:
+            return  # Rows of a date range that was replaced
+        grid.invalidate()
+        progress["value"] = source.progress()
+        status_label.config(text=f"{len(source)} rows")
+
+    def on_done(source, error):
+        """Hide the progress widgets and report the outcome of the load."""
+        if not dashboard_window.winfo_exists() or source is not loader.source:
+            return
+        progress.place_forget()
+        cancel_button.place_forget()
+        status_label.config(text=f"{len(source)} rows" + (" (cancelled)" if loader.cancelled.is_set() else ""))
+        if isinstance(error, json.JSONDecodeError):
+            messagebox.showerror("JSON Error", f"Error reading JSON file: {str(error)}")
+        elif error is not None:
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(error)}")
+        elif not len(source) and not loader.cancelled.is_set():
+            messagebox.showinfo("No Data", "No survey data available.")
+        elif not loader.cancelled.is_set():
+            start_indexing()
+
+    def start_indexing():
+        """Build the search index in the background, then enable the filter bar."""
+        from survey_core import search  # Importing the dashboard row index on first use; NumPy is slow to import
+
+        if not search.available():
+            status_label.config(text=f"{len(source)} rows (filters need NumPy)")
+            return
+        status_label.config(text=f"{len(source)} rows, indexing...")
+        builder = search.IndexBuilder(data)
 
-    def view_analysis():
-        """Display statistical analysis of viewers data."""
-        # Load viewers data from the JSON file
-        filename = "viewers_data.json"
-        if not os.path.exists(filename):
-            messagebox.showinfo("No Data", "No viewers data available.")
+        def on_indexed(builder, error):
+            nonlocal index
+            if not dashboard_window.winfo_exists() or builder.data is not data:
+                return
+            if error is not None or builder.index is None:
+                status_label.config(text=f"{len(source)} rows (filters unavailable)")
+                return
+            index = builder.index
+            filter_bar.set_choices(index.vocabularies)
+            filter_bar.set_enabled(True)
+            status_label.config(text=f"{len(source)} rows")
+
+        indexer = BackgroundLoader(dashboard_window, builder, on_done=on_indexed)
+        dashboard_window.bind(
+            "<Destroy>", lambda event: indexer.cancel() if event.widget is dashboard_window else None, add="+"
+        )
+        indexer.start()
+
+    @metrics.timed("dashboard.filter")
+    def apply_filters():
+        """Show the rows matching the filter bar, in the chosen order."""
+        if index is None:
+            return
+        filters = filter_bar.filters()
+        if not filters and sort_state["column"] is None:
+            grid.set_source(source)  # Back to the live rows
+            status_label.config(text=f"{len(source)} rows")
             return
+        view = index.query(filters, sort=sort_state["column"], descending=sort_state["descending"])
+        grid.set_source(view)
+        status_label.config(text=f"{len(view)} of {len(index)} rows")
+
+    def sort_by(column):
+        """Sort by a clicked heading; clicking it again reverses the order."""
+        if index is None:
+            return
+        field = column.lower()
+        if sort_state["column"] == field:
+            sort_state["descending"] = not sort_state["descending"]
+        else:
+            sort_state["column"], sort_state["descending"] = field, False
+        grid.set_sort_indicator(column, sort_state["descending"])
+        apply_filters()
+
+    def load_rows():
+        """Load the rows of ``data`` on a worker thread; the window stays usable meanwhile."""
+        nonlocal source, loader, index
+        index = None
+        filter_bar.set_enabled(False)
+        source = data.answer_row_source()
+        grid.set_source(source)
+        progress["value"] = 0
+        progress.place(x=70, y=140, width=560, height=14)
+        cancel_button.place(x=740, y=134, width=90, height=24)
+        status_label.config(text="Loading...")
+        loader = BackgroundLoader(dashboard_window, source, on_batch=on_batch, on_done=on_done)
+        cancel_button.config(command=loader.cancel)
+        loader.start()
+
+    source = loader = None
+    load_rows()
+    dashboard_window.bind(
+        "<Destroy>", lambda event: loader.cancel() if event.widget is dashboard_window else None, add="+"
+    )
+    if archive is not None:
+        # Unmap the archive with the window (a worker still reading it keeps the mapping until it finishes)
+        dashboard_window.bind(
+            "<Destroy>", lambda event: archive.close() if event.widget is dashboard_window else None, add="+"
+        )
 
+    def apply_date_range():
+        """Show only the partitions between the From and To dates (blank for no limit)."""
+        nonlocal data
         try:
-            with open(filename, "r") as file:
-                data = json.load(file)
+            start, end = (
+                datetime.strptime(entry.get().strip(), DATE_FORMAT).date() if entry.get().strip() else None
+                for entry in (from_entry, to_entry)
+            )
+        except ValueError:
+            messagebox.showerror("Date Range", f"Enter dates as YYYY-MM-DD, e.g. {date.today():{DATE_FORMAT}}.")
+            return
+        loader.cancel()
+        data = storage.between(start, end)
+        dashboard_window.title(f"Admin Dashboard ({start or 'start'} to {end or 'today'})")
+        load_rows()
+
+    # Date range of a partitioned store; only the partitions it overlaps are read
+    storage = data
+    if data.partitioned:
+        Label(dashboard_window, text="From", font=("Arial", 10), bg="#FFFFFF").place(x=470, y=68)
+        from_entry = ttk.Entry(dashboard_window, width=11)
+        from_entry.place(x=508, y=66, width=100)
+        Label(dashboard_window, text="To", font=("Arial", 10), bg="#FFFFFF").place(x=618, y=68)
+        to_entry = ttk.Entry(dashboard_window, width=11)
+        to_entry.place(x=642, y=66, width=100)
+        ttk.Button(dashboard_window, text="Apply", command=apply_date_range).place(x=752, y=64, width=78, height=26)
+
+    @metrics.timed("page.view_analysis")
+    def view_analysis():
+        """Display statistical analysis of viewers data."""
+        try:
+            # Calculate statistics in the storage backend (or read them from the archive header)
+            stats = data.viewer_stats()
 
-            if not data:
+            if not stats["count"]:
                 messagebox.showinfo("No Data", "No viewers data available.")
                 return
 
-            # Calculate statistics
-            ages = [entry.get("age", 0) for entry in data if isinstance(entry.get("age"), (int, float))]
-            total_viewers = len(data)
-            avg_age = sum(ages) / total_viewers if total_viewers > 0 else 0
-
-            # Calculate standard deviation of age
-            variance = sum((age - avg_age) ** 2 for age in ages) / total_viewers if total_viewers > 0 else 0
-            std_dev = variance ** 0.5
-
-            num_females = sum(1 for entry in data if entry.get("sex") == "Female")
+            avg_age = stats["mean_age"]
+            std_dev = stats["std_age"]
+            num_females = stats["females"]
+            median_age, p10_age, p90_age = stats["median_age"], stats["p10_age"], stats["p90_age"]
 
         except json.JSONDecodeError:
             messagebox.showerror("Error", "The data file is corrupted.")
@@ -146,32 +285,75 @@ def open_admin_dashboard():
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
             return
 
+        # Detailed breakdowns need NumPy; without it the window shows the summary only
+        from survey_core import analytics  # Importing the analytics engine on first use; NumPy is slow to import
+
         # Create the analysis window
         analysis_window = Toplevel()
         analysis_window.title("Statistical Analysis")
-        analysis_window.geometry("600x400")
+        analysis_window.geometry("900x700")
         analysis_window.configure(bg="#EDF2F4")
 
         # Canvas for design
-        analysis_canvas = Canvas(analysis_window, width=600, height=400, bg="#A0E1F5", highlightthickness=0)
+        analysis_canvas = Canvas(analysis_window, width=900, height=700, bg="#A0E1F5", highlightthickness=0)
         analysis_canvas.place(x=0, y=0)
 
         # Add rounded rectangle (white card)
-        create_rounded_rectangle(analysis_canvas, 50, 50, 550, 350, radius=40, fill="#FFFFFF", outline="#FFFFFF")
+        create_rounded_rectangle(analysis_canvas, 50, 50, 850, 650, radius=40, fill="#FFFFFF", outline="#FFFFFF")
 
         # Add title
-        analysis_canvas.create_text(300, 100, text="Statistical Analysis", font=("Arial", 24, "bold"), fill="#2B2D42")
+        analysis_canvas.create_text(450, 95, text="Statistical Analysis", font=("Arial", 24, "bold"), fill="#2B2D42")
 
         # Display statistics
-        analysis_canvas.create_text(300, 180, text=f"Average Age: {avg_age:.2f}", font=("Arial", 16), fill="#555555")
-        analysis_canvas.create_text(300, 220, text=f"Standard Deviation: {std_dev:.2f}", font=("Arial", 16), fill="#555555")
-        analysis_canvas.create_text(300, 260, text=f"Number of Females: {num_females}", font=("Arial", 16), fill="#555555")
+        analysis_canvas.create_text(230, 145, text=f"Average Age: {avg_age:.2f}", font=("Arial", 14), fill="#555555")
+        analysis_canvas.create_text(450, 145, text=f"Standard Deviation: {std_dev:.2f}", font=("Arial", 14), fill="#555555")
+        analysis_canvas.create_text(670, 145, text=f"Number of Females: {num_females}", font=("Arial", 14), fill="#555555")
+        if median_age is not None:
+            analysis_canvas.create_text(
+                450, 172, text=f"Median Age: {median_age:.1f}    10th-90th Percentile: {p10_age:.1f} - {p90_age:.1f}",
+                font=("Arial", 12), fill="#555555",
+            )
+
+        def show_age_chart(message):
+            analysis_canvas.itemconfig(notice, text=message)
+            build_age_chart(analysis_window, stats["age_histogram"]).place(x=80, y=225, width=740, height=340)
+
+        def on_report(job, error):
+            """Show the answer distributions and demographic breakdowns once they are computed."""
+            if not analysis_window.winfo_exists() or reporter.cancelled.is_set():
+                return
+            if error is not None or job.report is None:
+                show_age_chart("The detailed analysis is unavailable.")
+                if error is not None:
+                    messagebox.showwarning("Analysis", f"Detailed analysis is unavailable: {str(error)}")
+                return
+            detailed_report = job.report
+            # The chart uses the running age histogram, like the figures above it
+            detailed_report["age_histogram"] = stats["age_histogram"]
+            analysis_canvas.delete(notice)
+            build_analysis_notebook(analysis_window, detailed_report).place(x=80, y=192, width=740, height=373)
+
+        # Display answer distributions and demographic breakdowns, read on a worker thread
+        if analytics.available():
+            notice = analysis_canvas.create_text(
+                450, 205, text="Loading answer and demographic breakdowns...", font=("Arial", 12), fill="#999999",
+            )
+            reporter = BackgroundLoader(
+                analysis_window, analytics.ReportJob(data, from_archive=archive is not None), on_done=on_report
+            )
+            analysis_window.bind(
+                "<Destroy>", lambda event: reporter.cancel() if event.widget is analysis_window else None, add="+"
+            )
+            reporter.start()
+        else:
+            notice = analysis_canvas.create_text(450, 205, text="", font=("Arial", 12), fill="#999999")
+            show_age_chart("Install NumPy to see answer and demographic breakdowns.")
 
         # Add rounded button for close
         create_rounded_button(
             analysis_canvas,
-            x=300,
-            y=320,
+            x=450,
+            y=605,
             width=120,
             height=40,
             text="Close",
@@ -193,6 +375,74 @@ def open_admin_dashboard():
         command=view_analysis,
     )
 
+    exporter = None
+
+    def export_results():
+        """Stream the rows matching the filter bar to a CSV or JSON Lines file on a worker thread."""
+        nonlocal exporter
+        if archive is not None:
+            messagebox.showinfo("Export", "Export reads the live survey data; clear the archive setting to export.")
+            return
+        if exporter is not None and exporter.thread.is_alive():
+            messagebox.showinfo("Export", "An export is already running.")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=dashboard_window,
+            title="Export Results",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("Compressed CSV", "*.csv.gz"),
+                ("JSON Lines", "*.jsonl"),
+                ("Compressed JSON Lines", "*.jsonl.gz"),
+            ],
+        )
+        if not path:
+            return
+        job = ExportJob(data, path, filters=filter_bar.filters())
+        previous_status = status_label.cget("text")
+        progress["value"] = 0
+        progress.place(x=70, y=140, width=560, height=14)
+        cancel_button.place(x=740, y=134, width=90, height=24)
+        status_label.config(text="Exporting...")
+
+        def on_progress(job):
+            progress["value"] = job.progress()
+            status_label.config(text=f"Exporting {job.progress():.0%}")
+
+        def on_exported(job, error):
+            if not dashboard_window.winfo_exists():
+                return
+            progress.place_forget()
+            cancel_button.place_forget()
+            status_label.config(text=previous_status)
+            if error is not None:
+                messagebox.showerror("Export", f"Export failed: {str(error)}")
+            elif exporter.cancelled.is_set():
+                messagebox.showinfo("Export", "Export cancelled.")
+            else:
+                messagebox.showinfo("Export", f"Exported {job.count} rows to {path}")
+
+        exporter = BackgroundLoader(dashboard_window, job, on_batch=on_progress, on_done=on_exported)
+        cancel_button.config(command=exporter.cancel)
+        dashboard_window.bind(
+            "<Destroy>", lambda event: exporter.cancel() if event.widget is dashboard_window else None, add="+"
+        )
+        exporter.start()
+
+    # Small "Performance" button showing the latency metrics
+    create_rounded_button(
+        dashboard_canvas,
+        x=220,
+        y=520,
+        width=130,
+        height=36,
+        text="Performance",
+        bg="#8D99AE",
+        fg="#FFFFFF",
+        command=lambda: open_performance_panel(dashboard_window),
+    )
+
     # Add "Close" button
     create_rounded_button(
         dashboard_canvas,
@@ -206,7 +456,21 @@ def open_admin_dashboard():
         command=dashboard_window.destroy,
     )
 
+    # Add "Export" button
+    create_rounded_button(
+        dashboard_canvas,
+        x=765,
+        y=520,
+        width=120,
+        height=50,
+        text="Export",
+        bg="#06D6A0",
+        fg="#FFFFFF",
+        command=export_results,
+    )
+
 
+@metrics.timed("page.login")
 def open_login_page():
     """Open the login page window."""
 
@@ -289,275 +553,205 @@ def open_login_page():
     )
 
 
-def create_survey_page():
-    """Create the survey page with the modern theme."""
-    survey_window = Toplevel()
-    survey_window.title("Survey Page")
-    survey_window.geometry("900x600")
-    survey_window.configure(bg="#E8F5FD")
-
-    # Canvas for styling
-    survey_canvas = Canvas(survey_window, bg="#A0E1F5", highlightthickness=0)
-    survey_canvas.pack(fill=BOTH, expand=True)
+class SurveyWindow:
+    """The survey window, built once and reused for every respondent.
+
+    Both pages (the survey form and the questionnaire) are frames stacked
+    in one long-lived ``Toplevel``.  Starting a new respondent clears the
+    form and raises the first page; finishing hides the window instead of
+    destroying it, so no widgets are created after the first respondent.
+    """
+
+    def __init__(self, master=None):
+        self.window = Toplevel(master)
+        self.window.title("Survey Page")
+        self.window.geometry("900x600")
+        self.window.configure(bg="#E8F5FD")
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)  # Closing only hides it for the next respondent
+
+        self.ticket = None  # Ticket of the viewer record queued for the current respondent
+        self.name = None
+        self.survey_page = self.create_survey_page()
+        self.questionnaire_page = self.create_questionnaire_page()
+        for page in (self.survey_page, self.questionnaire_page):
+            page.place(x=0, y=0, relwidth=1, relheight=1)
+
+    @metrics.timed("page.survey_start")
+    def start(self):
+        """Clear both pages and show the survey form for a new respondent."""
+        self.ticket = self.name = None
+        self.name_entry.delete(0, tk.END)
+        self.age_entry.delete(0, tk.END)
+        for var in (self.sex_var, self.ethnicity_var, self.disabled_var, *self.answers.values()):
+            var.set("")
+        self.window.title("Survey Page")
+        self.survey_page.tkraise()
+        self.window.deiconify()
+        self.window.lift()
+        self.name_entry.focus_set()
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
+
+    @metrics.timed("page.survey")
+    def create_survey_page(self):
+        """Create the survey page with the modern theme."""
+        page = tk.Frame(self.window, bg="#E8F5FD")
+
+        # Canvas for styling
+        survey_canvas = Canvas(page, bg="#A0E1F5", highlightthickness=0)
+        survey_canvas.pack(fill=BOTH, expand=True)
+
+        # Add a white card in the center
+        card_x1, card_y1, card_x2, card_y2 = 50, 50, 850, 550
+        radius = 40
+
+        # Draw the rounded rectangle (white card)
+        survey_canvas.create_oval(card_x1, card_y1, card_x1 + 2 * radius, card_y1 + 2 * radius, fill="white", outline="white")
+        survey_canvas.create_oval(card_x2 - 2 * radius, card_y1, card_x2, card_y1 + 2 * radius, fill="white", outline="white")
+        survey_canvas.create_rectangle(card_x1 + radius, card_y1, card_x2 - radius, card_y1 + 2 * radius, fill="white", outline="white")
+        survey_canvas.create_rectangle(card_x1, card_y1 + radius, card_x2, card_y2 - radius, fill="white", outline="white")
+        survey_canvas.create_oval(card_x1, card_y2 - 2 * radius, card_x1 + 2 * radius, card_y2, fill="white", outline="white")
+        survey_canvas.create_oval(card_x2 - 2 * radius, card_y2 - 2 * radius, card_x2, card_y2, fill="white", outline="white")
+        survey_canvas.create_rectangle(card_x1 + radius, card_y2 - radius, card_x2 - radius, card_y2, fill="white", outline="white")
 
-    # Add a white card in the center
-    card_x1, card_y1, card_x2, card_y2 = 50, 50, 850, 550
-    radius = 40
+        # Add title
+        survey_canvas.create_text(450, 100, text="Survey Form", font=("Helvetica", 24, "bold"), fill="#333333")
+
+        # Form fields
+        tk.Label(page, text="Name:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=140)
+        self.name_entry = tk.Entry(page, font=("Helvetica", 12), bd=2, relief="solid")
+        self.name_entry.place(x=150, y=140, width=250)
+
+        tk.Label(page, text="Age:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=180)
+        self.age_entry = tk.Entry(page, font=("Helvetica", 12), bd=2, relief="solid")
+        self.age_entry.place(x=150, y=180, width=250)
+
+        tk.Label(page, text="Sex:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=220)
+        self.sex_var = tk.StringVar(page, value="")
+        sex_frame = tk.Frame(page, bg="#E8F5FD")
+        tk.Radiobutton(sex_frame, text="Male", variable=self.sex_var, value="Male", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
+        tk.Radiobutton(sex_frame, text="Female", variable=self.sex_var, value="Female", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
+        tk.Radiobutton(sex_frame, text="Other", variable=self.sex_var, value="Other", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
+        sex_frame.place(x=150, y=220)
+
+        tk.Label(page, text="Ethnicity:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=260)
+        self.ethnicity_var = tk.StringVar(page, value="")
+        ethnicity_menu = tk.OptionMenu(page, self.ethnicity_var, "White", "Black", "Chinese", "Asian", "Others")
+        ethnicity_menu.config(font=("Helvetica", 10), bg="#FFFFFF", fg="#555555", bd=2)
+        ethnicity_menu.place(x=150, y=260)
+
+        tk.Label(page, text="Disabled Status:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=300)
+        self.disabled_var = tk.StringVar(page, value="")
+        disabled_frame = tk.Frame(page, bg="#E8F5FD")
+        tk.Radiobutton(disabled_frame, text="Yes", variable=self.disabled_var, value="Yes", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
+        tk.Radiobutton(disabled_frame, text="No", variable=self.disabled_var, value="No", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
+        disabled_frame.place(x=150, y=300)
+
+        # Add submit button (with rounded corners)
+        create_rounded_button(survey_canvas, 450, 400, 200, 50, "Next", "#1976D2", "white", self.submit_survey)
 
-    # Draw the rounded rectangle (white card)
-    survey_canvas.create_oval(card_x1, card_y1, card_x1 + 2 * radius, card_y1 + 2 * radius, fill="white", outline="white")
-    survey_canvas.create_oval(card_x2 - 2 * radius, card_y1, card_x2, card_y1 + 2 * radius, fill="white", outline="white")
-    survey_canvas.create_rectangle(card_x1 + radius, card_y1, card_x2 - radius, card_y1 + 2 * radius, fill="white", outline="white")
-    survey_canvas.create_rectangle(card_x1, card_y1 + radius, card_x2, card_y2 - radius, fill="white", outline="white")
-    survey_canvas.create_oval(card_x1, card_y2 - 2 * radius, card_x1 + 2 * radius, card_y2, fill="white", outline="white")
-    survey_canvas.create_oval(card_x2 - 2 * radius, card_y2 - 2 * radius, card_x2, card_y2, fill="white", outline="white")
-    survey_canvas.create_rectangle(card_x1 + radius, card_y2 - radius, card_x2 - radius, card_y2, fill="white", outline="white")
+        # Footer
+        survey_canvas.create_text(450, 570, text="© 2024 Singing Sculpture - All Rights Reserved", font=("Helvetica", 10), fill="#555555")
+        return page
 
-    # Add title
-    survey_canvas.create_text(450, 100, text="Survey Form", font=("Helvetica", 24, "bold"), fill="#333333")
-
-    # Form fields
-    tk.Label(survey_window, text="Name:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=140)
-    global name_entry
-    name_entry = tk.Entry(survey_window, font=("Helvetica", 12), bd=2, relief="solid")
-    name_entry.place(x=150, y=140, width=250)
-
-    tk.Label(survey_window, text="Age:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=180)
-    global age_entry
-    age_entry = tk.Entry(survey_window, font=("Helvetica", 12), bd=2, relief="solid")
-    age_entry.place(x=150, y=180, width=250)
-
-    tk.Label(survey_window, text="Sex:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=220)
-    global sex_var
-    sex_var = tk.StringVar(value="")
-    sex_frame = tk.Frame(survey_window, bg="#E8F5FD")
-    tk.Radiobutton(sex_frame, text="Male", variable=sex_var, value="Male", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
-    tk.Radiobutton(sex_frame, text="Female", variable=sex_var, value="Female", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
-    tk.Radiobutton(sex_frame, text="Other", variable=sex_var, value="Other", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
-    sex_frame.place(x=150, y=220)
-
-    tk.Label(survey_window, text="Ethnicity:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=260)
-    global ethnicity_var
-    ethnicity_var = tk.StringVar(value="")
-    ethnicity_menu = tk.OptionMenu(survey_window, ethnicity_var, "White", "Black", "Chinese", "Asian", "Others")
-    ethnicity_menu.config(font=("Helvetica", 10), bg="#FFFFFF", fg="#555555", bd=2)
-    ethnicity_menu.place(x=150, y=260)
-
-    tk.Label(survey_window, text="Disabled Status:", font=("Helvetica", 12), bg="#E8F5FD", fg="#555555").place(x=70, y=300)
-    global disabled_var
-    disabled_var = tk.StringVar(value="")
-    disabled_frame = tk.Frame(survey_window, bg="#E8F5FD")
-    tk.Radiobutton(disabled_frame, text="Yes", variable=disabled_var, value="Yes", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
-    tk.Radiobutton(disabled_frame, text="No", variable=disabled_var, value="No", bg="#050708", font=("Helvetica", 10)).pack(side=tk.LEFT)
-    disabled_frame.place(x=150, y=300)
-
-    def submit_survey():
+    @metrics.timed("submit.survey")
+    def submit_survey(self):
         """Handle the submission of the survey form."""
-        name = name_entry.get()
-        age = age_entry.get()
-        sex = sex_var.get()
-        ethnicity = ethnicity_var.get()
-        disabled = disabled_var.get()
+        name = self.name_entry.get()
+        age = self.age_entry.get()
+        sex = self.sex_var.get()
+        ethnicity = self.ethnicity_var.get()
+        disabled = self.disabled_var.get()
         try:
-            age = float(age)
-        except:
-            age = None
-            messagebox.showerror("Error", "Please enter the age in integers.")
-
-        if not name or not age or not sex or not ethnicity or not disabled:
-            messagebox.showerror("Error", "Please fill out all fields.")
+            record = validate_viewer(name, age, sex, ethnicity, disabled)
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e), parent=self.window)
             return
+        age = record["age"]
 
-        messagebox.showinfo("Survey Submitted", "Thank you for completing the survey!")
+        messagebox.showinfo("Survey Submitted", "Thank you for completing the survey!", parent=self.window)
         print(f"Name: {name}, Age: {age}, Sex: {sex}, Ethnicity: {ethnicity}, Disabled: {disabled}")
-        store_data(name, age, sex, ethnicity, disabled)
-        survey_window.destroy()
-        create_questionnaire_page()
-
-    # Add submit button (with rounded corners)
-    def draw_button(canvas, x, y, width, height, text, command):
-        """Draw a rounded button on the canvas."""
-        radius = height // 2
-        x1, y1, x2, y2 = x - width // 2, y - height // 2, x + width // 2, y + height // 2
-
-        canvas.create_oval(x1, y1, x1 + height, y1 + height, fill="#1976D2", outline="#1976D2")
-        canvas.create_oval(x2 - height, y1, x2, y1 + height, fill="#1976D2", outline="#1976D2")
-        canvas.create_rectangle(x1 + radius, y1, x2 - radius, y2, fill="#1976D2", outline="#1976D2")
-
-        button_text = canvas.create_text(x, y, text=text, font=("Helvetica", 14, "bold"), fill="white")
-
-        def on_click(event):
-            if x1 <= event.x <= x2 and y1 <= event.y <= y2:
-                command()
+        self.ticket = queue_data(name, age, sex, ethnicity, disabled)
+        self.name = name
 
-        canvas.tag_bind(button_text, "<Button-1>", on_click)
-
-    draw_button(survey_canvas, 450, 400, 200, 50, "Next", submit_survey)
-
-    # Footer
-    survey_canvas.create_text(450, 570, text="© 2024 Singing Sculpture - All Rights Reserved", font=("Helvetica", 10), fill="#555555")
+        # Move on to the questionnaire for the respondent who just filled in the survey
+        self.window.title("Questionnaire Page")
+        self.questionnaire_page.tkraise()
 
+    @metrics.timed("page.questionnaire")
+    def create_questionnaire_page(self):
+        """Create the questionnaire page."""
+        page = tk.Frame(self.window, bg="#E8F5FD")
 
-def create_questionnaire_page():
-    """Create the questionnaire page."""
-    questionnaire_window = Toplevel()
-    questionnaire_window.title("Questionnaire Page")
-    questionnaire_window.geometry("900x600")
-    questionnaire_window.configure(bg="#E8F5FD")
+        # Canvas for design
+        questionnaire_canvas = Canvas(page, width=900, height=600, bg="#E8F5FD", highlightthickness=0)
+        questionnaire_canvas.place(x=0, y=0)
 
-    # Canvas for design
-    questionnaire_canvas = Canvas(questionnaire_window, width=900, height=600, bg="#E8F5FD", highlightthickness=0)
-    questionnaire_canvas.place(x=0, y=0)
+        # Add rounded rectangle (white card)
+        create_rounded_rectangle(questionnaire_canvas, 50, 50, 850, 550, radius=40, fill="#FFFFFF", outline="#FFFFFF")
 
-    # Add rounded rectangle (white card)
-    create_rounded_rectangle(questionnaire_canvas, 50, 50, 850, 550, radius=40, fill="#FFFFFF", outline="#FFFFFF")
+        # Add title
+        questionnaire_canvas.create_text(450, 100, text="Questionnaire", font=("Helvetica", 24, "bold"), fill="#333333")
+
+        # Question data
+        questions = QUESTIONS
+        options = OPTIONS
+
+        # Dictionary to store answers
+        self.answers = {}
+
+        # Render questions and options
+        for i, question in enumerate(questions, start=1):
+            tk.Label(
+                page, text=f"{i}. {question}", font=("Helvetica", 12), bg="#FFFFFF", fg="#555555"
+            ).place(x=70, y=140 + i * 60)
+
+            var = tk.StringVar(page, value="")
+            self.answers[f"q{i}"] = var
+            for j, option in enumerate(options):
+                tk.Radiobutton(
+                    page,
+                    text=option,
+                    variable=var,
+                    value=option,
+                    bg="#050708",
+                    font=("Helvetica", 10),
+                    anchor="w",
+                ).place(x=150 + j * 120, y=140 + i * 60 + 30)
+
+        # Submit button (rounded style)
+        create_rounded_button(questionnaire_canvas, 450, 500, 200, 50, "Submit", "#1976D2", "white", self.submit_questionnaire)
 
-    # Add title
-    questionnaire_canvas.create_text(450, 100, text="Questionnaire", font=("Helvetica", 24, "bold"), fill="#333333")
+        # Footer
+        questionnaire_canvas.create_text(450, 570, text="© 2024 Singing Sculpture - All Rights Reserved", font=("Helvetica", 10), fill="#555555")
+        return page
 
-    # Question data
-    questions = [
-        "Enjoyed the sculpture?",
-        "Were curious as to how it worked?",
-        "Wanted to know more about science as a result?",
-    ]
-    options = ["1. Strongly Agree", "2. Agree", "3. Neither Agree", "4. Disagree", "5. Strongly Disagree"]
-
-    # Dictionary to store answers
-    answers = {}
-
-    # Render questions and options
-    for i, question in enumerate(questions, start=1):
-        tk.Label(
-            questionnaire_window, text=f"{i}. {question}", font=("Helvetica", 12), bg="#FFFFFF", fg="#555555"
-        ).place(x=70, y=140 + i * 60)
-
-        var = tk.StringVar(value="")
-        answers[f"q{i}"] = var
-        for j, option in enumerate(options):
-            tk.Radiobutton(
-                questionnaire_window,
-                text=option,
-                variable=var,
-                value=option,
-                bg="#050708",
-                font=("Helvetica", 10),
-                anchor="w",
-            ).place(x=150 + j * 120, y=140 + i * 60 + 30)
-
-    def submit_questionnaire():
+    @metrics.timed("submit.questionnaire")
+    def submit_questionnaire(self):
         """Handle submission of the questionnaire."""
-        if any(not answer.get() for answer in answers.values()):
-            messagebox.showerror("Error", "Please answer all questions before submitting.")
+        try:
+            chosen = validate_answers({question: answer.get() for question, answer in self.answers.items()})
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e), parent=self.window)
         else:
-            messagebox.showinfo("Thank You!", "Your feedback has been submitted.")
+            messagebox.showinfo("Thank You!", "Your feedback has been submitted.", parent=self.window)
             print("Survey Answers:")
-            for question, answer in answers.items():
-                print(f"{question}: {answer.get()}")
-            store_survey_answers(answers)
-            questionnaire_window.destroy()
+            for question, answer in chosen.items():
+                print(f"{question}: {answer}")
+            queue_survey_answers(chosen, self.ticket, self.name)
+            self.window.withdraw()  # Kept for the next respondent
 
-    # Submit button (rounded style)
-    def draw_button(canvas, x, y, width, height, text, command):
-        """Draw a rounded button on the canvas."""
-        radius = height // 2
-        x1, y1, x2, y2 = x - width // 2, y - height // 2, x + width // 2, y + height // 2
 
-        canvas.create_oval(x1, y1, x1 + height, y1 + height, fill="#1976D2", outline="#1976D2")
-        canvas.create_oval(x2 - height, y1, x2, y1 + height, fill="#1976D2", outline="#1976D2")
-        canvas.create_rectangle(x1 + radius, y1, x2 - radius, y2, fill="#1976D2", outline="#1976D2")
-
-        button_text = canvas.create_text(x, y, text=text, font=("Helvetica", 14, "bold"), fill="white")
-
-        def on_click(event):
-            if x1 <= event.x <= x2 and y1 <= event.y <= y2:
-                command()
-
-        canvas.tag_bind(button_text, "<Button-1>", on_click)
-
-    draw_button(questionnaire_canvas, 450, 500, 200, 50, "Submit", submit_questionnaire)
-
-    # Footer
-    questionnaire_canvas.create_text(450, 570, text="© 2024 Singing Sculpture - All Rights Reserved", font=("Helvetica", 10), fill="#555555")
+survey_window = None  # The shared SurveyWindow, built on first use
 
 
 def open_survey_page():
-    """Open the survey page window."""
-    create_survey_page()
-
-
-def store_data(name, age, sex, ethnicity, disabled, filename="viewers_data.json"):
-    # Data to store
-    new_entry = {
-        "name": name,
-        "age": age,
-        "sex": sex,
-        "ethnicity": ethnicity,
-        "disabled": disabled,
-    }
-
-    # Check if the JSON file already exists
-    if os.path.exists(filename):
-        # If the file exists, load existing data
-        with open(filename, "r") as file:
-            data = json.load(file)
-    else:
-        # If the file doesn't exist, start with an empty list
-        data = []
-
-    # Append the new entry to the data
-    data.append(new_entry)
-
-    # Write the updated data back to the file
-    with open(filename, "w") as file:
-        json.dump(data, file, indent=4)
-
-    print(f"Data stored successfully in {filename}")
-
-
-# Function to load the last name from the data file
-def get_last_name(filename="viewers_data.json"):
-    # Check if the JSON file exists
-    if os.path.exists(filename):
-        with open(filename, "r") as file:
-            data = json.load(file)
-            # If data exists, return the last entry's name
-            if data:
-                return data[-1]["name"]
-    return None
-
-
-def store_survey_answers(answers, filename="survey_data.json"):
-    # Get the last name from the data file
-    last_name = get_last_name()
-
-    if last_name:
-        # Prepare the survey data with the last name
-        survey_entry = {
-            "name": last_name,
-            "answers": {question: answer.get() for question, answer in answers.items()}  # Extract values
-        }
-
-        # Append the new survey entry directly to the JSON file
-        try:
-            # Open the file in append mode
-            with open(filename, "a+") as file:
-                # First, read any existing data
-                file.seek(0)
-                data = json.load(file) if file.tell() > 0 else []  # Handle empty file
-
-                # Append the new survey entry
-                data.append(survey_entry)
-
-                # Write the updated data back to the file
-                file.seek(0)
-                json.dump(data, file, indent=4)
-
-            print(f"Survey responses stored successfully in {filename}")
-        except Exception as e:
-            print(f"Error while storing survey responses: {e}")
-    else:
-        print("Error: Could not find the last entered name in the data.json file.")
+    """Show the survey window for a new respondent."""
+    global survey_window
+    if survey_window is None or not survey_window.exists():
+        survey_window = SurveyWindow()
+    survey_window.start()
 
 
 def create_modern_landing_page():
@@ -566,125 +760,134 @@ def create_modern_landing_page():
     root.title("Software for Survey")
     root.geometry("1000x700")
     root.configure(bg="#E8F5FD")
+    startup.mark("window")
+    config = get_config()
+    closers = [close_writer]  # Run in order when the window is closed
 
-    # Canvas for layout
-    canvas = Canvas(root, bg="#E8F5FD", highlightthickness=0)
-    canvas.pack(fill=BOTH, expand=True)
-
-    def create_rounded_button(canvas, x, y, width, height, text, bg, fg, command):
-        """Creates a rounded button on the canvas."""
-        radius = height // 2
-        x1, y1, x2, y2 = x - width // 2, y - height // 2, x + width // 2, y + height // 2
-
-        # Draw rounded rectangle
-        canvas.create_oval(x1, y1, x1 + height, y1 + height, fill=bg, outline=bg)  # Left circle
-        canvas.create_oval(x2 - height, y1, x2, y1 + height, fill=bg, outline=bg)  # Right circle
-        canvas.create_rectangle(x1 + radius, y1, x2 - radius, y2, fill=bg, outline=bg)  # Center rectangle
+    def on_close():
+        """Write any queued submissions before the app exits."""
+        for close in closers:
+            close()
+        root.destroy()
 
-        # Add button text
-        button_text = canvas.create_text(
-            x, y, text=text, font=("Helvetica", 14, "bold"), fill=fg
-        )
-
-        # Bind click event
-        def on_click(event):
-            if x1 <= event.x <= x2 and y1 <= event.y <= y2:
-                command()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    atexit.register(close_writer)  # Also flush if the app exits some other way
 
-        canvas.tag_bind(button_text, "<Button-1>", on_click)
+    # Illustration shown on the right-hand side, baked to the disk cache at display size
+    illustration = ImageCache(ILLUSTRATION_PATH, cache_dir=os.path.join(config["data_dir"], config["cache_dir"]))
 
-    def resize_elements(event):
-        canvas.delete("all")
-        width, height = event.width, event.height
+    # Canvas for layout
+    canvas = Canvas(root, bg="#E8F5FD", highlightthickness=0)
+    canvas.pack(fill=BOTH, expand=True)
 
-        # Background Shapes
-        canvas.create_oval(-200, -200, 400, 400, fill="#A0E1F5", outline="")
-        canvas.create_oval(width - 400, height - 300, width + 200, height + 200, fill="#A0E1F5", outline="")
+    # Build the page once; resizing only moves the items (see survey_ui.scene)
+    scene = Scene(canvas)
+    layout = metrics.timed("landing.layout")(scene.layout)
 
-        # Navigation Bar
-        canvas.create_rectangle(0, 0, width, 70, fill="#1976D2", outline="")
-        canvas.create_text(
-            70, 35, text="Singing sculpture", font=("Helvetica", 20, "bold"), fill="white", anchor="w"
-        )
+    # Background Shapes
+    scene.oval(lambda w, h: (-200, -200, 400, 400), fill="#A0E1F5", outline="")
+    scene.oval(lambda w, h: (w - 400, h - 300, w + 200, h + 200), fill="#A0E1F5", outline="")
 
-        # Main Content Section
-        canvas.create_text(
-            30,
-            height // 3 - 100,
-            text="Survey for Sculpture",
-            font=("Helvetica", 36, "bold"),
-            fill="#333333",
-            anchor="w",
-        )
-        canvas.create_text(
-            30,
-            height // 3 + 280,
-            text=(
-                "Discover the art of expression through our exclusive Sculpture Survey!"
-                " Share your thoughts, preferences, and opinions on a diverse range of sculptures."
-                " Your valuable insights will help us understand what captivates and inspires viewers like you."
-                " Join us in shaping the future of art appreciation!"
-            ),
-            font=("Helvetica", 20),
-            fill="#555555",
-            anchor="w",
-            width=400,
-        )
+    # Navigation Bar
+    scene.rectangle(lambda w, h: (0, 0, w, 70), fill="#1976D2", outline="")
+    scene.text(
+        lambda w, h: (70, 35), text="Singing sculpture", font=("Helvetica", 20, "bold"), fill="white", anchor="w"
+    )
 
-        # Rounded Buttons
-        create_rounded_button(
-            canvas,
-            x=120,
-            y=height // 3 + 100,
-            width=200,
-            height=50,
-            text="Start Survey",
-            bg="#1976D2",
-            fg="white",
-            command=open_survey_page,
-        )
-        create_rounded_button(
-            canvas,
-            x=850,
-            y=height // 3 - 200,
-            width=200,
-            height=50,
-            text="Admin Login",
-            bg="#E53935",
-            fg="white",
-            command=open_login_page,
-        )
+    # Main Content Section
+    scene.text(
+        lambda w, h: (30, h // 3 - 100),
+        text="Survey for Sculpture",
+        font=("Helvetica", 36, "bold"),
+        fill="#333333",
+        anchor="w",
+    )
+    scene.text(
+        lambda w, h: (30, h // 3 + 280),
+        text=(
+            "Discover the art of expression through our exclusive Sculpture Survey!"
+            " Share your thoughts, preferences, and opinions on a diverse range of sculptures."
+            " Your valuable insights will help us understand what captivates and inspires viewers like you."
+            " Join us in shaping the future of art appreciation!"
+        ),
+        font=("Helvetica", 20),
+        fill="#555555",
+        anchor="w",
+        width=400,
+    )
 
-        # Illustration/Graphic
-        try:
-            illustration_path = "sculpture-removebg-preview.png"  # Replace with your image path
-            illustration_image = Image.open(illustration_path)
-            illustration_image = illustration_image.resize((400, 300), Image.ANTIALIAS)
-            illustration_photo = ImageTk.PhotoImage(illustration_image)
-            canvas.illustration_photo = illustration_photo  # Prevent garbage collection
-            canvas.create_image(width - 250, height // 3, image=illustration_photo, anchor="center")
-        except Exception:
-            canvas.create_text(
-                width - 350,
-                height // 3,
-                text="Illustration Placeholder",
-                font=("Helvetica", 20, "bold"),
-                fill="#CCCCCC",
-            )
+    # Rounded Buttons
+    scene.button(
+        lambda w, h: (120, h // 3 + 100),
+        width=200,
+        height=50,
+        text="Start Survey",
+        bg="#1976D2",
+        fg="white",
+        command=open_survey_page,
+    )
+    scene.button(
+        lambda w, h: (850, h // 3 - 200),
+        width=200,
+        height=50,
+        text="Admin Login",
+        bg="#E53935",
+        fg="white",
+        command=open_login_page,
+    )
 
-        # Footer
-        canvas.create_text(
-            width // 2,
-            height - 20,
-            text="© 2024 Singing Sculpture - All Rights Reserved",
-            font=("Helvetica", 10),
-            fill="#555555",
+    # Illustration/Graphic (decoded and resized once)
+    try:
+        illustration_photo = illustration.photo(ILLUSTRATION_SIZE)
+        canvas.illustration_photo = illustration_photo  # Prevent garbage collection
+        scene.image(lambda w, h: (w - 250, h // 3), image=illustration_photo, anchor="center")
+    except Exception:
+        scene.text(
+            lambda w, h: (w - 350, h // 3),
+            text="Illustration Placeholder",
+            font=("Helvetica", 20, "bold"),
+            fill="#CCCCCC",
         )
 
-    # Bind resize event
-    canvas.bind("<Configure>", resize_elements)
+    # Footer
+    scene.text(
+        lambda w, h: (w // 2, h - 20),
+        text="© 2024 Singing Sculpture - All Rights Reserved",
+        font=("Helvetica", 10),
+        fill="#555555",
+    )
 
+    # Bind resize event; repositioning is a few coords calls, so it runs on every event
+    canvas.bind("<Configure>", lambda event: layout(event.width, event.height))
+    startup.mark("page_built")
+
+    def finish_startup():
+        """Run the optional start-up work once the landing page is on screen."""
+        root.update_idletasks()
+        startup.mark("first_paint")
+
+        # Import any data left in the old JSON files on a worker thread (no-op once migrated)
+        def on_migrated(job, error):
+            if error is not None:
+                messagebox.showerror("Migration", f"Could not import the old survey files: {str(error)}")
+            elif not migration.cancelled.is_set() and any(job.counts.values()):
+                print(f"Migrated {job.counts['viewers']} viewers and {job.counts['answers']} answer records")
+
+        migration = BackgroundLoader(root, MigrationJob(get_storage()), on_done=on_migrated)
+        # Stop after the current batch when the app closes; the migration resumes on the next start
+        closers.insert(0, lambda: (migration.cancel(), migration.thread.join()))
+        migration.start()
+
+        # Record how long the event loop is blocked, and log the metrics while the app runs
+        LagMonitor(root).start()
+        closers.append(metrics.start_log(os.path.join(config["data_dir"], config["metrics_log"])))
+        startup.mark("ready")
+        if config["startup_report"]:
+            print(startup.report())
+
+    root.after_idle(finish_startup)
     root.mainloop()
 
 
-create_modern_landing_page()
+if __name__ == "__main__":
+    create_modern_landing_page()
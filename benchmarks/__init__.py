@@ -0,0 +1 @@
+"""Benchmarks for the survey storage and analysis paths (``python -m benchmarks.run``)."""
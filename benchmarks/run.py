@@ -0,0 +1,255 @@
+"""Benchmark harness: ``python -m benchmarks.run --sizes 1000,100000 -o results.json``.
+
+Each case runs in a fresh process against a synthetic dataset, so wall
+time and peak RSS are measured per case.  Results are written as JSON;
+pass ``--compare`` with an earlier results file to print the change per
+case.  Needs no display.
+"""
+import argparse  # Importing argparse for the command line interface
+import contextlib  # Importing contextlib to silence progress output while timing
+import io  # Importing io for the silenced output buffer
+import json  # Importing JSON module for the results file
+import multiprocessing  # Importing multiprocessing to run each case in a fresh process
+import os  # Importing OS module for paths and environment variables
+import platform  # Importing platform to record the machine
+import shutil  # Importing shutil to copy legacy datasets
+import sys  # Importing sys for the Python version
+import tempfile  # Importing tempfile for the default work directory
+import time  # Importing time for timestamps and timers
+
+try:
+    import resource  # Peak RSS on POSIX
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from benchmarks import synthetic
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+BACKENDS = ("jsonl", "sqlite")
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes, Linux KiB
+
+
+def _case_store_data(data_dir, size):
+    from survey_core.submissions import store_data
+
+    for i in range(200):
+        store_data(f"Bench {i}", 30.0, "Female", "White", "No")
+    return 200
+
+
+def _case_store_survey_answers(data_dir, size):
+    from survey_core.submissions import store_survey_answers
+
+    answers = {"q1": "1. Strongly Agree", "q2": "2. Agree", "q3": "4. Disagree"}
+    for i in range(200):
+        store_survey_answers(answers, respondent_id=i + 1, name=f"Bench {i}")
+    return 200
+
+
+def _case_get_last_name(data_dir, size):
+    from survey_core.submissions import get_last_name
+
+    for _ in range(1000):
+        get_last_name()
+    return 1000
+
+
+def _case_dashboard_load(data_dir, size):
+    from survey_core.storage import get_storage
+
+    source = get_storage().answer_row_source()
+    source.refresh()
+    source.rows(0, 50)
+    return 1
+
+
+def _case_view_analysis(data_dir, size):
+    from survey_core.storage import get_storage
+
+    for _ in range(100):
+        get_storage().viewer_stats()
+    return 100
+
+
+def _case_view_analysis_exact(data_dir, size):
+    from survey_core.storage import get_storage
+
+    get_storage().viewer_stats(exact=True)
+    return 1
+
+
+def _case_analytics_report(data_dir, size):
+    from survey_core import analytics
+    from survey_core.storage import get_storage
+
+    if not analytics.available():
+        return 0
+    analytics.report(analytics.load_dataset(get_storage()))
+    return 1
+
+
+def _case_legacy_parse(data_dir, size):
+    from survey_core.jsonstream import iter_legacy_file
+    from survey_core.storage import LEGACY_ANSWERS_FILE
+
+    return sum(1 for _ in iter_legacy_file(os.path.join(data_dir, LEGACY_ANSWERS_FILE)))
+
+
+def _case_legacy_migrate(data_dir, size):
+    from survey_core.storage import get_storage, migrate_legacy_files
+
+    counts = migrate_legacy_files(get_storage())
+    return counts["viewers"] + counts["answers"]
+
+
+# Case name -> (function, dataset kind it runs against, whether it modifies the dataset)
+CASES = {
+    "store_data": (_case_store_data, "storage", True),
+    "store_survey_answers": (_case_store_survey_answers, "storage", True),
+    "get_last_name": (_case_get_last_name, "storage", False),
+    "dashboard_load": (_case_dashboard_load, "storage", False),
+    "view_analysis": (_case_view_analysis, "storage", False),
+    "view_analysis_exact": (_case_view_analysis_exact, "storage", False),
+    "analytics_report": (_case_analytics_report, "storage", False),
+    "legacy_parse": (_case_legacy_parse, "legacy", False),
+    "legacy_migrate": (_case_legacy_migrate, "legacy", True),
+}
+
+
+def _run_case(name, data_dir, backend, size, connection=None):
+    """Run one case in this (fresh) process and return its measurements."""
+    os.environ["SURVEY_DATA_DIR"] = data_dir
+    os.environ["SURVEY_STORAGE"] = backend
+    function = CASES[name][0]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ops = function(data_dir, size)
+    wall = time.perf_counter() - start
+    result = {
+        "case": name,
+        "backend": backend,
+        "size": size,
+        "ops": ops,
+        "wall_s": wall,
+        "per_op_us": wall / ops * 1e6 if ops else None,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+    if connection is not None:
+        connection.send(result)
+        connection.close()
+    return result
+
+
+def _run_in_process(context, name, data_dir, backend, size):
+    """Run a case in a new process so its peak RSS is its own."""
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(name, data_dir, backend, size, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        raise RuntimeError(f"Benchmark case {name} ({backend}, {size}) crashed") from None
+    finally:
+        process.join()
+    return result
+
+
+def _dataset(workdir, kind, backend, size):
+    """Return the directory of a dataset, generating it on first use."""
+    directory = os.path.join(workdir, f"{kind}-{backend if kind == 'storage' else 'json'}-{size}")
+    marker = os.path.join(directory, ".complete")
+    if not os.path.exists(marker):
+        shutil.rmtree(directory, ignore_errors=True)
+        print(f"Generating {kind} dataset with {size} respondents...", file=sys.stderr)
+        if kind == "legacy":
+            synthetic.write_legacy(directory, size)
+        else:
+            synthetic.write_storage(directory, size, backend)
+        open(marker, "w").close()
+    return directory
+
+
+def run(sizes, backends, cases, workdir):
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        for name in cases:
+            _, kind, mutates = CASES[name]
+            for backend in (backends if kind == "storage" else ("jsonl",)):
+                source = _dataset(workdir, kind, backend, size)
+                data_dir = source
+                if mutates:
+                    # Work on a copy so every case sees the same dataset
+                    data_dir = source + "-scratch"
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                    shutil.copytree(source, data_dir)
+                result = _run_in_process(context, name, data_dir, backend, size)
+                if mutates:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                results.append(result)
+                print(
+                    f"{name:22} {backend:7} {size:>10}  {result['wall_s']:9.4f}s"
+                    f"  peak RSS {result['peak_rss_kb']} KiB",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(results, baseline):
+    """Print the wall time ratio of each case against an earlier run."""
+    previous = {(r["case"], r["backend"], r["size"]): r for r in baseline["results"]}
+    for result in results:
+        old = previous.get((result["case"], result["backend"], result["size"]))
+        if old and old["wall_s"]:
+            ratio = result["wall_s"] / old["wall_s"]
+            print(f"{result['case']:22} {result['backend']:7} {result['size']:>10}  x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark survey storage and analysis.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated respondent counts (up to 10000000)")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="storage backends to benchmark")
+    parser.add_argument("--cases", default=",".join(CASES), help="cases to run")
+    parser.add_argument("--workdir", help="where datasets are generated and kept (default: a temporary directory)")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="results file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    backends = args.backends.split(",")
+    cases = args.cases.split(",")
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="survey-bench-")
+    results = run(sizes, backends, cases, workdir)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(results, json.load(file))
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Synthetic survey datasets for benchmarks.
+
+Records are generated lazily from a seeded random source and written
+straight to disk, so datasets of millions of respondents never have to fit
+in memory.
+"""
+import json  # Importing JSON module for the legacy file formats
+import os  # Importing OS module for paths
+import random  # Importing random for reproducible synthetic values
+
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS
+from survey_core.storage import LEGACY_ANSWERS_FILE, LEGACY_VIEWERS_FILE, open_storage
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn")
+WRITE_BATCH = 10000  # Records appended to storage per call while generating
+
+
+def iter_respondents(count, seed=0):
+    """Yield ``(viewer, answers)`` pairs for ``count`` synthetic respondents."""
+    rng = random.Random(seed)
+    sexes, ethnicities, disabled = DEMOGRAPHICS["sex"], DEMOGRAPHICS["ethnicity"], DEMOGRAPHICS["disabled"]
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {i}"
+        viewer = {
+            "name": name,
+            "age": float(rng.randint(5, 90)),
+            "sex": rng.choice(sexes),
+            "ethnicity": rng.choice(ethnicities),
+            "disabled": rng.choice(disabled),
+        }
+        answers = {key: rng.choice(OPTIONS) for key in QUESTION_KEYS}
+        yield viewer, answers
+
+
+def write_legacy(directory, count, seed=0):
+    """Write the pre-JSON Lines files the app used to produce.
+
+    ``viewers_data.json`` is one pretty-printed array and ``survey_data.json``
+    is a run of concatenated single-entry arrays, as left by the old
+    ``"a+"`` append code.
+    """
+    os.makedirs(directory, exist_ok=True)
+    viewers_path = os.path.join(directory, LEGACY_VIEWERS_FILE)
+    answers_path = os.path.join(directory, LEGACY_ANSWERS_FILE)
+    with open(viewers_path, "w", encoding="utf-8") as viewers, open(answers_path, "w", encoding="utf-8") as answers:
+        viewers.write("[")
+        for i, (viewer, chosen) in enumerate(iter_respondents(count, seed)):
+            viewers.write(("," if i else "") + "\n" + json.dumps(viewer, indent=4))
+            answers.write(json.dumps([{"name": viewer["name"], "answers": chosen}], indent=4))
+        viewers.write("\n]")
+    return viewers_path, answers_path
+
+
+def write_storage(directory, count, backend="jsonl", seed=0):
+    """Fill a storage backend in ``directory`` with ``count`` respondents."""
+    os.makedirs(directory, exist_ok=True)
+    storage = open_storage(backend, directory)
+    viewers, answers = [], []
+
+    def flush():
+        ids = storage.append_viewers(viewers)
+        storage.append_answers([
+            {"respondent_id": respondent_id, "name": viewer["name"], "answers": chosen}
+            for respondent_id, viewer, chosen in zip(ids, viewers, answers)
+        ])
+        viewers.clear()
+        answers.clear()
+
+    for viewer, chosen in iter_respondents(count, seed):
+        viewers.append(viewer)
+        answers.append(chosen)
+        if len(viewers) >= WRITE_BATCH:
+            flush()
+    flush()
+    storage.close()
+    return storage
@@ -0,0 +1 @@
+"""Storage and data handling for the Singing Sculpture survey."""
@@ -0,0 +1,212 @@
+"""Command line interface for batch jobs: ``python -m survey_core COMMAND``.
+
+Runs without tkinter or PIL, so it works on a headless server.
+"""
+import argparse  # Importing argparse for the command line interface
+import gzip  # Importing gzip for compressed exports to standard output
+import io  # Importing io to write text through the gzip stream
+import json  # Importing JSON module for JSON Lines input and output
+import os  # Importing OS module for file paths
+import sys  # Importing sys for standard output
+
+from survey_core.model import DEMOGRAPHICS, QUESTION_KEYS
+from survey_core.storage import MIGRATED_SUFFIX, get_storage, migrate_legacy_files
+
+
+def command_import(args):
+    """Import respondents (demographics plus optional q1-q3 answers) from CSV or JSON Lines."""
+    from survey_core import importer
+
+    report = importer.import_file(get_storage(), args.file, dry_run=args.dry_run)
+    for number, error, row in report.rejected[:args.show]:
+        print(f"Row {number}: {error}", file=sys.stderr)
+    if len(report.rejected) > args.show:
+        print(f"... and {len(report.rejected) - args.show} more", file=sys.stderr)
+    if args.rejects:
+        report.write_rejects(args.rejects)
+    verb = "Would import" if args.dry_run else "Imported"
+    print(f"{verb} {report.accepted} respondents, rejected {len(report.rejected)}")
+
+
+def command_stats(args):
+    """Print the viewer statistics shown in the analysis window."""
+    _print_stats(get_storage().viewer_stats(exact=args.exact))
+    if args.detailed:
+        from survey_core import analytics
+
+        report = analytics.report(analytics.load_dataset(get_storage()))
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+def _print_stats(stats):
+    print(f"Viewers: {stats['count']}")
+    print(f"Average Age: {stats['mean_age']:.2f}")
+    print(f"Standard Deviation: {stats['std_age']:.2f}")
+    print(f"Number of Females: {stats['females']}")
+    if stats.get("median_age") is not None:
+        print(f"Median Age: {stats['median_age']:.1f} (10th-90th percentile {stats['p10_age']:.1f}-{stats['p90_age']:.1f})")
+    for field, counts in stats["categories"].items():
+        print(f"{field.capitalize()}: " + ", ".join(f"{value} {count}" for value, count in sorted(counts.items())))
+
+
+def command_analyze(args):
+    """Compute the analysis window's statistics over many kiosks' data directories in parallel."""
+    from survey_core import shards
+
+    for directory in args.shards:
+        if not os.path.isdir(directory):
+            sys.exit(f"Not a data directory: {directory}")
+
+    def progress(done, total, directory):
+        if not args.quiet:
+            print(f"[{done}/{total}] {directory}", file=sys.stderr)
+
+    try:
+        summary = shards.analyze_shards(args.shards, workers=args.jobs, progress=progress)
+    except (OSError, RuntimeError) as e:
+        sys.exit(str(e))
+    print(f"Shards: {summary.shards}")
+    _print_stats(summary.viewers.summary())
+    if args.detailed:
+        json.dump(summary.report(), sys.stdout, indent=2)
+        print()
+
+
+def command_export(args):
+    """Write respondents joined with their answers as CSV or JSON Lines, optionally gzipped."""
+    from survey_core import export
+
+    filters = {field: getattr(args, field) for field in ("name", "question", "answer") + tuple(DEMOGRAPHICS)}
+    if args.output:
+        count = export.export(get_storage(), args.output, fmt=args.format, filters=filters, compress=args.gzip or None)
+    else:
+        # Standard output: stream straight through, without a temporary file
+        fmt = args.format or "jsonl"
+        if args.gzip:
+            output = gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb")
+            text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        else:
+            text = sys.stdout
+        write = export.row_writer(text, fmt)
+        count = 0
+        for row in export.iter_rows(get_storage(), filters):
+            write(row)
+            count += 1
+        text.flush()
+        if args.gzip:
+            text.detach()
+            output.close()
+    print(f"Exported {count} rows", file=sys.stderr)
+
+
+def command_migrate(args):
+    """Import legacy viewers_data.json / survey_data.json files."""
+    counts = migrate_legacy_files(get_storage())
+    print(f"Migrated {counts['viewers']} viewers and {counts['answers']} answer records")
+
+
+def command_compact(args):
+    from survey_core import jsonstream
+
+    jsonstream.main(["compact", args.source] + (["-o", args.output] if args.output else []) + (["-f"] if args.force else []))
+
+
+def command_rebuild(args):
+    aggregates = get_storage().rebuild_aggregates()
+    print(f"Rebuilt aggregates over {aggregates.count} viewers")
+
+
+def command_archive(args):
+    """Write the stored (or legacy) records to a columnar archive."""
+    from survey_core import archive, storage
+
+    if args.legacy:
+        header = archive.convert_legacy(
+            _legacy_path(args.legacy, storage.LEGACY_VIEWERS_FILE),
+            _legacy_path(args.legacy, storage.LEGACY_ANSWERS_FILE),
+            args.output,
+        )
+    else:
+        header = archive.convert_storage(get_storage(), args.output)
+    print(f"Archived {header['viewers']} viewers and {header['answers']} answer records to {args.output}")
+
+
+def _legacy_path(directory, name):
+    """Return the legacy file in ``directory``, or its copy renamed by the migration."""
+    path = os.path.join(directory, name)
+    migrated = path + MIGRATED_SUFFIX
+    return migrated if not os.path.exists(path) and os.path.exists(migrated) else path
+
+
+def command_serve(args):
+    from survey_core import ingest
+
+    ingest.main(["serve", "--host", args.host] + (["--port", str(args.port)] if args.port else []))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m survey_core", description="Singing Sculpture survey batch tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    command = subparsers.add_parser("import", help="bulk import respondents from CSV or JSON Lines")
+    command.add_argument("file", help="input file (.csv or .jsonl)")
+    command.add_argument("--rejects", metavar="FILE", help="write the rejected rows and their errors to this CSV file")
+    command.add_argument("--show", type=int, default=20, help="rejected rows to print (default: 20)")
+    command.add_argument("--dry-run", action="store_true", help="validate only; store nothing")
+    command.set_defaults(handler=command_import)
+
+    command = subparsers.add_parser("stats", help="print viewer statistics")
+    command.add_argument("--exact", action="store_true", help="scan the data instead of reading the running aggregates")
+    command.add_argument("--detailed", action="store_true", help="also print the NumPy analytics report as JSON")
+    command.set_defaults(handler=command_stats)
+
+    command = subparsers.add_parser("analyze", help="print viewer statistics over many data directories in parallel")
+    command.add_argument("shards", nargs="+", metavar="DIR", help="data directory of one kiosk (JSON Lines or legacy JSON files)")
+    command.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per core)")
+    command.add_argument("--detailed", action="store_true", help="also print the analytics report as JSON")
+    command.add_argument("-q", "--quiet", action="store_true", help="do not report each finished shard")
+    command.set_defaults(handler=command_analyze)
+
+    command = subparsers.add_parser("export", help="export respondents with their answers as CSV or JSON Lines")
+    command.add_argument("-o", "--output", help="output file; .csv, .jsonl, optionally .gz (default: standard output)")
+    command.add_argument("--format", choices=("csv", "jsonl"), help="output format (default: from the file name)")
+    command.add_argument("--gzip", action="store_true", help="compress the output")
+    command.add_argument("--name", help="only names starting with this (case-insensitive)")
+    command.add_argument("--question", choices=QUESTION_KEYS, help="only respondents who answered this question")
+    command.add_argument("--answer", help="only this answer (to --question, or to any question)")
+    for field in DEMOGRAPHICS:
+        command.add_argument(f"--{field}", help=f"only this {field} value")
+    command.set_defaults(handler=command_export)
+
+    command = subparsers.add_parser("migrate", help="import legacy JSON files")
+    command.set_defaults(handler=command_migrate)
+
+    command = subparsers.add_parser("compact", help="rewrite a legacy JSON file as JSON Lines")
+    command.add_argument("source")
+    command.add_argument("-o", "--output")
+    command.add_argument("-f", "--force", action="store_true")
+    command.set_defaults(handler=command_compact)
+
+    command = subparsers.add_parser("rebuild-aggregates", help="recompute the running viewer aggregates")
+    command.set_defaults(handler=command_rebuild)
+
+    command = subparsers.add_parser("archive", help="write a compact columnar archive")
+    command.add_argument("-o", "--output", default="survey_archive.col", help="archive file (default: survey_archive.col)")
+    command.add_argument("--legacy", metavar="DIR", help="read the legacy JSON files in DIR instead of the storage")
+    command.set_defaults(handler=command_archive)
+
+    command = subparsers.add_parser("serve", help="run the ingestion server")
+    command.add_argument("--host", default="0.0.0.0")
+    command.add_argument("--port", type=int)
+    command.set_defaults(handler=command_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
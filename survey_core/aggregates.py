@@ -0,0 +1,309 @@
+"""Running aggregates over viewer records, kept up to date on every submission.
+
+The aggregates live in a small JSON sidecar next to the data files, so the
+analysis window reads a handful of numbers instead of the whole history.
+The sidecar also records the last respondent ID folded into it; a sidecar
+that disagrees with the data (after a crash between the two writes, say)
+is rebuilt from the records.
+"""
+import argparse  # Importing argparse for the command line interface
+import json  # Importing JSON module for the sidecar file
+import math  # Importing math for accurate sums of many ages
+import os  # Importing OS module for file and directory operations
+from array import array  # Importing array to collect ages for the exact quantiles
+from collections import Counter  # Importing Counter to count many values at once
+
+from survey_core.locking import file_lock
+
+AGGREGATES_FILE = "viewers_stats.json"  # Sidecar file holding the running aggregates
+CATEGORIES = ("sex", "ethnicity", "disabled")  # Viewer fields counted per value
+AGE_LIMIT = 120  # Ages from here up share the histogram's last bin
+CHART_BIN_WIDTH = 10  # Years per bar of the age distribution chart
+QUANTILES = {"p10_age": 0.1, "median_age": 0.5, "p90_age": 0.9}  # Summary key -> quantile of age
+
+
+def record_age(record):
+    """Return the numeric age of a viewer record, or None."""
+    age = record.get("age")
+    if isinstance(age, (int, float)) and not isinstance(age, bool) and age == age:
+        return age
+    return None
+
+
+class RunningStats:
+    """Count, mean and variance updated one value at a time (Welford's algorithm)."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2  # Sum of squared differences from the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine with statistics computed over a disjoint set of values."""
+        count = self.count + other.count
+        if not count:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        """Population variance of the values seen so far."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("count", 0), data.get("mean", 0.0), data.get("m2", 0.0))
+
+
+class AgeHistogram:
+    """Counts of ages in one-year bins, from 0 to :data:`AGE_LIMIT` and over.
+
+    Adding an age and merging two histograms take constant time, and the
+    histogram never grows.  Quantiles are taken as :func:`age_quantiles`
+    takes them from the sorted ages, with each age read as its bin's: exact
+    for the whole-year ages the form collects, within a year otherwise.
+    """
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts else [0] * (AGE_LIMIT + 1)
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def add(self, age):
+        self.counts[min(max(int(age), 0), AGE_LIMIT)] += 1
+
+    def add_many(self, ages):
+        for age, count in Counter(map(int, ages)).items():
+            self.counts[min(max(age, 0), AGE_LIMIT)] += count
+
+    def merge(self, other):
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+
+    def quantile(self, q):
+        """Return the age below which a fraction ``q`` of the ages lie, or None if empty."""
+        total = self.count
+        if not total:
+            return None
+        # Interpolate between the two ages around the position, as age_quantiles() does
+        position = q * (total - 1)
+        low = int(position)
+        low_age, high_age = self._age_at(low), self._age_at(min(low + 1, total - 1))
+        return float(low_age + (high_age - low_age) * (position - low))
+
+    def _age_at(self, rank):
+        """Return the bin of the age at ``rank`` (from 0) in sorted order."""
+        seen = 0
+        for age, count in enumerate(self.counts):
+            seen += count
+            if seen > rank:
+                return age
+        return AGE_LIMIT
+
+    def chart(self, width=CHART_BIN_WIDTH):
+        """Return ``(counts, edges)`` in bins of ``width`` years, from 0 to the oldest bin in use."""
+        used = max((age for age, count in enumerate(self.counts) if count), default=0)
+        bins = used // width + 1
+        counts = [sum(self.counts[i * width:(i + 1) * width]) for i in range(bins)]
+        return counts, [float(i * width) for i in range(bins + 1)]
+
+
+def age_quantiles(ages):
+    """Return the :data:`QUANTILES` of a sorted sequence of ages, interpolating between neighbours."""
+    result = {}
+    for key, q in QUANTILES.items():
+        if not ages:
+            result[key] = None
+            continue
+        position = q * (len(ages) - 1)
+        low = int(position)
+        high = min(low + 1, len(ages) - 1)
+        result[key] = ages[low] + (ages[high] - ages[low]) * (position - low)
+    return result
+
+
+class Aggregates:
+    """Viewer count, age statistics and per-value counts of the categorical fields."""
+
+    def __init__(self):
+        self.count = 0
+        self.last_id = None  # Last respondent ID counted, to check the aggregates against the data
+        self.age = RunningStats()
+        self.age_histogram = AgeHistogram()
+        self.categories = {field: {} for field in CATEGORIES}
+
+    def add_viewer(self, record):
+        self.count += 1
+        age = record_age(record)
+        if age is not None:
+            self.age.add(age)
+            self.age_histogram.add(age)
+        for field, counts in self.categories.items():
+            value = record.get(field)
+            if value:
+                counts[value] = counts.get(value, 0) + 1
+
+    def add_viewers(self, records):
+        """Add many viewer records at once; the same result as add_viewer() on each."""
+        records = list(records)
+        self.count += len(records)
+        ages = [age for age in map(record_age, records) if age is not None]
+        if ages:
+            mean = math.fsum(ages) / len(ages)
+            self.age.merge(RunningStats(len(ages), mean, math.fsum((age - mean) ** 2 for age in ages)))
+            self.age_histogram.add_many(ages)
+        for field, counts in self.categories.items():
+            for value, count in Counter(record.get(field) for record in records).items():
+                if value:
+                    counts[value] = counts.get(value, 0) + count
+
+    def merge(self, other):
+        self.count += other.count
+        self.age.merge(other.age)
+        self.age_histogram.merge(other.age_histogram)
+        for field, counts in other.categories.items():
+            mine = self.categories.setdefault(field, {})
+            for value, count in counts.items():
+                mine[value] = mine.get(value, 0) + count
+
+    @property
+    def complete(self):
+        """False for aggregates saved before the age histogram was kept."""
+        return self.age_histogram.count == self.age.count
+
+    def summary(self):
+        """Return the figures shown in the analysis window; quantiles come from the age histogram."""
+        summary = {
+            "count": self.count,
+            "mean_age": self.age.mean,
+            "std_age": self.age.std,
+            "females": self.categories["sex"].get("Female", 0),
+            "categories": self.categories,
+            "age_histogram": self.age_histogram.chart() if self.complete else ([], []),
+        }
+        for key, q in QUANTILES.items():
+            summary[key] = self.age_histogram.quantile(q) if self.complete else None
+        return summary
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "last_id": self.last_id,
+            "age": self.age.to_dict(),
+            "age_histogram": self.age_histogram.counts,
+            "categories": self.categories,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        aggregates.count = data.get("count", 0)
+        aggregates.last_id = data.get("last_id")
+        aggregates.age = RunningStats.from_dict(data.get("age", {}))
+        aggregates.age_histogram = AgeHistogram(data.get("age_histogram"))
+        for field, counts in data.get("categories", {}).items():
+            aggregates.categories[field] = dict(counts)
+        return aggregates
+
+    @classmethod
+    def from_records(cls, records):
+        aggregates = cls()
+        for position, record in enumerate(records, start=1):
+            aggregates.add_viewer(record)
+            # Records written before IDs existed are numbered by their position
+            aggregates.last_id = record.get("respondent_id") or position
+        return aggregates
+
+
+def exact_summary(records):
+    """Return ``Aggregates.summary()`` for viewer records, with the age quantiles computed exactly."""
+    aggregates, ages = Aggregates(), array("d")
+    for record in records:
+        aggregates.add_viewer(record)
+        age = record_age(record)
+        if age is not None:
+            ages.append(age)
+    summary = aggregates.summary()
+    summary.update(age_quantiles(sorted(ages)))
+    return summary
+
+
+class AggregateStore:
+    """Aggregates persisted in a JSON sidecar and updated under a file lock."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + ".lock"
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Return the stored aggregates (empty if there are none yet)."""
+        if not self.exists():
+            return Aggregates()
+        with open(self.path, "r", encoding="utf-8") as file:
+            return Aggregates.from_dict(json.load(file))
+
+    def update(self, records, last_id):
+        """Fold newly stored viewer records, the last of them with ID ``last_id``, into the aggregates.
+
+        Called with the data file's lock held, so the aggregates advance in
+        the same order as the data.
+        """
+        with file_lock(self.lock_path):
+            aggregates = self.load()
+            aggregates.add_viewers(records)
+            aggregates.last_id = last_id
+            self._save(aggregates)
+
+    def rebuild(self, records):
+        """Replace the aggregates with ones computed from all viewer records.
+
+        The caller holds the data file's lock, so no append is missed.
+        """
+        with file_lock(self.lock_path):
+            aggregates = Aggregates.from_records(records)
+            self._save(aggregates)
+        return aggregates
+
+    def _save(self, aggregates):
+        # Write a temporary file and swap it in, so readers never see half a file
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(aggregates.to_dict(), file)
+        os.replace(temporary, self.path)
+
+
+def main(argv=None):
+    """Command line entry point: ``python -m survey_core.aggregates rebuild``."""
+    from survey_core.storage import get_storage
+
+    parser = argparse.ArgumentParser(description="Maintain the running viewer aggregates.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="recompute the aggregates from the stored viewers")
+    parser.parse_args(argv)
+
+    aggregates = get_storage().rebuild_aggregates()
+    print(f"Rebuilt aggregates over {aggregates.count} viewers")
+
+
+if __name__ == "__main__":
+    main()
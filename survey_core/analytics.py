@@ -0,0 +1,254 @@
+"""Columnar analytics over viewers and questionnaire answers.
+
+Records are loaded once into NumPy arrays: ages as floats, demographic
+fields and Likert answers as small integer codes.  Every statistic is then
+a handful of vectorized operations (``bincount`` group-bys, boolean
+masks), which stays fast into millions of responses.
+
+NumPy is an optional dependency; :func:`available` reports whether it is
+installed.
+"""
+from array import array  # Importing array to collect columns before handing them to NumPy
+
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+MISSING = -1  # Code used for a missing or unrecognised value
+AGE_BINS = tuple(range(0, 101, 10))  # Default age histogram edges, in years
+
+
+def available():
+    """Return True if NumPy is installed."""
+    return np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Detailed analysis requires NumPy (pip install numpy).")
+
+
+class _Encoder:
+    """Dictionary-encode the values of one categorical field."""
+
+    def __init__(self, known=()):
+        self.values = list(known)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value):
+        if value is None or value == "":
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            # Values outside the form's choices still get their own group
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Dataset:
+    """Viewers and answers as parallel NumPy columns.
+
+    ``ages``, ``codes[field]`` and ``respondent_ids`` have one entry per
+    viewer.  ``answers`` is an ``(n_answers, n_questions)`` array of option
+    codes (0 = first option, ``MISSING`` if unanswered) and ``answer_viewer``
+    gives, for each answer row, the index of its viewer or ``MISSING``.
+    """
+
+    def __init__(self, respondent_ids, ages, codes, vocabularies, answers, answer_viewer):
+        self.respondent_ids = respondent_ids
+        self.ages = ages
+        self.codes = codes
+        self.vocabularies = vocabularies
+        self.answers = answers
+        self.answer_viewer = answer_viewer
+
+    @property
+    def viewer_count(self):
+        return len(self.ages)
+
+    @property
+    def answer_count(self):
+        return len(self.answers)
+
+
+def load_dataset(storage):
+    """Load every viewer and answer record from ``storage`` into a :class:`Dataset`."""
+    _require_numpy()
+    encoders = {field: _Encoder(values) for field, values in DEMOGRAPHICS.items()}
+    respondent_ids, ages = array("q"), array("d")
+    columns = {field: array("h") for field in DEMOGRAPHICS}
+    position_by_id, position_by_name = {}, {}
+
+    for position, record in enumerate(storage.iter_viewers()):
+        respondent_id = record.get("respondent_id") or 0
+        respondent_ids.append(respondent_id)
+        age = record.get("age")
+        ages.append(float(age) if isinstance(age, (int, float)) and not isinstance(age, bool) else float("nan"))
+        for field, column in columns.items():
+            column.append(encoders[field].encode(record.get(field)))
+        position_by_id[respondent_id] = position
+        position_by_name[record.get("name")] = position  # Last viewer with a name wins
+
+    option_codes = {option: code for code, option in enumerate(OPTIONS)}
+    answer_codes, answer_viewer = array("h"), array("q")
+    for record in storage.iter_answers():
+        answers = record.get("answers")
+        if not isinstance(answers, dict):
+            continue
+        for key in QUESTION_KEYS:
+            answer_codes.append(option_codes.get(answers.get(key), MISSING))
+        # Legacy answers have no respondent ID and are matched by name
+        respondent_id = record.get("respondent_id")
+        if respondent_id is not None:
+            answer_viewer.append(position_by_id.get(respondent_id, MISSING))
+        else:
+            answer_viewer.append(position_by_name.get(record.get("name"), MISSING))
+
+    return Dataset(
+        respondent_ids=np.frombuffer(respondent_ids, dtype=np.int64),
+        ages=np.frombuffer(ages, dtype=np.float64),
+        codes={field: np.frombuffer(column, dtype=np.int16) for field, column in columns.items()},
+        vocabularies={field: encoder.values for field, encoder in encoders.items()},
+        answers=np.frombuffer(answer_codes, dtype=np.int16).reshape(-1, len(QUESTION_KEYS)),
+        answer_viewer=np.frombuffer(answer_viewer, dtype=np.int64),
+    )
+
+
+def load_archive(archive):
+    """Build a :class:`Dataset` over the columns of a memory-mapped :class:`~survey_core.archive.Archive`.
+
+    Ages, codes and viewer positions are used in place; only the one-byte
+    answers are widened to the dataset's int16 codes.
+    """
+    _require_numpy()
+    from survey_core.archive import NO_ANSWER
+
+    width = len(archive.header["questions"])
+    answers = np.frombuffer(archive.column("answers"), dtype=np.uint8).reshape(-1, width).astype(np.int16)
+    # Archived answers outside the form's options are left out, as in load_dataset
+    answers[(answers == NO_ANSWER) | (answers >= len(OPTIONS))] = MISSING
+    columns = [archive.header["questions"].index(key) for key in QUESTION_KEYS]
+    return Dataset(
+        respondent_ids=np.frombuffer(archive.column("respondent_id"), dtype=np.int64),
+        ages=np.frombuffer(archive.column("age"), dtype=np.float64),
+        codes={field: np.frombuffer(archive.column(field), dtype=np.int16) for field in DEMOGRAPHICS},
+        vocabularies={field: list(archive.vocabularies[field]) for field in DEMOGRAPHICS},
+        answers=answers[:, columns],
+        answer_viewer=np.frombuffer(archive.column("answer_viewer"), dtype=np.int64),
+    )
+
+
+def group_counts(dataset, field):
+    """Return ``{value: number of viewers}`` for a demographic field."""
+    codes = dataset.codes[field]
+    vocabulary = dataset.vocabularies[field]
+    counts = np.bincount(codes[codes >= 0], minlength=len(vocabulary))
+    return dict(zip(vocabulary, counts.tolist()))
+
+
+def crosstab(dataset, row_field, column_field):
+    """Return a ``(row values, column values, counts)`` table of viewers."""
+    rows, columns = dataset.codes[row_field], dataset.codes[column_field]
+    row_values, column_values = dataset.vocabularies[row_field], dataset.vocabularies[column_field]
+    valid = (rows >= 0) & (columns >= 0)
+    # Encode each (row, column) pair as one integer so a single bincount does the grouping
+    pairs = rows[valid].astype(np.int64) * len(column_values) + columns[valid]
+    counts = np.bincount(pairs, minlength=len(row_values) * len(column_values))
+    return row_values, column_values, counts.reshape(len(row_values), len(column_values))
+
+
+def answer_distribution(dataset):
+    """Return ``{question key: [count per option]}`` over all answers."""
+    result = {}
+    for column, key in enumerate(QUESTION_KEYS):
+        codes = dataset.answers[:, column]
+        result[key] = np.bincount(codes[codes >= 0], minlength=len(OPTIONS)).tolist()
+    return result
+
+
+def mean_likert_by(dataset, field):
+    """Return ``{value: [mean score per question]}`` for a demographic field.
+
+    Scores run from 1 (Strongly Agree) to 5 (Strongly Disagree); a group
+    without answers to a question gets ``None``.
+    """
+    vocabulary = dataset.vocabularies[field]
+    joined = dataset.answer_viewer >= 0
+    groups = np.full(len(dataset.answer_viewer), MISSING, dtype=np.int64)
+    groups[joined] = dataset.codes[field][dataset.answer_viewer[joined]]
+
+    means = []
+    for column in range(len(QUESTION_KEYS)):
+        codes = dataset.answers[:, column]
+        valid = (codes >= 0) & (groups >= 0)
+        totals = np.bincount(groups[valid], weights=codes[valid] + 1, minlength=len(vocabulary))
+        counts = np.bincount(groups[valid], minlength=len(vocabulary))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means.append(totals / counts)
+    table = np.column_stack(means) if means else np.empty((len(vocabulary), 0))
+    return {
+        value: [None if np.isnan(score) else float(score) for score in row]
+        for value, row in zip(vocabulary, table)
+    }
+
+
+def mean_age_by(dataset, field):
+    """Return ``{value: mean age}`` for a demographic field."""
+    vocabulary = dataset.vocabularies[field]
+    codes = dataset.codes[field]
+    valid = (codes >= 0) & ~np.isnan(dataset.ages)
+    totals = np.bincount(codes[valid], weights=dataset.ages[valid], minlength=len(vocabulary))
+    counts = np.bincount(codes[valid], minlength=len(vocabulary))
+    return {
+        value: (float(total / count) if count else None)
+        for value, total, count in zip(vocabulary, totals, counts)
+    }
+
+
+def age_histogram(dataset, bins=AGE_BINS):
+    """Return ``(counts, edges)`` for the viewers' ages."""
+    ages = dataset.ages[~np.isnan(dataset.ages)]
+    counts, edges = np.histogram(ages, bins=bins)
+    return counts.tolist(), edges.tolist()
+
+
+def report(dataset):
+    """Collect everything shown in the analysis window."""
+    return {
+        "viewers": dataset.viewer_count,
+        "answers": dataset.answer_count,
+        "group_counts": {field: group_counts(dataset, field) for field in DEMOGRAPHICS},
+        "answer_distribution": answer_distribution(dataset),
+        "mean_likert": {field: mean_likert_by(dataset, field) for field in DEMOGRAPHICS},
+        "mean_age": {field: mean_age_by(dataset, field) for field in DEMOGRAPHICS},
+        "age_histogram": age_histogram(dataset),
+    }
+
+
+class ReportJob:
+    """Load a :class:`Dataset` and compute its :func:`report` through :class:`survey_ui.loader.BackgroundLoader`.
+
+    ``scan()`` reads every record on the worker thread and yields the
+    finished report once; ``apply()`` stores it on the Tk thread.
+    ``data`` is a storage backend, or an archive with ``from_archive``.
+    """
+
+    def __init__(self, data, from_archive=False):
+        self.data = data
+        self.from_archive = from_archive
+        self.report = None
+
+    def scan(self, cancel=None):
+        dataset = load_archive(self.data) if self.from_archive else load_dataset(self.data)
+        if cancel is None or not cancel.is_set():
+            yield report(dataset)
+
+    def apply(self, result):
+        self.report = result
+
+    def progress(self):
+        return 1.0 if self.report is not None else 0.0
@@ -0,0 +1,322 @@
+"""Compact columnar archive of viewers and answers, read through ``mmap``.
+
+An archive is one file:
+
+* 8 bytes: the magic ``SSCA`` and the little-endian length of the header;
+* a JSON header with the counts, vocabularies, viewer aggregates and the
+  position of every column;
+* the columns, each a packed ``array`` aligned to 8 bytes.
+
+Viewers take 8 bytes of age (NaN if missing), 8 bytes of
+respondent ID, 2 bytes per categorical field and 4 bytes of name code;
+names are dictionary-encoded once in a shared string table.  Each answer
+record takes one byte per question, a viewer position and a name code.
+
+Columns are exposed as typed ``memoryview`` slices of the mapped file, so
+reading an archive creates no per-record Python objects.
+"""
+import json  # Importing JSON module for the archive header
+import mmap  # Importing mmap to read columns straight from the page cache
+import os  # Importing OS module for file operations
+import struct  # Importing struct for the fixed-size preamble
+import sys  # Importing sys to check the byte order
+from array import array  # Importing array for the packed columns
+from bisect import bisect_right  # Importing bisect to find the record holding a dashboard row
+
+from survey_core.aggregates import Aggregates
+from survey_core.jsonstream import iter_legacy_file
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS
+
+MAGIC = b"SSCA"  # First bytes of every archive
+PREAMBLE = struct.Struct("<4sI")  # Magic and header length
+VERSION = 1  # Format version written to the header
+ALIGNMENT = 8  # Byte alignment of every column
+MISSING = -1  # Code of a missing categorical value or viewer position
+NO_ANSWER = 255  # Byte stored for an unanswered question
+ARCHIVE_FILE = "survey_archive.col"  # Default archive file name
+
+# Column name -> array typecode
+COLUMNS = {
+    "respondent_id": "q",
+    "age": "d",
+    "name": "I",
+    **{field: "h" for field in DEMOGRAPHICS},
+    "answers": "B",  # One byte per question, record after record
+    "answer_viewer": "q",
+    "answer_name": "I",
+    "row_starts": "Q",  # First dashboard row of each answer record
+    "name_offsets": "Q",  # Start of each name in name_blob, plus the end
+    "name_blob": "B",
+}
+
+
+class ArchiveError(ValueError):
+    """Raised when a file is not a readable archive."""
+
+
+class _Dictionary:
+    """Assign consecutive codes to values in order of first appearance."""
+
+    def __init__(self, known=()):
+        self.values = list(known)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def write_archive(path, viewers, answers):
+    """Write viewer and answer records to a columnar archive at ``path``.
+
+    ``viewers`` and ``answers`` are iterables of the records kept by the
+    storage backends and are read once.  Answers are joined to viewers by
+    respondent ID, or by name for legacy answers.  Returns the header.
+    """
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    names = _Dictionary()
+    categories = {field: _Dictionary(values) for field, values in DEMOGRAPHICS.items()}
+    options = _Dictionary(OPTIONS)
+    aggregates = Aggregates()
+    position_by_id, position_by_name = {}, {}
+
+    for position, record in enumerate(viewers):
+        respondent_id = record.get("respondent_id") or position + 1
+        columns["respondent_id"].append(respondent_id)
+        age = record.get("age")
+        columns["age"].append(float(age) if isinstance(age, (int, float)) and not isinstance(age, bool) else float("nan"))
+        columns["name"].append(names.encode(record.get("name") or ""))
+        for field, dictionary in categories.items():
+            value = record.get(field)
+            columns[field].append(dictionary.encode(value) if value else MISSING)
+        aggregates.add_viewer(record)
+        position_by_id[respondent_id] = position
+        position_by_name[record.get("name")] = position  # Last viewer with a name wins
+
+    rows = 0
+    for record in answers:
+        chosen = record.get("answers")
+        if not isinstance(chosen, dict):
+            continue
+        if record.get("respondent_id") is not None:
+            viewer = position_by_id.get(record["respondent_id"], MISSING)
+        else:
+            viewer = position_by_name.get(record.get("name"), MISSING)
+        # Answers stored with the record win; otherwise the viewer's name is shown
+        name = record.get("name")
+        if not name and viewer != MISSING:
+            name_code = columns["name"][viewer]
+        else:
+            name_code = names.encode(name or "")
+        columns["row_starts"].append(rows)
+        for key in QUESTION_KEYS:
+            value = chosen.get(key)
+            if value is None:
+                columns["answers"].append(NO_ANSWER)
+                continue
+            code = options.encode(value)
+            if code >= NO_ANSWER:
+                raise ArchiveError(f"Too many distinct answers to archive (question {key})")
+            columns["answers"].append(code)
+            rows += 1
+        columns["answer_viewer"].append(viewer)
+        columns["answer_name"].append(name_code)
+
+    offset = 0
+    for value in names.values:
+        columns["name_offsets"].append(offset)
+        encoded = value.encode("utf-8")
+        columns["name_blob"].frombytes(encoded)
+        offset += len(encoded)
+    columns["name_offsets"].append(offset)
+
+    layout, offset = {}, 0
+    for name, column in columns.items():
+        offset = _align(offset)
+        layout[name] = [column.typecode, offset, len(column)]
+        offset += len(column) * column.itemsize
+    header = {
+        "format": "survey-columnar",
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "viewers": len(columns["age"]),
+        "answers": len(columns["answer_viewer"]),
+        "rows": rows,
+        "questions": list(QUESTION_KEYS),
+        "vocabularies": {**{field: d.values for field, d in categories.items()}, "answer": options.values},
+        "aggregates": aggregates.to_dict(),
+        "columns": layout,
+    }
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, len(encoded_header)))
+        file.write(encoded_header)
+        data_start = _align(file.tell())
+        for name, column in columns.items():
+            file.write(b"\0" * (data_start + layout[name][1] - file.tell()))
+            column.tofile(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return header
+
+
+def convert_storage(storage, path):
+    """Archive everything held by a storage backend."""
+    return write_archive(path, storage.iter_viewers(), storage.iter_answers())
+
+
+def convert_legacy(viewers_path, answers_path, path):
+    """Archive the old ``viewers_data.json`` and ``survey_data.json`` files."""
+    viewers = iter_legacy_file(viewers_path) if os.path.exists(viewers_path) else ()
+    answers = iter_legacy_file(answers_path) if os.path.exists(answers_path) else ()
+    return write_archive(path, viewers, answers)
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class Archive:
+    """A memory-mapped archive.
+
+    ``column(name)`` returns a typed ``memoryview`` over the mapped file;
+    NumPy users can pass it straight to ``numpy.frombuffer``.
+    """
+
+    partitioned = False  # Archives have no date ranges (see Storage.between)
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            preamble = file.read(PREAMBLE.size)
+            if len(preamble) < PREAMBLE.size:
+                raise ArchiveError(f"{path} is not a survey archive")
+            magic, header_size = PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise ArchiveError(f"{path} is not a survey archive")
+            self.header = json.loads(file.read(header_size))
+            self._data_start = _align(PREAMBLE.size + header_size)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.header.get("version") != VERSION:
+            raise ArchiveError(f"Unsupported archive version: {self.header.get('version')}")
+        if self.header.get("byteorder") != sys.byteorder:
+            raise ArchiveError(f"{path} was written on a {self.header.get('byteorder')}-endian machine")
+        self.vocabularies = self.header["vocabularies"]
+        self.viewer_count = self.header["viewers"]
+        self.answer_count = self.header["answers"]
+
+    def column(self, name):
+        """Return the named column as a read-only typed ``memoryview``."""
+        typecode, offset, count = self.header["columns"][name]
+        start = self._data_start + offset
+        return memoryview(self._map)[start:start + count * array(typecode).itemsize].cast(typecode)
+
+    def name(self, code):
+        """Return the name with dictionary code ``code``."""
+        offsets = self.column("name_offsets")
+        return bytes(self.column("name_blob")[offsets[code]:offsets[code + 1]]).decode("utf-8")
+
+    def viewer_stats(self):
+        """Return the same summary as ``Storage.viewer_stats`` from the header."""
+        return Aggregates.from_dict(self.header["aggregates"]).summary()
+
+    def answer_row_source(self):
+        """Return a row source for the admin dashboard."""
+        return ArchiveRowSource(self)
+
+    def cached(self):
+        """Archives are read in place; see ``Storage.cached``."""
+        return self
+
+    def iter_viewers(self):
+        """Yield the viewer records, e.g. to re-import an archive."""
+        ids, ages, names = self.column("respondent_id"), self.column("age"), self.column("name")
+        codes = {field: self.column(field) for field in DEMOGRAPHICS}
+        for position in range(self.viewer_count):
+            age = ages[position]
+            record = {"respondent_id": ids[position], "name": self.name(names[position])}
+            record["age"] = None if age != age else (int(age) if age.is_integer() else age)
+            for field, column in codes.items():
+                code = column[position]
+                record[field] = self.vocabularies[field][code] if code != MISSING else ""
+            yield record
+
+    def iter_answers(self):
+        """Yield the questionnaire records."""
+        answers, viewers, names = self.column("answers"), self.column("answer_viewer"), self.column("answer_name")
+        ids = self.column("respondent_id")
+        width = len(self.header["questions"])
+        for position in range(self.answer_count):
+            chosen = {}
+            for index, key in enumerate(self.header["questions"]):
+                code = answers[position * width + index]
+                if code != NO_ANSWER:
+                    chosen[key] = self.vocabularies["answer"][code]
+            viewer = viewers[position]
+            record = {"name": self.name(names[position]), "answers": chosen}
+            if viewer != MISSING:
+                record["respondent_id"] = ids[viewer]
+            yield record
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Columns are still in use; the mapping is released with them
+
+
+class ArchiveRowSource:
+    """Dashboard row source over an archive.
+
+    The archive is immutable and stores the first row of every answer
+    record, so there is nothing to index: ``scan()`` yields nothing and a
+    window of rows is found with one bisect.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.total = archive.header["rows"]
+        self.row_starts = archive.column("row_starts")
+        self.answers = archive.column("answers")
+        self.names = archive.column("answer_name")
+        self.questions = archive.header["questions"]
+        self.options = archive.vocabularies["answer"]
+
+    def __len__(self):
+        return self.total
+
+    def refresh(self):
+        pass
+
+    def scan(self, cancel=None):
+        return iter(())
+
+    def apply(self, batch):
+        pass
+
+    def progress(self):
+        return 1.0
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``."""
+        stop = min(stop, self.total)
+        if start >= stop:
+            return []
+        record = bisect_right(self.row_starts, start) - 1
+        skip = start - self.row_starts[record]
+        width = len(self.questions)
+        result = []
+        while len(result) < stop - start + skip and record < len(self.row_starts):
+            name = self.archive.name(self.names[record]) or "Unknown"
+            for index, question in enumerate(self.questions):
+                code = self.answers[record * width + index]
+                if code != NO_ANSWER:
+                    result.append((name, question, self.options[code]))
+            record += 1
+        return result[skip:skip + stop - start]
@@ -0,0 +1,64 @@
+"""Application settings read from ``survey_config.json`` and the environment."""
+import json  # Importing JSON module for reading the settings file
+import os  # Importing OS module for environment variables and paths
+
+CONFIG_FILE = "survey_config.json"  # Settings file looked up in the working directory
+CONFIG_ENV = "SURVEY_CONFIG"  # Environment variable pointing at another settings file
+
+DEFAULTS = {
+    "storage": "jsonl",  # Storage backend: "jsonl", "sqlite" or "partitioned"
+    "data_dir": ".",  # Directory holding the data files
+    "partition_period": "day",  # Length of a partition with the "partitioned" backend: hour, day, week or month
+    "fsync": "batch",  # When submissions are synced to disk: "record", "batch" or "interval"
+    "fsync_interval": 1.0,  # Seconds between syncs with the "interval" policy
+    "write_queue_size": 1000,  # Submissions waiting for the writer before the kiosk blocks
+    "write_batch_size": 100,  # Largest number of submissions committed together
+    "ingest_url": "",  # Central ingestion server; when set, kiosks submit there instead of writing locally
+    "ingest_port": 8765,  # Port the ingestion server listens on
+    "spool_dir": "spool",  # Where kiosks keep submissions the server has not acknowledged yet
+    "metrics": False,  # Collect latency metrics (see survey_core.metrics)
+    "metrics_log": "metrics.log",  # Rotating log the metrics are written to, in the data directory
+    "archive": "",  # Columnar archive shown by the dashboard instead of the live data (see survey_core.archive)
+    "tail_cache": True,  # Keep parsed records in memory between dashboard opens (see survey_core.tailcache)
+    "cache_dir": "cache",  # Pre-rendered images, in the data directory
+    "startup_report": False,  # Print import and first-paint timings when the app starts
+}
+
+_settings = None
+
+
+def load_config(path=None):
+    """Return the defaults updated with the settings file and ``SURVEY_*`` variables.
+
+    Every key in :data:`DEFAULTS` can be overridden by an environment
+    variable named ``SURVEY_<KEY>``, e.g. ``SURVEY_STORAGE=sqlite``.
+    """
+    settings = dict(DEFAULTS)
+    path = path or os.environ.get(CONFIG_ENV, CONFIG_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            settings.update(json.load(file))
+    for key, default in DEFAULTS.items():
+        value = os.environ.get(f"SURVEY_{key.upper()}")
+        if value is not None:
+            settings[key] = _coerce(value, default)
+    return settings
+
+
+def _coerce(value, default):
+    """Convert an environment string to the type of the default value."""
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return value
+
+
+def get_config():
+    """Return the settings shared by the application."""
+    global _settings
+    if _settings is None:
+        _settings = load_config()
+    return _settings
@@ -0,0 +1,200 @@
+"""Streaming export of respondents joined with their answers.
+
+Rows are produced one questionnaire record at a time: each answer record
+is joined to its viewer through the storage's ID index
+(``Storage.viewer_reader``), so memory use does not grow with the data.
+Respondents who never answered the questionnaire are written afterwards;
+a bitmap with one bit per respondent ID remembers who already was.
+
+    python -m survey_core export -o results.csv.gz --sex Female
+"""
+import csv  # Importing csv for the CSV writer
+import gzip  # Importing gzip for compressed output
+import io  # Importing io to wrap binary outputs as text
+import os  # Importing OS module for the temporary output file
+
+from survey_core.model import DEMOGRAPHICS, QUESTION_KEYS
+
+COLUMNS = ("respondent_id", "name", "age") + tuple(DEMOGRAPHICS) + tuple(QUESTION_KEYS)  # Exported fields
+FORMATS = ("csv", "jsonl")  # Output formats
+PROGRESS_ROWS = 5000  # Records read between progress reports
+
+
+def output_format(path, fmt=None):
+    """Return ``(format, compressed)`` from an explicit format or the file name."""
+    compressed = path.lower().endswith(".gz")
+    stem = path[:-3] if compressed else path
+    if fmt is None:
+        fmt = "csv" if stem.lower().endswith(".csv") else "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return fmt, compressed
+
+
+def matches(row, filters):
+    """Return True if an export row passes the filters.
+
+    ``filters`` takes the dashboard filter fields: ``name`` is a
+    case-insensitive prefix, ``question`` and ``answer`` together select
+    rows with that answer to that question, and ``answer`` alone matches
+    any question.
+    """
+    for field, value in filters.items():
+        if field == "name":
+            if not str(row["name"] or "").casefold().startswith(value.casefold()):
+                return False
+        elif field in DEMOGRAPHICS:
+            if str(row[field] or "") != value:
+                return False
+    question, answer = filters.get("question"), filters.get("answer")
+    if question and answer:
+        return row.get(question) == answer
+    if question:
+        return row.get(question) is not None
+    if answer:
+        return any(row[key] == answer for key in QUESTION_KEYS)
+    return True
+
+
+def _joined_row(viewer, answers, name=None):
+    row = {column: None for column in COLUMNS}
+    if viewer:
+        for column in ("respondent_id", "name", "age") + tuple(DEMOGRAPHICS):
+            row[column] = viewer.get(column)
+    if name and not row["name"]:
+        row["name"] = name
+    for key in QUESTION_KEYS:
+        row[key] = answers.get(key)
+    return row
+
+
+def iter_rows(storage, filters=None):
+    """Yield one row per questionnaire record, then one per respondent without answers."""
+    for item in _scan(storage, filters):
+        if not isinstance(item, float):
+            yield item
+
+
+def _scan(storage, filters):
+    """Yield the export rows, with progress estimates (floats) in between."""
+    filters = {field: value for field, value in (filters or {}).items() if value}
+    expected = storage.last_respondent_id() or 0
+    answered = bytearray((expected >> 3) + 1)  # One bit per respondent ID
+    with storage.viewer_reader() as get_viewer:
+        for records, record in enumerate(storage.iter_answers(), start=1):
+            if records % PROGRESS_ROWS == 0:
+                yield 0.9 * min(1.0, records / expected) if expected else 0.0
+            answers = record.get("answers")
+            if not isinstance(answers, dict):
+                continue
+            respondent_id = record.get("respondent_id")
+            if respondent_id is not None:
+                if respondent_id >> 3 >= len(answered):
+                    answered.extend(bytes((respondent_id >> 3) + 1 - len(answered)))
+                answered[respondent_id >> 3] |= 1 << (respondent_id & 7)
+            # Legacy answers carry only a name and are exported without demographics
+            row = _joined_row(get_viewer(respondent_id), answers, record.get("name"))
+            if matches(row, filters):
+                yield row
+
+    # Respondents who left before the questionnaire
+    if filters.get("question") or filters.get("answer"):
+        return
+    for position, viewer in enumerate(storage.iter_viewers(), start=1):
+        if position % PROGRESS_ROWS == 0:
+            yield 0.9 + 0.1 * min(1.0, position / expected) if expected else 0.9
+        respondent_id = viewer.get("respondent_id") or position
+        if respondent_id >> 3 < len(answered) and answered[respondent_id >> 3] & (1 << (respondent_id & 7)):
+            continue
+        row = _joined_row(viewer, {})
+        if matches(row, filters):
+            yield row
+
+
+def row_writer(file, fmt):
+    """Return a function writing one row to a text file in ``fmt``."""
+    if fmt == "csv":
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        writer.writeheader()
+        return writer.writerow
+    from survey_core.jsonstream import encode_record
+
+    return lambda row: file.write(encode_record(row))
+
+
+def export(storage, path, fmt=None, filters=None, compress=None, progress=None, cancel=None):
+    """Export to ``path`` and return the number of rows written.
+
+    The format follows the file name (``.csv``, ``.jsonl``, optionally with
+    ``.gz``) unless ``fmt``/``compress`` are given.  ``progress(fraction)``
+    is called now and then.  See :func:`export_steps` for ``cancel``.
+    """
+    steps = export_steps(storage, path, fmt, filters, compress, cancel)
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as done:
+            return done.value
+        if progress:
+            progress(fraction)
+
+
+def export_steps(storage, path, fmt=None, filters=None, compress=None, cancel=None):
+    """Generator form of :func:`export`: yields progress fractions and returns the row count.
+
+    The file is written under a temporary name and only replaces ``path``
+    once complete; setting the ``cancel`` event stops the export and leaves
+    ``path`` alone.
+    """
+    detected, compressed = output_format(path, fmt)
+    compress = compressed if compress is None else compress
+    temporary = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with open(temporary, "wb") as raw:
+            binary = gzip.GzipFile(fileobj=raw, mode="wb") if compress else raw
+            with io.TextIOWrapper(binary, encoding="utf-8", newline="") as text:
+                write = row_writer(text, detected)
+                for item in _scan(storage, filters):
+                    if isinstance(item, float):
+                        yield item
+                        if cancel is not None and cancel.is_set():
+                            break
+                    else:
+                        write(item)
+                        count += 1
+        if cancel is not None and cancel.is_set():
+            os.remove(temporary)
+            return count
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    yield 1.0
+    return count
+
+
+class ExportJob:
+    """Run an export through :class:`survey_ui.loader.BackgroundLoader`.
+
+    ``scan()`` runs the export on the worker thread and yields progress
+    fractions; ``apply()`` records them on the Tk thread.  ``count`` holds
+    the number of rows written once the export finished.
+    """
+
+    def __init__(self, storage, path, filters=None):
+        self.storage = storage
+        self.path = path
+        self.filters = filters
+        self.fraction = 0.0
+        self.count = None
+
+    def scan(self, cancel=None):
+        self.count = yield from export_steps(self.storage, self.path, filters=self.filters, cancel=cancel)
+
+    def apply(self, fraction):
+        self.fraction = fraction
+
+    def progress(self):
+        return self.fraction
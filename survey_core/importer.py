@@ -0,0 +1,237 @@
+"""Bulk import of respondents typed in from paper forms or exported by other tools.
+
+Each input row holds the survey form fields (name, age, sex, ethnicity,
+disabled) and optionally the questionnaire answers, as ``q1``-``q3``
+columns or an ``answers`` object.  Rows are checked against the same rules
+as the survey pages (:func:`survey_core.model.validate_viewer` and
+:func:`~survey_core.model.validate_answers`), then every accepted row is
+stored with one append of viewers and one of answers.
+
+    python -m survey_core import paper_forms.csv --rejects rejected.csv
+
+Most rows pass a quick inline check of the allowed values; only a row that
+fails it goes through the form's validators, which supply the error
+message shown in the rejects report.
+"""
+import csv  # Importing csv for CSV input and the rejects report
+import json  # Importing JSON module for JSON Lines input
+from itertools import compress, islice, repeat  # Importing itertools to batch rows and build records column-wise
+
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS, ValidationError, validate_answers, validate_viewer
+
+VALIDATE_BATCH = 10000  # Rows validated together, column by column
+REJECT_COLUMNS = ("row_number", "error", "row")  # Columns of the rejects report
+VIEWER_FIELDS = ("name", "age") + tuple(DEMOGRAPHICS)  # Fields of a stored viewer record, in order
+FIELDS = VIEWER_FIELDS + QUESTION_KEYS + ("answers",)  # Input columns read by the importer
+ANSWER_VALUES = set(OPTIONS) | {"", None}  # A question column holds options or blanks
+_ZERO, _INFINITY = 0.0, float("inf")
+
+
+def read_batches(path, size=VALIDATE_BATCH):
+    """Yield the rows of a CSV or JSON Lines file in batches of ``size``.
+
+    A batch is a dict of columns (field -> list of values) plus the rows
+    themselves for error reports: CSV rows as ``{header: value}`` dicts
+    built only on request, JSON Lines rows as decoded.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            reader = csv.reader(file)
+            header = next(reader, [])
+            while True:
+                chunk = list(islice(reader, size))
+                if not chunk:
+                    return
+                batch = [row for row in chunk if row]  # Blank lines are skipped, as by csv.DictReader
+                if batch:
+                    yield _csv_columns(header, batch), (lambda row, header=header: dict(zip(header, row))), batch
+        else:
+            lines = (line for line in file if line.strip())
+            while True:
+                batch = [_decode(line) for line in islice(lines, size)]
+                if not batch:
+                    return
+                yield _json_columns(batch), (lambda row: row), batch
+
+
+def _decode(line):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return line  # Rejected by validate_row rather than stopping the import
+
+
+def _csv_columns(header, rows):
+    width = len(header)
+    if set(map(len, rows)) != {width}:
+        # Short rows are padded as csv.DictReader does; extra values are ignored
+        rows = [row[:width] + [None] * (width - len(row)) for row in rows]
+    columns = dict(zip(header, zip(*rows))) if rows and width else {}
+    return {field: columns.get(field) or [None] * len(rows) for field in FIELDS}
+
+
+def _json_columns(rows):
+    # Anything but an object (a bad line, a list) fails validate_row later
+    objects = [row if isinstance(row, dict) else {"": row} for row in rows]
+    return {field: [row.get(field) for row in objects] for field in FIELDS}
+
+
+def _given_answers(row):
+    answers = row.get("answers")
+    if answers:
+        return answers
+    return {key: row.get(key) for key in QUESTION_KEYS if row.get(key)}
+
+
+def validate_row(row):
+    """Return ``(viewer, answers)`` for one row; ``answers`` is None if the row has none.
+
+    Raises ValidationError with the message the survey pages would show.
+    """
+    if isinstance(row, str):
+        raise ValidationError("Not a valid JSON object.")
+    if not isinstance(row, dict):
+        raise ValidationError("Expected one respondent per row.")
+    viewer = validate_viewer(row.get("name"), row.get("age"), row.get("sex"), row.get("ethnicity"), row.get("disabled"))
+    given = _given_answers(row)
+    if not given:
+        return viewer, None
+    if not isinstance(given, dict):
+        raise ValidationError("Please answer all questions before submitting.")
+    return viewer, validate_answers(given)
+
+
+def _bad_rows(columns, count):
+    """Return the positions of the rows that might not pass validate_row(), and the parsed ages.
+
+    Each check runs over a whole column; a clean column costs one pass in C
+    (``set``, ``map``, ``all``) and only a dirty one is searched row by row.
+    """
+    bad = set()
+    raw_ages = columns["age"]
+    if set(map(type, raw_ages)) <= {str, int, float}:
+        try:
+            ages = list(map(float, raw_ages))
+        except ValueError:
+            ages = None
+    else:
+        ages = None  # Booleans, missing values or objects somewhere in the column
+    if ages is None:
+        ages = []
+        for position, age in enumerate(raw_ages):
+            try:
+                if age is True or age is False:
+                    raise ValueError
+                ages.append(float(age))
+            except (TypeError, ValueError):
+                bad.add(position)
+                ages.append(1.0)
+    if not (all(map(_ZERO.__lt__, ages)) and all(map(_INFINITY.__gt__, ages))):
+        bad.update(position for position, age in enumerate(ages) if not 0 < age < _INFINITY)
+
+    if not all(columns["name"]):
+        bad.update(position for position, name in enumerate(columns["name"]) if not name)
+    for field, allowed in DEMOGRAPHICS.items():
+        values = columns[field]
+        try:
+            clean = set(values) <= set(allowed)
+        except TypeError:  # Unhashable JSON values
+            clean = False
+        if not clean:
+            bad.update(position for position, value in enumerate(values) if value not in allowed)
+
+    # A row either has no answers or a listed option for every question
+    if any(columns["answers"]):
+        bad.update(position for position, answers in enumerate(columns["answers"]) if answers)
+    questions = [columns[key] for key in QUESTION_KEYS]
+    for values in questions:
+        try:
+            clean = set(values) <= ANSWER_VALUES
+        except TypeError:
+            clean = False
+        if not clean:
+            bad.update(position for position, value in enumerate(values) if value and value not in OPTIONS)
+    answered = list(map(any, zip(*questions)))
+    complete = list(map(all, zip(*questions)))
+    if answered != complete:
+        bad.update(position for position in range(count) if answered[position] != complete[position])
+    return bad, ages, answered
+
+
+class ImportReport:
+    """Outcome of an import: counts and the rejected rows."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = []  # (row number, error message, row)
+        self.answered = 0
+
+    def write_rejects(self, path):
+        """Write the rejected rows as CSV, each with its row number (from 1) and error."""
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(REJECT_COLUMNS)
+            for number, error, row in self.rejected:
+                writer.writerow((number, error, row.rstrip("\n") if isinstance(row, str) else json.dumps(row, default=str)))
+
+
+def validate_batches(batches, progress=None):
+    """Validate every batch from :func:`read_batches`; return ``(viewers, answers, report)``.
+
+    ``answers[i]`` belongs to ``viewers[i]`` and is None if that respondent
+    has no questionnaire answers.  ``progress(rows read)`` is called after
+    each batch.
+    """
+    viewers, answers, report = [], [], ImportReport()
+    read = 0
+    for columns, as_row, rows in batches:
+        bad, ages, answered = _bad_rows(columns, len(rows))
+        # Build the records of the whole batch column-wise, then fix up the rows that need a closer look
+        rows_viewers = list(map(dict, map(zip, repeat(VIEWER_FIELDS), zip(
+            columns["name"], ages, *(columns[field] for field in DEMOGRAPHICS)
+        ))))
+        rows_answers = list(map(dict, map(zip, repeat(QUESTION_KEYS), zip(*(columns[key] for key in QUESTION_KEYS)))))
+        rows_answers = [chosen if flag else None for chosen, flag in zip(rows_answers, answered)]
+        rejected = set()
+        for position in sorted(bad):
+            # The form's validators decide, and word the error
+            try:
+                rows_viewers[position], rows_answers[position] = validate_row(as_row(rows[position]))
+            except ValidationError as e:
+                rejected.add(position)
+                report.rejected.append((read + position + 1, str(e), as_row(rows[position])))
+        if rejected:
+            keep = [position not in rejected for position in range(len(rows))]
+            rows_viewers, rows_answers = list(compress(rows_viewers, keep)), list(compress(rows_answers, keep))
+        viewers.extend(rows_viewers)
+        answers.extend(rows_answers)
+        read += len(rows)
+        if progress:
+            progress(read)
+    report.accepted = len(viewers)
+    return viewers, answers, report
+
+
+def import_batches(storage, batches, dry_run=False, progress=None):
+    """Validate rows from :func:`read_batches` and store the accepted respondents; return an :class:`ImportReport`.
+
+    Everything is validated before anything is written, and the accepted
+    viewers are appended in a single write, so their respondent IDs are
+    consecutive.  ``dry_run`` only validates.
+    """
+    viewers, answers, report = validate_batches(batches, progress)
+    if dry_run or not viewers:
+        return report
+    ids = storage.append_viewers(viewers)
+    records = [
+        {"respondent_id": respondent_id, "name": viewer["name"], "answers": chosen}
+        for respondent_id, viewer, chosen in zip(ids, viewers, answers) if chosen
+    ]
+    storage.append_answers(records)
+    report.answered = len(records)
+    return report
+
+
+def import_file(storage, path, dry_run=False, progress=None):
+    """Import a CSV or JSON Lines file; see :func:`import_batches`."""
+    return import_batches(storage, read_batches(path), dry_run, progress)
@@ -0,0 +1,476 @@
+"""Central ingestion service so several kiosks submit to one store.
+
+The server accepts batches of submissions over HTTP and writes them through
+a single :class:`~survey_core.writer.WriteBehindQueue`, so concurrent
+requests share group commits.  Kiosks use :class:`IngestClient`, which
+spools every submission to a local file first and sends the spool in
+batches from a background thread, retrying with backoff while the server
+is unreachable.
+
+A batch is a JSON object ``{"submissions": [...]}``; each submission is
+either ``{"key": K, "viewer": {...}}`` or ``{"key": K, "answers": {...}}``.
+The key is generated by the kiosk and links a viewer to their answers;
+the server assigns the respondent ID.
+
+Run the server with ``python -m survey_core.ingest serve``.
+"""
+import argparse  # Importing argparse for the command line interface
+import io  # Importing io to give the loopback transport's errors a body
+import json  # Importing JSON module for request and response bodies
+import logging  # Importing logging to report delivery problems of the sender thread
+import os  # Importing OS module for the spool files
+import threading  # Importing threading for the sender thread and locks
+import time  # Importing time for retry backoff
+import urllib.error  # Importing urllib.error to detect failed requests
+import urllib.request  # Importing urllib.request to post batches
+import uuid  # Importing uuid for submission keys
+from collections import OrderedDict  # Importing OrderedDict for the bounded key table
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Importing the standard library HTTP server
+
+from survey_core.jsonstream import encode_record
+from survey_core.locking import file_lock
+from survey_core.model import ValidationError, validate_answers, validate_viewer
+from survey_core.storage import iter_json_lines
+
+INGEST_PATH = "/submissions"  # URL path batches are posted to
+MAX_KEYS = 100000  # Submission keys remembered for linking answers and dropping resent batches
+CLIENT_BATCH_SIZE = 500  # Submissions sent per request
+REQUEST_TIMEOUT = 10  # Seconds before a request to the server is abandoned
+STORE_TIMEOUT = 30  # Seconds the server waits for a batch to be written before replying with an error
+MAX_BACKOFF = 30.0  # Longest wait between retries, in seconds
+SPOOL_FILE = "ingest_spool.jsonl"  # Submissions not yet acknowledged by the server
+OFFSET_FILE = "ingest_spool.offset"  # Byte offset in the spool up to which the server has acknowledged
+KEYS_FILE = "ingest_keys.jsonl"  # Keys of the submissions the server stored, kept across restarts
+REJECTS_FILE = "ingest_rejects.jsonl"  # Spooled submissions the server refused, with its reason
+
+log = logging.getLogger("survey.ingest")
+
+
+class IngestService:
+    """Validate batches, link answers to viewers by key and write through one queue.
+
+    With a ``keys_path``, the key of every stored submission (and a
+    viewer's respondent ID) is also appended to that file and read back on
+    start, so a batch resent after a server restart is still recognised
+    and later answers still find their viewer.
+    """
+
+    def __init__(self, writer, keys_path=None):
+        self.writer = writer
+        self.keys_path = keys_path
+        self._lock = threading.Lock()
+        self._tickets = OrderedDict()  # Viewer key -> Ticket, oldest first
+        self._seen_answers = OrderedDict()  # Answer key -> Ticket, oldest first
+        if keys_path:
+            self._load_keys()
+
+    def ingest(self, batch):
+        """Store a batch and return the number of new submissions, once they are written.
+
+        Raises ValueError (the server replies 400) if any submission is
+        malformed or would not pass the survey form's checks; nothing of
+        the batch is stored then.  Raises the writer's error if any
+        submission could not be stored, so the kiosk keeps it spooled and
+        sends it again.
+        """
+        submissions = batch.get("submissions") if isinstance(batch, dict) else None
+        if not isinstance(submissions, list):
+            raise ValueError("Expected an object with a 'submissions' list")
+        records = [_validate_submission(number, submission) for number, submission in enumerate(submissions, start=1)]
+
+        waiting = []  # (key table, key, ticket, queued by this request) for every submission
+        stored = 0
+        with self._lock:
+            # Queue under the lock so answers always follow their viewer in the queue
+            for submission, record in zip(submissions, records):
+                key = submission["key"]
+                table = self._tickets if "viewer" in submission else self._seen_answers
+                ticket = self._known(table, key)
+                new = ticket is None
+                if new:
+                    if "viewer" in submission:
+                        ticket = self.writer.submit_viewer(record)
+                    else:
+                        ticket = self.writer.submit_answers(self._tickets.get(key), record)
+                    table[key] = ticket
+                    self._remember(table)
+                    stored += 1
+                # A resent submission still waits for the original write to finish
+                waiting.append((table, key, ticket, new))
+
+        # A batch may span several group commits, so every ticket is checked
+        deadline = time.monotonic() + STORE_TIMEOUT
+        error = None
+        for table, key, ticket, _ in waiting:
+            ticket.wait(max(0.0, deadline - time.monotonic()))
+            if not ticket.done():
+                raise TimeoutError("Timed out waiting for the submissions to be stored")
+            if ticket.error is not None:
+                with self._lock:
+                    # Forget the key so the kiosk's retry is stored rather than skipped
+                    if table.get(key) is ticket:
+                        del table[key]
+                error = error or ticket.error
+        self._save_keys([
+            {"key": key, "respondent_id": ticket.respondent_id} if table is self._tickets else {"key": key}
+            for table, key, ticket, new in waiting if new and ticket.error is None
+        ])
+        if error is not None:
+            raise error
+        return stored
+
+    @staticmethod
+    def _known(table, key):
+        """Return the ticket of a submission already queued under ``key``, unless it failed."""
+        ticket = table.get(key)
+        if ticket is not None and ticket.done() and ticket.error is not None:
+            del table[key]
+            return None
+        return ticket
+
+    @staticmethod
+    def _remember(table):
+        while len(table) > MAX_KEYS:
+            table.popitem(last=False)
+
+    def _load_keys(self):
+        lines = 0
+        for entry in iter_json_lines(self.keys_path):
+            table = self._tickets if "respondent_id" in entry else self._seen_answers
+            table[entry["key"]] = _StoredTicket(entry.get("respondent_id"))
+            self._remember(table)
+            lines += 1
+        if lines > 2 * MAX_KEYS:
+            # Keep the file about as long as the tables it restores
+            temporary = self.keys_path + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                for key, ticket in self._tickets.items():
+                    file.write(encode_record({"key": key, "respondent_id": ticket.respondent_id}))
+                for key in self._seen_answers:
+                    file.write(encode_record({"key": key}))
+            os.replace(temporary, self.keys_path)
+
+    def _save_keys(self, entries):
+        if not self.keys_path or not entries:
+            return
+        with file_lock(self.keys_path + ".lock"):
+            with open(self.keys_path, "a", encoding="utf-8") as file:
+                file.write("".join(encode_record(entry) for entry in entries))
+
+
+def _validate_submission(number, submission):
+    """Return the record to store for one submission, checked as the survey form would.
+
+    Raises ValueError naming the submission (counted from 1) otherwise.
+    """
+    if not isinstance(submission, dict) or ("viewer" not in submission and "answers" not in submission):
+        raise ValueError(f"Submission {number}: needs a 'viewer' or 'answers' object")
+    if not isinstance(submission.get("key"), str) or not submission["key"]:
+        raise ValueError(f"Submission {number}: needs a 'key'")
+    try:
+        if "viewer" in submission:
+            viewer = submission["viewer"]
+            if not isinstance(viewer, dict):
+                raise ValidationError("Expected a viewer object.")
+            return validate_viewer(*(viewer.get(field) for field in ("name", "age", "sex", "ethnicity", "disabled")))
+        record = submission["answers"]
+        if not isinstance(record, dict) or not isinstance(record.get("answers"), dict):
+            raise ValidationError("Please answer all questions before submitting.")
+        return dict(record, answers=validate_answers(record["answers"]))
+    except ValidationError as e:
+        raise ValueError(f"Submission {number}: {e}") from None
+
+
+class _IngestHandler(BaseHTTPRequestHandler):
+    """Accept POSTed batches for the service attached to the server."""
+
+    def do_POST(self):
+        if self.path != INGEST_PATH:
+            self._reply(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            batch = json.loads(self.rfile.read(length))
+            stored = self.server.service.ingest(batch)
+        except (ValueError, AttributeError, TypeError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+        else:
+            self._reply(200, {"stored": stored})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet; errors are reported in the replies
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    """Create (but do not start) an HTTP server for ``service``."""
+    server = ThreadingHTTPServer((host, port), _IngestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+class HttpTransport:
+    """Post batches to an ingestion server."""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/") + INGEST_PATH if not url.endswith(INGEST_PATH) else url
+
+    def send(self, batch):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(batch).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            return json.loads(response.read())
+
+
+class LoopbackTransport:
+    """Hand batches straight to an in-process service; stands in for the network in tests."""
+
+    def __init__(self, service):
+        self.service = service
+        self.online = True  # Set to False to simulate an unreachable server
+
+    def send(self, batch):
+        if not self.online:
+            raise ConnectionError("Ingestion server unreachable")
+        # Round-trip through JSON, as the HTTP transport would, and refuse bad batches with a 400 like the server
+        try:
+            stored = self.service.ingest(json.loads(json.dumps(batch)))
+        except ValueError as e:
+            body = io.BytesIO(json.dumps({"error": str(e)}).encode("utf-8"))
+            raise urllib.error.HTTPError(INGEST_PATH, 400, str(e), None, body) from e
+        return {"stored": stored}
+
+
+class _StoredTicket:
+    """A resolved stand-in for a writer ticket, e.g. for a key stored before the server restarted."""
+
+    error = None
+
+    def __init__(self, respondent_id=None):
+        self.respondent_id = respondent_id
+
+    def wait(self, timeout=None):
+        return self.respondent_id
+
+    def done(self):
+        return True
+
+
+class _ClientTicket(_StoredTicket):
+    """Stands in for a writer ticket on a kiosk; the server assigns the respondent ID.
+
+    The submission is safely spooled once the ticket exists, so it is
+    already done; delivery to the server is retried by the client.
+    """
+
+    def __init__(self, key):
+        super().__init__()
+        self.key = key
+
+
+class IngestClient:
+    """Kiosk side of the ingestion service, with an offline spool and retries.
+
+    Offers the same ``submit_viewer``/``submit_answers``/``close`` methods as
+    :class:`~survey_core.writer.WriteBehindQueue`, so the submit flow does
+    not care where its records go.
+    """
+
+    def __init__(self, transport, spool_dir, batch_size=CLIENT_BATCH_SIZE):
+        self.transport = transport
+        self.batch_size = batch_size
+        os.makedirs(spool_dir, exist_ok=True)
+        self.spool_path = os.path.join(spool_dir, SPOOL_FILE)
+        self.offset_path = os.path.join(spool_dir, OFFSET_FILE)
+        self.rejects_path = os.path.join(spool_dir, REJECTS_FILE)
+        self._wake = threading.Condition()
+        self._closing = False
+        self.thread = threading.Thread(target=self._run, name="ingest-sender", daemon=True)
+        self.thread.start()
+
+    def submit_viewer(self, record):
+        ticket = _ClientTicket(uuid.uuid4().hex)
+        self._spool({"key": ticket.key, "viewer": record})
+        return ticket
+
+    def submit_answers(self, ticket, record):
+        key = ticket.key if ticket is not None else uuid.uuid4().hex
+        self._spool({"key": key, "answers": record})
+        return _ClientTicket(key)
+
+    def pending(self):
+        """Return the number of bytes of spooled submissions not yet acknowledged."""
+        with file_lock(self.spool_path + ".lock"):
+            return self._spool_size() - self._read_offset()
+
+    def close(self, timeout=5.0):
+        """Try to send what is spooled, then stop; anything left is sent on the next start."""
+        with self._wake:
+            self._closing = True
+            self._wake.notify()
+        self.thread.join(timeout)
+
+    def _spool(self, submission):
+        # Spool before sending so a submission survives a crash or an offline server
+        with file_lock(self.spool_path + ".lock"):
+            with open(self.spool_path, "a", encoding="utf-8") as file:
+                file.write(encode_record(submission))
+        with self._wake:
+            self._wake.notify()
+
+    def _run(self):
+        delay = 0.0
+        while True:
+            with self._wake:
+                if delay:
+                    # New submissions do not cut the backoff short; closing does
+                    deadline = time.monotonic() + delay
+                    while not self._closing and time.monotonic() < deadline:
+                        self._wake.wait(deadline - time.monotonic())
+                elif not self._closing and not self._has_pending():
+                    self._wake.wait()
+                closing = self._closing
+            try:
+                sent = self._send_next_batch()
+                delay = 0.0
+            except (OSError, ValueError, urllib.error.URLError) as e:
+                if closing:
+                    return
+                # Server unreachable or refusing: back off exponentially
+                delay = min(MAX_BACKOFF, max(0.5, delay * 2))
+                log.warning("Ingestion server unavailable (%s); retrying in %.1fs", e, delay)
+                continue
+            if closing and not sent:
+                return
+
+    def _has_pending(self):
+        return self._spool_size() > self._read_offset()
+
+    def _send_next_batch(self):
+        """Send up to one batch from the spool; return the number of submissions sent or set aside.
+
+        A batch the server refuses (4xx) is sent again one submission at a
+        time, and the refused ones go to the rejects file, so one bad
+        record does not hold up the rest of the spool.
+        """
+        offset = self._read_offset()
+        submissions, unreadable, end = [], [], offset
+        if os.path.exists(self.spool_path):
+            with open(self.spool_path, "rb") as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    end += len(line)
+                    if line.strip():
+                        try:
+                            submissions.append(json.loads(line))
+                        except ValueError:
+                            unreadable.append(line.decode("utf-8", "replace").rstrip("\n"))
+                    if len(submissions) + len(unreadable) >= self.batch_size:
+                        break
+        if not submissions and not unreadable:
+            return 0
+
+        if unreadable:
+            self._reject(unreadable, "Not a valid JSON line")
+        if submissions:
+            try:
+                self.transport.send({"submissions": submissions})
+            except urllib.error.HTTPError as e:
+                if not 400 <= e.code < 500:
+                    raise
+                if len(submissions) == 1:
+                    self._reject(submissions, _error_message(e))
+                else:
+                    self._send_each(submissions)
+
+        # Acknowledged (or set aside): advance the offset, and empty the spool once it is fully sent
+        with file_lock(self.spool_path + ".lock"):
+            if end >= self._spool_size():
+                open(self.spool_path, "w").close()
+                end = 0
+            self._write_offset(end)
+        return len(submissions) + len(unreadable)
+
+    def _send_each(self, submissions):
+        """Send submissions one at a time, setting aside those the server refuses."""
+        for submission in submissions:
+            try:
+                self.transport.send({"submissions": [submission]})
+            except urllib.error.HTTPError as e:
+                if not 400 <= e.code < 500:
+                    raise
+                self._reject([submission], _error_message(e))
+
+    def _reject(self, submissions, error):
+        """Append refused submissions to the rejects file, for an administrator to look at."""
+        log.error("Ingestion server refused %d submission(s): %s", len(submissions), error)
+        with open(self.rejects_path, "a", encoding="utf-8") as file:
+            file.write("".join(encode_record({"error": error, "submission": submission}) for submission in submissions))
+
+    def _spool_size(self):
+        return os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as file:
+                return int(file.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset):
+        temporary = self.offset_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(str(offset))
+        os.replace(temporary, self.offset_path)
+
+
+def _error_message(error):
+    """Return the ``error`` of a refused request's JSON body, or the HTTP reason."""
+    try:
+        return json.loads(error.read())["error"]
+    except Exception:
+        return str(error)
+
+
+def main(argv=None):
+    """Command line entry point: ``python -m survey_core.ingest serve``."""
+    from survey_core.config import get_config
+    from survey_core.writer import get_writer, close_writer
+
+    parser = argparse.ArgumentParser(description="Central ingestion server for survey kiosks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="accept submissions over HTTP")
+    serve.add_argument("--host", default="0.0.0.0", help="address to listen on (default: all interfaces)")
+    serve.add_argument("--port", type=int, default=get_config()["ingest_port"], help="port to listen on")
+    args = parser.parse_args(argv)
+
+    keys_path = os.path.join(get_config()["data_dir"], KEYS_FILE)
+    server = make_server(IngestService(get_writer(local=True), keys_path), args.host, args.port)
+    print(f"Listening for submissions on http://{args.host}:{args.port}{INGEST_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        close_writer()
+
+
+if __name__ == "__main__":
+    main()
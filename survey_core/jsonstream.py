@@ -0,0 +1,174 @@
+"""Incremental decoding of concatenated JSON documents.
+
+Older versions of the app appended a whole JSON array to ``survey_data.json``
+on every submission, leaving files shaped like ``[...][...][...]``.  The
+helpers here read such files in fixed-size chunks and yield one entry at a
+time, so memory use does not depend on the size of the file.
+"""
+import argparse  # Importing argparse for the command line interface
+import json  # Importing JSON module for decoding values
+import os  # Importing OS module for file and directory operations
+
+CHUNK_SIZE = 64 * 1024  # Number of characters read from the file at a time
+MAX_VALUE_SIZE = 16 * 1024 * 1024  # Largest single value we are willing to buffer
+NUMBER_CHARS = frozenset("0123456789+-.eE")  # Characters that can continue a JSON number
+_ENCODER = json.JSONEncoder(separators=(",", ":"))  # Shared, so an encoder is not built per record
+
+
+def encode_record(record):
+    """Encode a record as a single JSON line."""
+    return _ENCODER.encode(record) + "\n"
+
+
+class _ChunkReader:
+    """Buffer over a text file that grows only as far as the current value."""
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Read the next chunk, dropping everything already consumed."""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        if len(self.buffer) > MAX_VALUE_SIZE:
+            raise json.JSONDecodeError("JSON value exceeds the maximum size", self.buffer, 0)
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character, or None at the end of the file."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return None
+
+    def advance(self):
+        """Consume the character returned by peek()."""
+        self.position += 1
+
+    def decode(self):
+        """Decode the value starting at the current position."""
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # The value may simply be cut off at the chunk boundary
+                if self.eof or not self.fill():
+                    raise
+                continue
+            # A number cut off at the chunk boundary decodes as a shorter number,
+            # so make sure the following character cannot be part of it
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in NUMBER_CHARS)
+                and not self.eof
+                and self.fill()
+            ):
+                continue
+            self.position = end
+            return value
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.position)
+
+
+def iter_json_documents(file, chunk_size=CHUNK_SIZE):
+    """Yield each top-level JSON value from a stream of concatenated documents."""
+    reader = _ChunkReader(file, chunk_size)
+    while reader.peek() is not None:
+        yield reader.decode()
+
+
+def iter_legacy_entries(file, chunk_size=CHUNK_SIZE):
+    """Yield the entries of concatenated JSON arrays one at a time.
+
+    Top-level arrays are unpacked element by element rather than decoded as a
+    whole; any other top-level value (for example a JSON Lines record) is
+    yielded as is.
+    """
+    reader = _ChunkReader(file, chunk_size)
+    while True:
+        char = reader.peek()
+        if char is None:
+            return
+        if char != "[":
+            yield reader.decode()
+            continue
+
+        # Walk the array ourselves so only one element is buffered at a time
+        reader.advance()
+        if reader.peek() == "]":
+            reader.advance()
+            continue
+        while True:
+            if reader.peek() is None:
+                raise reader.error("Unterminated array")
+            yield reader.decode()
+            char = reader.peek()
+            if char == ",":
+                reader.advance()
+            elif char == "]":
+                reader.advance()
+                break
+            elif char is None:
+                raise reader.error("Unterminated array")
+            else:
+                raise reader.error("Expecting ',' delimiter")
+
+
+def iter_legacy_file(path, chunk_size=CHUNK_SIZE):
+    """Yield the entries of a legacy JSON file."""
+    with open(path, "r", encoding="utf-8") as file:
+        yield from iter_legacy_entries(file, chunk_size)
+
+
+def compact_legacy_file(source, destination, chunk_size=CHUNK_SIZE):
+    """Rewrite a legacy file as JSON Lines in one streaming pass.
+
+    The output is written to a temporary file and moved into place only when
+    the whole input decoded cleanly.  Returns the number of records written.
+    """
+    temporary = destination + ".tmp"
+    count = 0
+    try:
+        with open(temporary, "w", encoding="utf-8") as output:
+            for entry in iter_legacy_file(source, chunk_size):
+                output.write(encode_record(entry))
+                count += 1
+        os.replace(temporary, destination)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return count
+
+
+def main(argv=None):
+    """Command line entry point: ``python -m survey_core.jsonstream compact FILE``."""
+    parser = argparse.ArgumentParser(description="Tools for legacy survey JSON files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact = subparsers.add_parser("compact", help="rewrite a legacy JSON file as JSON Lines")
+    compact.add_argument("source", help="legacy file, e.g. survey_data.json")
+    compact.add_argument("-o", "--output", help="output path (default: SOURCE with a .jsonl extension)")
+    compact.add_argument("-f", "--force", action="store_true", help="overwrite the output if it exists")
+    args = parser.parse_args(argv)
+
+    destination = args.output or os.path.splitext(args.source)[0] + ".jsonl"
+    if os.path.exists(destination) and not args.force:
+        parser.error(f"{destination} already exists (use --force to overwrite)")
+    count = compact_legacy_file(args.source, destination)
+    print(f"Wrote {count} records to {destination}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Cross-process file locks so several kiosks can share one data directory."""
+import os  # Importing OS module for file descriptors
+from contextlib import contextmanager  # Importing contextmanager to build the lock helper
+
+try:
+    import fcntl  # POSIX advisory locks
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt  # Windows byte-range locks
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on ``path`` for the duration of the block."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
@@ -0,0 +1,202 @@
+"""Lightweight latency metrics: timing decorators, histograms and a rotating log.
+
+Metrics are off unless ``"metrics": true`` is set in the config (or
+``SURVEY_METRICS=1``), or :func:`enable` is called.  While off, a timed
+call costs one flag check.
+
+    @timed("page.survey")
+    def create_survey_page(): ...
+
+    with timed("storage.append_viewers"):
+        ...
+"""
+import functools  # Importing functools to keep wrapped function metadata
+import json  # Importing JSON module for log lines
+import threading  # Importing threading for the registry lock and the reporter thread
+import time  # Importing time for the timers
+
+from survey_core.config import get_config
+
+BUCKETS = 40  # Histogram buckets; bucket i holds durations below 2**i microseconds
+LOG_MAX_BYTES = 1024 * 1024  # Size at which the metrics log is rotated
+LOG_BACKUPS = 3  # Rotated metrics logs kept
+
+_enabled = None  # Resolved from the config on first use
+_lock = threading.Lock()
+_histograms = {}
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        micros = int(seconds * 1e6)
+        self.counts[min(micros.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, fraction):
+        """Return an upper bound (in seconds) for the given percentile."""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return min((1 << bucket) / 1e6, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        """Return count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.maximum * 1000,
+        }
+
+
+def enabled():
+    global _enabled
+    if _enabled is None:
+        _enabled = bool(get_config()["metrics"])
+    return _enabled
+
+
+def enable(on=True):
+    """Turn metric collection on or off at run time."""
+    global _enabled
+    _enabled = on
+
+
+def record(name, seconds):
+    """Add one duration to the named histogram."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.record(seconds)
+
+
+def snapshot():
+    """Return ``{name: summary}`` for every histogram."""
+    with _lock:
+        return {name: histogram.summary() for name, histogram in sorted(_histograms.items())}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+class timed:
+    """Time a block (``with timed(name):``) or every call of a function (``@timed(name)``)."""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter() if enabled() else None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._start is not None:
+            record(self.name, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, function):
+        name = self.name
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+
+
+def instrument(obj, names, prefix):
+    """Wrap the named methods of ``obj`` with :class:`timed`, as ``prefix.method``."""
+    for name in names:
+        setattr(obj, name, timed(f"{prefix}.{name}")(getattr(obj, name)))
+    return obj
+
+
+def start_log(path, interval=60.0):
+    """Append a snapshot of all histograms to a rotating log every ``interval`` seconds.
+
+    Returns a function that writes a final snapshot and stops the reporter.
+    """
+    import logging.handlers  # Importing logging only once a log is started; it is slow to import
+
+    logger = logging.getLogger("survey.metrics")
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stop = threading.Event()
+
+    def write():
+        if enabled():
+            logger.info(json.dumps(snapshot()))
+
+    def run():
+        while not stop.wait(interval):
+            write()
+
+    threading.Thread(target=run, name="metrics-log", daemon=True).start()
+
+    def close():
+        stop.set()
+        write()
+        logger.removeHandler(handler)
+        handler.close()
+
+    return close
+
+
+class Stopwatch:
+    """Named checkpoints measured from a start time, for the startup report.
+
+    Each checkpoint is also recorded as a ``startup.<name>`` histogram when
+    metrics are on.
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, name):
+        elapsed = time.perf_counter() - self.start
+        self.marks.append((name, elapsed))
+        if enabled():
+            record(f"startup.{name}", elapsed)
+        return elapsed
+
+    def report(self):
+        """Return one line per checkpoint with the elapsed and incremental milliseconds."""
+        lines = ["Startup timings (ms since start / since previous):"]
+        previous = 0.0
+        for name, elapsed in self.marks:
+            lines.append(f"  {name:<14} {elapsed * 1000:8.1f} {(elapsed - previous) * 1000:8.1f}")
+            previous = elapsed
+        return "\n".join(lines)
@@ -0,0 +1,69 @@
+"""The survey's questions, the values each field may take, and form validation."""
+
+SEX_VALUES = ("Male", "Female", "Other")
+ETHNICITIES = ("White", "Black", "Chinese", "Asian", "Others")
+DISABLED_VALUES = ("Yes", "No")
+
+# Questionnaire questions, keyed "q1", "q2", ... in stored answers
+QUESTIONS = (
+    "Enjoyed the sculpture?",
+    "Were curious as to how it worked?",
+    "Wanted to know more about science as a result?",
+)
+QUESTION_KEYS = tuple(f"q{i}" for i in range(1, len(QUESTIONS) + 1))
+
+# Likert options; an option's score is its position, 1 (Strongly Agree) to 5
+OPTIONS = ("1. Strongly Agree", "2. Agree", "3. Neither Agree", "4. Disagree", "5. Strongly Disagree")
+
+# Demographic fields and the values they were collected with
+DEMOGRAPHICS = {
+    "sex": SEX_VALUES,
+    "ethnicity": ETHNICITIES,
+    "disabled": DISABLED_VALUES,
+}
+
+
+class ValidationError(ValueError):
+    """A submission that the survey form would not accept."""
+
+
+def parse_age(age):
+    """Return ``age`` as a float, or raise ValidationError if it is not a positive number."""
+    if isinstance(age, bool):
+        raise ValidationError("Please enter the age in integers.")
+    try:
+        age = float(age)
+    except (TypeError, ValueError):
+        raise ValidationError("Please enter the age in integers.") from None
+    if not age > 0 or age == float("inf"):
+        raise ValidationError("Please enter the age in integers.")
+    return age
+
+
+def validate_viewer(name, age, sex, ethnicity, disabled):
+    """Check a survey form submission and return the viewer record to store.
+
+    Raises ValidationError with the message shown to the respondent.
+    """
+    age = parse_age(age)
+    if not name or not sex or not ethnicity or not disabled:
+        raise ValidationError("Please fill out all fields.")
+    for field, value in (("sex", sex), ("ethnicity", ethnicity), ("disabled", disabled)):
+        if value not in DEMOGRAPHICS[field]:
+            raise ValidationError(f"Please choose a valid {field} option.")
+    return {
+        "name": name,
+        "age": age,
+        "sex": sex,
+        "ethnicity": ethnicity,
+        "disabled": disabled,
+    }
+
+
+def validate_answers(answers):
+    """Check questionnaire answers (question key -> option) and return them as a plain dict."""
+    if any(not answers.get(key) for key in QUESTION_KEYS):
+        raise ValidationError("Please answer all questions before submitting.")
+    if any(answers[key] not in OPTIONS for key in QUESTION_KEYS):
+        raise ValidationError("Please choose one of the listed options for every question.")
+    return {key: answers[key] for key in QUESTION_KEYS}
@@ -0,0 +1,365 @@
+"""Time-partitioned storage: one JSON Lines store per day (or other period).
+
+Every record is stamped with ``submitted_at`` and written to the partition
+of the period it was stored in::
+
+    partitions/
+        2026-10-16/  partition.json  summary.json  viewers_data.jsonl  ...
+        2026-10-17/  partition.json  viewers_data.jsonl  ...
+
+Each partition is a :class:`~survey_core.storage.JsonLinesStorage`, so
+appends keep its crash-safe commit.  IDs are assigned under one lock for
+the whole store, so every partition holds a contiguous range of respondent
+IDs starting at the ``first_id`` in its ``partition.json``.  A respondent's
+global ID is ``first_id`` plus the position of the record in the partition.
+
+When a new period starts, the partitions before it are closed and get a
+``summary.json`` with their viewer aggregates and answer count.  A
+date range (:meth:`PartitionedStorage.between`) then reads only the
+summaries and records of the partitions it overlaps.
+"""
+import json  # Importing JSON module for partition metadata and summaries
+import os  # Importing OS module for directories and atomic renames
+from bisect import bisect_right  # Importing bisect to find the partition holding an ID
+from contextlib import ExitStack, contextmanager  # Importing context helpers to keep partition files open
+from datetime import date, datetime, time, timedelta  # Importing datetime for partition periods
+
+from survey_core.aggregates import Aggregates, exact_summary
+from survey_core.config import get_config
+from survey_core.locking import file_lock
+from survey_core.rowsource import ChainedRowSource
+from survey_core.storage import LOCK_SUFFIX, JsonLinesStorage, Storage
+
+PARTITIONS_DIR = "partitions"  # Directory holding one sub-directory per partition
+PARTITION_FILE = "partition.json"  # Period and first respondent ID of a partition
+SUMMARY_FILE = "summary.json"  # Written when a partition is closed
+PERIODS = ("hour", "day", "week", "month")  # Supported partition lengths
+
+
+def period_bounds(moment, period="day"):
+    """Return the ``(start, end)`` of the period containing an aware datetime."""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown partition period: {period}")
+    if period == "hour":
+        start = moment.replace(minute=0, second=0, microsecond=0)
+        return start, _local(start.replace(tzinfo=None) + timedelta(hours=1))
+    day = moment.date()
+    if period == "week":
+        day -= timedelta(days=day.weekday())  # Weeks start on Monday
+    elif period == "month":
+        day = day.replace(day=1)
+    start = _local(datetime.combine(day, time()))
+    if period == "day":
+        following = day + timedelta(days=1)
+    elif period == "week":
+        following = day + timedelta(days=7)
+    else:
+        following = (day + timedelta(days=32)).replace(day=1)
+    return start, _local(datetime.combine(following, time()))
+
+
+def partition_name(start, period="day"):
+    """Return the directory name of the partition starting at ``start``."""
+    if period == "hour":
+        return start.strftime("%Y-%m-%dT%H")
+    if period == "week":
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return start.strftime("%Y-%m")
+    return start.strftime("%Y-%m-%d")
+
+
+def _local(moment):
+    """Attach the local time zone to a naive datetime."""
+    return moment.astimezone() if moment.tzinfo is None else moment
+
+
+def _now():
+    return datetime.now().astimezone()
+
+
+class Partition:
+    """One period's records, stored as a :class:`JsonLinesStorage`."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, PARTITION_FILE), "r", encoding="utf-8") as file:
+            meta = json.load(file)
+        self.first_id = meta["first_id"]
+        self.start = datetime.fromisoformat(meta["start"])
+        self.end = datetime.fromisoformat(meta["end"])
+        self.storage = JsonLinesStorage(path)
+        self._live_summary = None  # (file sizes, summary) of an open partition
+
+    @classmethod
+    def create(cls, path, first_id, start, end):
+        """Create an empty partition; the directory appears complete or not at all."""
+        temporary = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+        os.makedirs(temporary, exist_ok=True)
+        with open(os.path.join(temporary, PARTITION_FILE), "w", encoding="utf-8") as file:
+            json.dump({"first_id": first_id, "start": start.isoformat(), "end": end.isoformat()}, file)
+        os.replace(temporary, path)
+        return cls(path)
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def count(self):
+        """Return the number of committed viewer records."""
+        return self.storage.last_respondent_id() or 0
+
+    def _global(self, record):
+        # Records are numbered within the partition; shift them into the global ID space
+        return dict(record, respondent_id=record["respondent_id"] + self.first_id - 1)
+
+    def iter_viewers(self):
+        for record in self.storage.iter_viewers():
+            yield self._global(record)
+
+    def iter_answers(self):
+        return self.storage.iter_answers()
+
+    def get_viewer(self, respondent_id, read=None):
+        record = (read or self.storage.get_viewer)(respondent_id - self.first_id + 1)
+        return self._global(record) if record else None
+
+    def summary(self):
+        """Return this partition's summary, from ``summary.json`` once the partition is closed."""
+        path = os.path.join(self.path, SUMMARY_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        # Still open: recompute only when something was appended since the last call
+        sizes = tuple(
+            os.path.getsize(name) if os.path.exists(name) else 0
+            for name in (self.storage.viewers_path, self.storage.answers_path)
+        )
+        if self._live_summary is None or self._live_summary[0] != sizes:
+            self._live_summary = (sizes, self._compute_summary())
+        return self._live_summary[1]
+
+    def close(self):
+        """Write ``summary.json``; called when the next period's partition is created."""
+        summary = self._compute_summary()
+        temporary = os.path.join(self.path, SUMMARY_FILE + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(summary, file)
+        os.replace(temporary, os.path.join(self.path, SUMMARY_FILE))
+        return summary
+
+    @property
+    def closed(self):
+        return os.path.exists(os.path.join(self.path, SUMMARY_FILE))
+
+    def _compute_summary(self):
+        answers = sum(isinstance(record.get("answers"), dict) for record in self.storage.iter_answers())
+        return {
+            "partition": self.name,
+            "first_id": self.first_id,
+            "viewers": Aggregates.from_records(self.storage.iter_viewers()).to_dict(),
+            "answers": answers,
+        }
+
+
+class PartitionedStorage(Storage):
+    """Storage backend that splits the records into time partitions.
+
+    ``period`` is one of :data:`PERIODS` (default: the ``partition_period``
+    setting).  Records are routed by the time they are stored; a viewer's
+    answers go to the partition holding the viewer.
+    """
+
+    partitioned = True
+    cached_reads = False  # Partitions read through the tail cache (see cached())
+
+    def __init__(self, data_dir=".", period=None):
+        self.data_dir = data_dir
+        self.period = period or get_config()["partition_period"]
+        self.root = os.path.join(data_dir, PARTITIONS_DIR)
+        os.makedirs(self.root, exist_ok=True)
+        self.lock_path = os.path.join(self.root, "store" + LOCK_SUFFIX)
+        self._listing = (None, [])  # (directory mtime, partitions)
+
+    def partitions(self):
+        """Return every partition, oldest first."""
+        stamp = os.stat(self.root).st_mtime_ns
+        if self._listing[0] != stamp:
+            partitions = []
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if os.path.exists(os.path.join(path, PARTITION_FILE)):
+                    partition = Partition(path)
+                    if self.cached_reads:
+                        partition.storage = partition.storage.cached()
+                    partitions.append(partition)
+            partitions.sort(key=lambda partition: partition.first_id)
+            self._listing = (stamp, partitions)
+        return self._listing[1]
+
+    def _current(self, now):
+        """Return the partition new records go to, opening (and closing) partitions as periods pass."""
+        partitions = self.partitions()
+        # A clock that went backwards keeps writing to the latest partition, so IDs stay ordered
+        if partitions and now < partitions[-1].end:
+            return partitions[-1]
+        first_id = partitions[-1].first_id + partitions[-1].count() if partitions else 1
+        start, end = period_bounds(now, self.period)
+        path = os.path.join(self.root, partition_name(start, self.period))
+        if os.path.exists(os.path.join(path, PARTITION_FILE)):
+            # A period name reused after a change of partition_period; keep the names unique
+            path += f"-{first_id}"
+        partition = Partition.create(path, first_id, start, end)
+        for previous in partitions:
+            if not previous.closed:
+                previous.close()
+        self._listing = (None, [])
+        return partition
+
+    def _partition_of(self, respondent_id):
+        partitions = self.partitions()
+        position = bisect_right([partition.first_id for partition in partitions], respondent_id) - 1
+        return partitions[position] if position >= 0 else None
+
+    def _viewers_lock(self):
+        return file_lock(self.lock_path)
+
+    def _write_viewers(self, records):
+        now = _now()
+        partition = self._current(now)
+        stamp = now.isoformat(timespec="seconds")
+        with partition.storage._viewers_lock():
+            local_ids = partition.storage._write_viewers(
+                [record if record.get("submitted_at") else dict(record, submitted_at=stamp) for record in records]
+            )
+        return [partition.first_id + local_id - 1 for local_id in local_ids]
+
+    def append_answers(self, records):
+        if not records:
+            return
+        with file_lock(self.lock_path):
+            stamp = _now().isoformat(timespec="seconds")
+            groups = {}
+            for record in records:
+                respondent_id = record.get("respondent_id")
+                partition = self._partition_of(respondent_id) if respondent_id is not None else None
+                if partition is None:
+                    partition = self._current(_now())
+                groups.setdefault(partition.path, (partition, []))[1].append(
+                    record if record.get("submitted_at") else dict(record, submitted_at=stamp)
+                )
+            for partition, group in groups.values():
+                partition.storage.append_answers(group)
+                if partition.closed:
+                    partition.close()  # A questionnaire finished after its partition rotated
+
+    def iter_viewers(self):
+        for partition in self.partitions():
+            yield from partition.iter_viewers()
+
+    def iter_answers(self):
+        for partition in self.partitions():
+            yield from partition.iter_answers()
+
+    def get_viewer(self, respondent_id):
+        partition = self._partition_of(respondent_id) if respondent_id is not None else None
+        return partition.get_viewer(respondent_id) if partition else None
+
+    @contextmanager
+    def viewer_reader(self):
+        with ExitStack() as stack:
+            readers = {}
+
+            def read(respondent_id):
+                partition = self._partition_of(respondent_id) if respondent_id is not None else None
+                if partition is None:
+                    return None
+                if partition.path not in readers:
+                    readers[partition.path] = stack.enter_context(partition.storage.viewer_reader())
+                return partition.get_viewer(respondent_id, readers[partition.path])
+
+            yield read
+
+    def last_respondent_id(self):
+        partitions = self.partitions()
+        if not partitions:
+            return None
+        return partitions[-1].first_id + partitions[-1].count() - 1 or None
+
+    def answer_row_source(self):
+        return ChainedRowSource(partition.storage.answer_row_source() for partition in self.partitions())
+
+    def sync(self):
+        # Only the latest partitions are written to
+        for partition in self.partitions()[-2:]:
+            partition.storage.sync()
+
+    def cached(self):
+        if not get_config()["tail_cache"]:
+            return self
+        return self._view(cached_reads=True, _listing=(None, []))
+
+    def between(self, start=None, end=None):
+        """Return a read-only :class:`PartitionView` of the partitions overlapping a date range.
+
+        ``start`` and ``end`` are dates (both inclusive) or aware datetimes;
+        None leaves that side open.
+        """
+        if isinstance(end, date) and not isinstance(end, datetime):
+            end = datetime.combine(end + timedelta(days=1), time())
+        if isinstance(start, date) and not isinstance(start, datetime):
+            start = datetime.combine(start, time())
+        start = _local(start) if start is not None else None
+        end = _local(end) if end is not None else None
+        return PartitionView(self, [
+            partition for partition in self.partitions()
+            if (start is None or partition.end > start) and (end is None or partition.start < end)
+        ])
+
+
+class PartitionView:
+    """The records and summaries of some partitions, with the read methods of a storage backend."""
+
+    partitioned = True
+
+    def __init__(self, storage, partitions):
+        self.storage = storage
+        self.partitions = partitions
+
+    def iter_viewers(self):
+        for partition in self.partitions:
+            yield from partition.iter_viewers()
+
+    def iter_answers(self):
+        for partition in self.partitions:
+            yield from partition.iter_answers()
+
+    def get_viewer(self, respondent_id):
+        return self.storage.get_viewer(respondent_id)
+
+    def viewer_reader(self):
+        return self.storage.viewer_reader()
+
+    def last_respondent_id(self):
+        return self.storage.last_respondent_id()
+
+    def answer_row_source(self):
+        return ChainedRowSource(partition.storage.answer_row_source() for partition in self.partitions)
+
+    def between(self, start=None, end=None):
+        return self.storage.between(start, end)
+
+    def cached(self):
+        storage = self.storage.cached()
+        paths = {partition.path for partition in self.partitions}
+        return PartitionView(storage, [partition for partition in storage.partitions() if partition.path in paths])
+
+    def viewer_stats(self, exact=False):
+        """Merge the partitions' summaries (or scan their records with ``exact=True``)."""
+        if exact:
+            return exact_summary(self.iter_viewers())
+        aggregates = Aggregates()
+        for partition in self.partitions:
+            aggregates.merge(Aggregates.from_dict(partition.summary()["viewers"]))
+        return aggregates.summary()
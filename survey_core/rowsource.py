@@ -0,0 +1,146 @@
+"""Random access to the admin dashboard rows without loading them all.
+
+A row source behaves like a read-only sequence of ``(name, question,
+answer)`` tuples: ``len(source)`` is the number of rows seen by the last
+:meth:`refresh` and ``source.rows(start, stop)`` fetches one window of them.
+Large sources can be indexed in the background with ``scan()``/``apply()``.
+The dashboard grid only ever asks for the rows currently in view.
+"""
+import json  # Importing JSON module for decoding records
+import os  # Importing OS module for file sizes
+from array import array  # Importing array for compact offset tables
+from bisect import bisect_right  # Importing bisect to find the record holding a row
+
+from survey_core.storage import answer_rows
+
+BATCH_RECORDS = 5000  # Records indexed per batch handed back by scan()
+
+
+class JsonLinesRowSource:
+    """Row source over a JSON Lines answers file.
+
+    Keeps two compact tables with one entry per questionnaire record: the
+    byte offset of its line and the number of the first row it produces.
+    A window of rows is then read with a single seek.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = array("Q")  # Byte offset of each record that produces rows
+        self.row_starts = array("Q")  # Index of the first row of each record
+        self.total = 0  # Number of rows indexed so far
+        self.scanned = 0  # Byte offset up to which the file has been indexed
+
+    def __len__(self):
+        return self.total
+
+    def refresh(self):
+        """Index any records appended since the last refresh."""
+        for batch in self.scan():
+            self.apply(batch)
+
+    def scan(self, cancel=None, batch_records=BATCH_RECORDS):
+        """Yield batches indexing the records appended since the last refresh.
+
+        Scanning does not modify the source, so it can run on a worker
+        thread while the grid keeps reading rows; each batch is handed to
+        :meth:`apply` on the thread that owns the source.  Setting the
+        ``cancel`` event stops the scan after the current batch.
+        """
+        if not os.path.exists(self.path):
+            return
+        position = self.scanned
+        offsets, counts = array("Q"), array("Q")
+        with open(self.path, "rb") as file:
+            file.seek(position)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Still being written; pick it up next time
+                if line.strip():
+                    count = len(answer_rows(json.loads(line)))
+                    if count:
+                        offsets.append(position)
+                        counts.append(count)
+                position += len(line)
+                if len(offsets) >= batch_records:
+                    yield offsets, counts, position
+                    offsets, counts = array("Q"), array("Q")
+                    if cancel is not None and cancel.is_set():
+                        return
+        yield offsets, counts, position
+
+    def apply(self, batch):
+        """Add a batch produced by :meth:`scan` to the index."""
+        offsets, counts, position = batch
+        self.offsets.extend(offsets)
+        for count in counts:
+            self.row_starts.append(self.total)
+            self.total += count
+        self.scanned = position
+
+    def progress(self):
+        """Return the fraction of the file indexed so far."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return min(1.0, self.scanned / size) if size else 1.0
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``."""
+        stop = min(stop, self.total)
+        if start >= stop:
+            return []
+        record = bisect_right(self.row_starts, start) - 1
+        skip = start - self.row_starts[record]
+        result = []
+        with open(self.path, "rb") as file:
+            file.seek(self.offsets[record])
+            while len(result) < stop - start + skip:
+                line = file.readline()
+                if not line:
+                    break
+                if line.strip():
+                    result.extend(answer_rows(json.loads(line)))
+        return result[skip:skip + stop - start]
+
+
+class ChainedRowSource:
+    """Row source showing several sources one after another, e.g. one per storage partition."""
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+
+    def __len__(self):
+        return sum(len(source) for source in self.sources)
+
+    def refresh(self):
+        for source in self.sources:
+            source.refresh()
+
+    def scan(self, cancel=None):
+        """Scan each source in turn; batches are tagged with the source they belong to."""
+        for number, source in enumerate(self.sources):
+            for batch in source.scan(cancel):
+                yield number, batch
+            if cancel is not None and cancel.is_set():
+                return
+
+    def apply(self, batch):
+        number, batch = batch
+        self.sources[number].apply(batch)
+
+    def progress(self):
+        if not self.sources:
+            return 1.0
+        return sum(source.progress() for source in self.sources) / len(self.sources)
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``, fetched from the sources they fall in."""
+        result = []
+        offset = 0
+        for source in self.sources:
+            size = len(source)
+            if stop <= offset:
+                break
+            if start < offset + size:
+                result.extend(source.rows(max(start, offset) - offset, min(stop, offset + size) - offset))
+            offset += size
+        return result
@@ -0,0 +1,325 @@
+"""Indexed filtering and sorting of the admin dashboard rows.
+
+:class:`RowIndex` keeps every ``(name, question, answer)`` row as small
+integer codes, together with the demographics of the viewer who gave it.
+Every vocabulary is sorted, so a code's rank is also its sort order, and
+each column has a sorted permutation of the row numbers:
+
+* the permutation of the name column is the sorted name index; a name
+  prefix is a contiguous slice of it, found with two bisects;
+* for the categorical columns the same permutation, cut at the first row
+  of every value, is an inverted index from value to rows.
+
+A query starts from the shortest matching posting list and checks the
+remaining conditions with vectorized comparisons, so its cost depends on
+the size of the answer rather than the number of rows.  NumPy is required.
+"""
+from array import array  # Importing array to collect codes before handing them to NumPy
+from bisect import bisect_left  # Importing bisect for the name prefix search
+
+from survey_core.archive import NO_ANSWER, Archive
+from survey_core.model import DEMOGRAPHICS
+from survey_core.storage import answer_rows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+MISSING = -1  # Code of a row whose viewer is unknown
+SMALL_RESULT = 16  # Results under 1/16 of the rows are sorted directly instead of via the prebuilt order
+BUILD_BATCH = 10000  # Records read between cancellation checks while building
+FIELDS = ("name", "question", "answer") + tuple(DEMOGRAPHICS)  # Columns that can be filtered or sorted
+
+
+def available():
+    """Return True if NumPy is installed."""
+    return np is not None
+
+
+class _Vocabulary:
+    """Codes in order of first appearance, re-ranked into sorted order by :meth:`finish`."""
+
+    def __init__(self):
+        self.codes = {}
+
+    def encode(self, value):
+        return self.codes.setdefault(value, len(self.codes))
+
+    def finish(self, codes, key=None):
+        """Return the sorted values and ``codes`` rewritten as sort ranks."""
+        values = sorted(self.codes, key=key)
+        rank = np.empty(len(values) + 1, dtype=np.int32)
+        rank[[self.codes[value] for value in values]] = np.arange(len(values), dtype=np.int32)
+        rank[-1] = MISSING  # So MISSING (-1) maps to itself
+        return values, rank[codes]
+
+
+class RowIndex:
+    """Filterable, sortable snapshot of the dashboard rows."""
+
+    def __init__(self, vocabularies, codes):
+        self.vocabularies = vocabularies  # field -> sorted values
+        self.codes = codes  # field -> int32 code per row (MISSING if unknown)
+        self.folded_names = [str(name).casefold() for name in vocabularies["name"]]
+        self._postings = {}
+        self._descending = {}
+
+    def __len__(self):
+        return len(self.codes["name"])
+
+    @classmethod
+    def build(cls, data, cancel=None):
+        """Read every row from a storage backend or archive.
+
+        Rows come out in the same order as ``data.answer_row_source()``.
+        Returns None if ``cancel`` is set while building.
+        """
+        _require_numpy()
+        if isinstance(data, Archive):
+            return cls._build_from_archive(data, cancel)
+        viewer_codes = {field: array("h") for field in DEMOGRAPHICS}
+        demographic_vocabularies = {field: _Vocabulary() for field in DEMOGRAPHICS}
+        position_by_id, position_by_name = {}, {}
+        for position, record in enumerate(data.iter_viewers()):
+            for field, column in viewer_codes.items():
+                value = record.get(field)
+                column.append(demographic_vocabularies[field].encode(value) if value else MISSING)
+            position_by_id[record.get("respondent_id")] = position
+            position_by_name[record.get("name")] = position  # Last viewer with a name wins
+            if cancel is not None and position % BUILD_BATCH == 0 and cancel.is_set():
+                return None
+
+        row_vocabularies = {field: _Vocabulary() for field in ("name", "question", "answer")}
+        row_codes = {field: array("i") for field in row_vocabularies}
+        row_viewer = array("q")
+        # The loop below runs once per row, so it works on the raw dicts and arrays
+        names, questions, answers = (row_vocabularies[field].codes for field in ("name", "question", "answer"))
+        name_codes, question_codes, answer_codes = (row_codes[field] for field in ("name", "question", "answer"))
+        for count, record in enumerate(data.iter_answers()):
+            rows = answer_rows(record)
+            if not rows:
+                continue
+            # Legacy answers have no respondent ID and are matched by name
+            if record.get("respondent_id") is not None:
+                viewer = position_by_id.get(record["respondent_id"], MISSING)
+            else:
+                viewer = position_by_name.get(record.get("name"), MISSING)
+            name = names.setdefault(rows[0][0], len(names))
+            for _, question, answer in rows:
+                name_codes.append(name)
+                question_codes.append(questions.setdefault(question, len(questions)))
+                answer_codes.append(answers.setdefault(answer, len(answers)))
+                row_viewer.append(viewer)
+            if cancel is not None and count % BUILD_BATCH == 0 and cancel.is_set():
+                return None
+
+        vocabularies, codes = {}, {}
+        for field, vocabulary in row_vocabularies.items():
+            key = (lambda value: str(value).casefold()) if field == "name" else str
+            vocabularies[field], codes[field] = vocabulary.finish(np.frombuffer(row_codes[field], dtype=np.int32), key)
+        viewers = np.frombuffer(row_viewer, dtype=np.int64)
+        joined = viewers >= 0
+        for field, vocabulary in demographic_vocabularies.items():
+            values, ranked = vocabulary.finish(np.frombuffer(viewer_codes[field], dtype=np.int16).astype(np.int32), str)
+            column = np.full(len(viewers), MISSING, dtype=np.int32)
+            column[joined] = ranked[viewers[joined]]
+            vocabularies[field], codes[field] = values, column
+        return cls._prepared(vocabularies, codes)
+
+    @classmethod
+    def _build_from_archive(cls, archive, cancel=None):
+        """Build the index from an archive's columns, without a record per row.
+
+        The archive already joined every answer record to its viewer, so
+        only the vocabularies of the codes in use need re-ranking.
+        """
+        questions = archive.header["questions"]
+        answers = np.frombuffer(archive.column("answers"), dtype=np.uint8).reshape(-1, len(questions))
+        # One row per answered question, record after record, as ArchiveRowSource shows them
+        records, question_codes = np.nonzero(answers != NO_ANSWER)
+        names = np.frombuffer(archive.column("answer_name"), dtype=np.uint32).astype(np.int64)[records]
+        viewers = np.frombuffer(archive.column("answer_viewer"), dtype=np.int64)[records]
+        if cancel is not None and cancel.is_set():
+            return None
+
+        vocabularies, codes = {}, {}
+        vocabularies["name"], codes["name"] = _rank(
+            names, lambda code: archive.name(code) or "Unknown", key=lambda value: str(value).casefold()
+        )
+        vocabularies["question"], codes["question"] = _rank(question_codes, questions.__getitem__)
+        vocabularies["answer"], codes["answer"] = _rank(
+            answers[records, question_codes].astype(np.int64), archive.vocabularies["answer"].__getitem__
+        )
+        joined = viewers >= 0
+        for field in DEMOGRAPHICS:
+            values, ranked = _rank(
+                np.frombuffer(archive.column(field), dtype=np.int16).astype(np.int64), archive.vocabularies[field].__getitem__
+            )
+            column = np.full(len(viewers), MISSING, dtype=np.int32)
+            column[joined] = ranked[viewers[joined]]
+            vocabularies[field], codes[field] = values, column
+            if cancel is not None and cancel.is_set():
+                return None
+        return cls._prepared(vocabularies, codes)
+
+    @classmethod
+    def _prepared(cls, vocabularies, codes):
+        index = cls(vocabularies, codes)
+        for field in FIELDS:
+            # Build the sorted indexes now rather than on the first query
+            index._posting(field)
+            index._sorted(field, descending=True)
+        return index
+
+    def _posting(self, field):
+        """Return ``(rows sorted by field, first position of each code)``, built on first use."""
+        posting = self._postings.get(field)
+        if posting is None:
+            codes = self.codes[field]
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            # Rows with MISSING sort first; starts[code] is the first of each code
+            starts = np.searchsorted(codes[order], np.arange(len(self.vocabularies[field]) + 1))
+            posting = self._postings[field] = (order, starts)
+        return posting
+
+    def _sorted(self, field, descending):
+        """Return all rows ordered by ``field``, ties in storage order."""
+        if not descending:
+            return self._posting(field)[0]
+        order = self._descending.get(field)
+        if order is None:
+            order = self._descending[field] = np.argsort(-self.codes[field], kind="stable").astype(np.int32)
+        return order
+
+    def _code_range(self, field, value):
+        """Return the ``[low, high)`` code range matching a filter value."""
+        if field == "name":
+            prefix = value.casefold()
+            low = bisect_left(self.folded_names, prefix)
+            return low, bisect_left(self.folded_names, prefix + "\U0010ffff", low)
+        # Filter values come from the UI as text; compare them with the values' text
+        for code, known in enumerate(self.vocabularies[field]):
+            if str(known) == value:
+                return code, code + 1
+        return 0, 0
+
+    def query(self, filters=None, sort=None, descending=False):
+        """Return an :class:`IndexedRowSource` of the matching rows.
+
+        ``filters`` maps a field from :data:`FIELDS` to a value (a prefix for
+        ``name``); empty values are ignored.  ``sort`` names the column to
+        order by; ties keep the storage order.
+        """
+        ranges = {
+            field: self._code_range(field, value)
+            for field, value in (filters or {}).items() if value not in (None, "")
+        }
+        if ranges:
+            # Start from the shortest posting list and check the rest on its rows only
+            def size(field):
+                starts = self._posting(field)[1]
+                low, high = ranges[field]
+                return starts[high] - starts[low]
+
+            first = min(ranges, key=size)
+            order, starts = self._posting(first)
+            low, high = ranges[first]
+            rows = order[starts[low]:starts[high]]
+            for field, (low, high) in ranges.items():
+                if field != first:
+                    codes = self.codes[field][rows]
+                    rows = rows[(codes >= low) & (codes < high)]
+            if sort is None:
+                rows = np.sort(rows)
+            elif len(rows) * SMALL_RESULT < len(self):
+                rows = np.sort(rows)
+                keys = self.codes[sort][rows]
+                rows = rows[np.argsort(-keys if descending else keys, kind="stable")]
+            else:
+                # Large results: walk the prebuilt order and keep the matching rows
+                order = self._sorted(sort, descending)
+                selected = np.zeros(len(self), dtype=bool)
+                selected[rows] = True
+                rows = order[selected[order]]
+        elif sort is not None:
+            rows = self._sorted(sort, descending)
+        else:
+            rows = np.arange(len(self), dtype=np.int32)
+        return IndexedRowSource(self, rows)
+
+
+class IndexedRowSource:
+    """Row source over a query result; rows are rendered from the index codes."""
+
+    def __init__(self, index, rows):
+        self.index = index
+        self.row_ids = rows
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def refresh(self):
+        pass
+
+    def scan(self, cancel=None):
+        return iter(())
+
+    def apply(self, batch):
+        pass
+
+    def progress(self):
+        return 1.0
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``."""
+        selected = self.row_ids[start:stop]
+        columns = [
+            [self.index.vocabularies[field][code] for code in self.index.codes[field][selected].tolist()]
+            for field in ("name", "question", "answer")
+        ]
+        return list(zip(*columns))
+
+
+class IndexBuilder:
+    """Build a :class:`RowIndex` through :class:`survey_ui.loader.BackgroundLoader`.
+
+    ``scan()`` runs on the worker thread and yields the finished index once;
+    ``apply()`` stores it on the Tk thread.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.index = None
+
+    def scan(self, cancel=None):
+        index = RowIndex.build(self.data, cancel)
+        if index is not None:
+            yield index
+
+    def apply(self, index):
+        self.index = index
+
+    def progress(self):
+        return 1.0 if self.index is not None else 0.0
+
+
+def _rank(codes, value, key=str):
+    """Return the sorted values of the codes in use and ``codes`` rewritten as sort ranks.
+
+    ``value(code)`` gives the value of a code; codes with equal values get
+    the same rank, and MISSING stays MISSING.
+    """
+    used = np.unique(codes[codes >= 0]).tolist()
+    values = {code: value(code) for code in used}
+    ordered = sorted(set(values.values()), key=key)
+    position = {known: rank for rank, known in enumerate(ordered)}
+    rank = np.full(max(used, default=-1) + 2, MISSING, dtype=np.int32)  # The last entry maps MISSING (-1) to itself
+    for code, known in values.items():
+        rank[code] = position[known]
+    return ordered, rank[codes]
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Dashboard search requires NumPy (pip install numpy).")
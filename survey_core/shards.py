@@ -0,0 +1,225 @@
+"""Batch analysis of many kiosks' data files, spread over worker processes.
+
+A shard is one kiosk's data directory: its ``viewers_data`` and
+``survey_data`` files, as JSON Lines, in the legacy JSON format (also
+after they were renamed by the migration) or both.  Each worker parses one shard
+and returns a :class:`ShardSummary` of counts, sums and histograms; the
+summaries are merged in the parent as they arrive.  Answers are joined to
+their viewers within a shard, by respondent ID or, for legacy answers, by
+name.
+
+    python -m survey_core analyze kiosks/* --jobs 8
+
+Shards are handed out largest first, so no worker is left with one big
+shard at the end; with many shards the run time falls close to linearly
+with the number of cores.
+"""
+import os  # Importing OS module for shard file paths and sizes
+
+from survey_core.aggregates import Aggregates, record_age
+from survey_core.jsonstream import iter_legacy_file
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS
+from survey_core.storage import (
+    ANSWERS_FILE, LEGACY_ANSWERS_FILE, LEGACY_VIEWERS_FILE, MIGRATED_SUFFIX, VIEWERS_FILE, iter_json_lines,
+)
+
+SCORES = {option: score for score, option in enumerate(OPTIONS, start=1)}  # Likert option -> score
+
+
+def shard_files(directory):
+    """Return the ``(viewers, answers)`` lists of files to read for a shard.
+
+    A legacy file not migrated yet is read along with the JSON Lines file;
+    a migrated one (``.migrated``) only when there is no JSON Lines file,
+    as the migration copied its records into it.
+    """
+    found = []
+    for current, legacy in ((VIEWERS_FILE, LEGACY_VIEWERS_FILE), (ANSWERS_FILE, LEGACY_ANSWERS_FILE)):
+        current, legacy = os.path.join(directory, current), os.path.join(directory, legacy)
+        paths = [path for path in (legacy, current) if os.path.exists(path)]
+        if not os.path.exists(current) and os.path.exists(legacy + MIGRATED_SUFFIX):
+            paths.insert(0, legacy + MIGRATED_SUFFIX)
+        found.append(paths)
+    return tuple(found)
+
+
+def shard_size(directory):
+    """Return the number of bytes a worker will parse for a shard."""
+    return sum(os.path.getsize(path) for paths in shard_files(directory) for path in paths)
+
+
+def _records(paths):
+    # Legacy records first, as the migration would have appended the JSON Lines ones after them
+    for path in paths:
+        yield from iter_json_lines(path) if path.endswith(".jsonl") else iter_legacy_file(path)
+
+
+class ShardSummary:
+    """Mergeable partial results of the analysis of one or more shards.
+
+    Every figure is a count or a sum, so summaries of disjoint shards are
+    combined with :meth:`merge` in any order.  :meth:`report` returns the
+    same figures as :func:`survey_core.analytics.report`.
+    """
+
+    def __init__(self):
+        self.shards = 0
+        self.viewers = Aggregates()  # Count, age moments, age histogram and per-value counts
+        self.age_by = {field: {} for field in DEMOGRAPHICS}  # value -> [sum of ages, count]
+        self.answers = 0
+        self.distribution = {key: [0] * len(OPTIONS) for key in QUESTION_KEYS}
+        self.likert = {field: {} for field in DEMOGRAPHICS}  # value -> [[sum of scores, count] per question]
+
+    def add_viewer(self, record):
+        self.viewers.add_viewer(record)
+        age = record_age(record)
+        if age is None:
+            return
+        for field, groups in self.age_by.items():
+            value = record.get(field)
+            if value:
+                total = groups.setdefault(value, [0.0, 0])
+                total[0] += age
+                total[1] += 1
+
+    def add_answers(self, answers, viewer=None):
+        """Count one questionnaire record; ``viewer`` is the record of the respondent, if known."""
+        self.answers += 1
+        for column, key in enumerate(QUESTION_KEYS):
+            score = SCORES.get(answers.get(key))
+            if score is None:
+                continue
+            self.distribution[key][score - 1] += 1
+            if viewer is None:
+                continue
+            for field, groups in self.likert.items():
+                value = viewer.get(field)
+                if value:
+                    if value not in groups:
+                        groups[value] = [[0, 0] for _ in QUESTION_KEYS]
+                    totals = groups[value][column]
+                    totals[0] += score
+                    totals[1] += 1
+
+    def merge(self, other):
+        """Add the figures of a summary over other shards."""
+        self.shards += other.shards
+        self.viewers.merge(other.viewers)
+        for field, groups in other.age_by.items():
+            mine = self.age_by.setdefault(field, {})
+            for value, (total, count) in groups.items():
+                sums = mine.setdefault(value, [0.0, 0])
+                sums[0] += total
+                sums[1] += count
+        self.answers += other.answers
+        for key, counts in other.distribution.items():
+            self.distribution[key] = [mine + theirs for mine, theirs in zip(self.distribution[key], counts)]
+        for field, groups in other.likert.items():
+            mine = self.likert.setdefault(field, {})
+            for value, columns in groups.items():
+                sums = mine.setdefault(value, [[0, 0] for _ in QUESTION_KEYS])
+                for target, (total, count) in zip(sums, columns):
+                    target[0] += total
+                    target[1] += count
+        return self
+
+    def _values(self, field):
+        # The form's values first, then anything else found in the data
+        values = list(DEMOGRAPHICS[field])
+        for value in list(self.viewers.categories.get(field, {})) + list(self.likert[field]):
+            if value not in values:
+                values.append(value)
+        return values
+
+    def report(self):
+        """Return the figures shown in the analysis window, as :func:`survey_core.analytics.report` does.
+
+        The age histogram is the one the dashboard shows from the running
+        aggregates (:meth:`survey_core.aggregates.AgeHistogram.chart`).
+        """
+        group_counts, mean_likert, mean_age = {}, {}, {}
+        for field in DEMOGRAPHICS:
+            values = self._values(field)
+            counts = self.viewers.categories.get(field, {})
+            group_counts[field] = {value: counts.get(value, 0) for value in values}
+            mean_likert[field] = {
+                value: [
+                    total / count if count else None
+                    for total, count in self.likert[field].get(value, [[0, 0] for _ in QUESTION_KEYS])
+                ]
+                for value in values
+            }
+            mean_age[field] = {
+                value: (self.age_by[field][value][0] / self.age_by[field][value][1]
+                        if self.age_by[field].get(value, (0, 0))[1] else None)
+                for value in values
+            }
+        return {
+            "viewers": self.viewers.count,
+            "answers": self.answers,
+            "group_counts": group_counts,
+            "answer_distribution": self.distribution,
+            "mean_likert": mean_likert,
+            "mean_age": mean_age,
+            "age_histogram": self.viewers.age_histogram.chart(),
+        }
+
+
+def analyze_shard(directory):
+    """Parse one shard and return its :class:`ShardSummary`; runs in a worker process."""
+    summary = ShardSummary()
+    summary.shards = 1
+    viewers_paths, answers_paths = shard_files(directory)
+    by_id, by_name = {}, {}
+    for record in _records(viewers_paths):
+        summary.add_viewer(record)
+        # Keep only what the answers are grouped by
+        viewer = {field: record.get(field) for field in DEMOGRAPHICS}
+        if record.get("respondent_id") is not None:
+            by_id[record["respondent_id"]] = viewer
+        by_name[record.get("name")] = viewer  # Last viewer with a name wins
+    for record in _records(answers_paths):
+        answers = record.get("answers")
+        if not isinstance(answers, dict):
+            continue
+        # Legacy answers have no respondent ID and are matched by name
+        if record.get("respondent_id") is not None:
+            viewer = by_id.get(record["respondent_id"])
+        else:
+            viewer = by_name.get(record.get("name"))
+        summary.add_answers(answers, viewer)
+    return summary
+
+
+def analyze_shards(directories, workers=None, progress=None):
+    """Analyze shards on ``workers`` processes (default: one per core) and return the merged summary.
+
+    ``progress(done, total, directory)`` is called as each shard finishes.
+    With one worker or one shard everything runs in this process.
+    """
+    directories = sorted(directories, key=shard_size, reverse=True)
+    total = ShardSummary()
+    if workers == 1 or len(directories) <= 1:
+        for done, directory in enumerate(directories, start=1):
+            try:
+                total.merge(analyze_shard(directory))
+            except Exception as e:
+                raise RuntimeError(f"Could not analyze {directory}: {e}") from e
+            if progress:
+                progress(done, len(directories), directory)
+        return total
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed  # Importing the process pool only when it is used
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_shard, directory): directory for directory in directories}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                total.merge(future.result())
+            except Exception as e:
+                for pending in futures:
+                    pending.cancel()
+                raise RuntimeError(f"Could not analyze {futures[future]}: {e}") from e
+            if progress:
+                progress(done, len(directories), futures[future])
+    return total
@@ -0,0 +1,194 @@
+"""SQLite storage backend for deployments where several kiosks share one data directory."""
+import os  # Importing OS module for file and directory operations
+import sqlite3  # Importing sqlite3 for the database
+import threading  # Importing threading to keep one connection per thread
+
+from survey_core.locking import file_lock
+from survey_core.storage import LOCK_SUFFIX, Storage
+
+DATABASE_FILE = "survey_data.sqlite3"  # Database file created in the data directory
+BUSY_TIMEOUT_MS = 10000  # How long a writer waits for another kiosk to release the database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS viewers (
+    respondent_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    age REAL,
+    sex TEXT,
+    ethnicity TEXT,
+    disabled TEXT
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    respondent_id INTEGER REFERENCES viewers (respondent_id),
+    name TEXT,  -- only set for legacy answers recorded without a respondent ID
+    question TEXT NOT NULL,
+    answer TEXT
+);
+CREATE INDEX IF NOT EXISTS answers_respondent ON answers (respondent_id);
+CREATE INDEX IF NOT EXISTS answers_question ON answers (question, answer);
+CREATE INDEX IF NOT EXISTS viewers_sex ON viewers (sex);
+CREATE INDEX IF NOT EXISTS viewers_ethnicity ON viewers (ethnicity);
+CREATE INDEX IF NOT EXISTS viewers_disabled ON viewers (disabled);
+"""
+
+VIEWER_COLUMNS = ("respondent_id", "name", "age", "sex", "ethnicity", "disabled")
+
+
+class SqliteStorage(Storage):
+    """Store viewers and answers in normalized SQLite tables.
+
+    The database runs in WAL mode so kiosks can keep reading while another
+    one writes, and each batch of records is inserted in a single
+    transaction.
+    """
+
+    def __init__(self, data_dir="."):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, DATABASE_FILE)
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        """Return this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _viewers_lock(self):
+        # Kiosks sharing the database also share the aggregates sidecar next to it
+        return file_lock(self.path + LOCK_SUFFIX)
+
+    def _write_viewers(self, records):
+        connection = self._connect()
+        ids = []
+        with connection:
+            # Take the write lock up front so the batch is one short transaction
+            connection.execute("BEGIN IMMEDIATE")
+            for record in records:
+                cursor = connection.execute(
+                    "INSERT INTO viewers (name, age, sex, ethnicity, disabled) VALUES (?, ?, ?, ?, ?)",
+                    (record.get("name"), record.get("age"), record.get("sex"),
+                     record.get("ethnicity"), record.get("disabled")),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def append_answers(self, records):
+        rows = []
+        for record in records:
+            respondent_id = record.get("respondent_id")
+            # The name is already on the viewer row unless there is no ID to join on
+            name = None if respondent_id is not None else record.get("name")
+            answers = record.get("answers", {})
+            if isinstance(answers, dict):
+                for question, answer in answers.items():
+                    rows.append((respondent_id, name, question, answer))
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT INTO answers (respondent_id, name, question, answer) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def iter_viewers(self):
+        cursor = self._connect().execute(
+            "SELECT respondent_id, name, age, sex, ethnicity, disabled FROM viewers ORDER BY respondent_id"
+        )
+        for row in cursor:
+            yield dict(zip(VIEWER_COLUMNS, row))
+
+    def iter_answers(self):
+        cursor = self._connect().execute(
+            "SELECT a.respondent_id, COALESCE(v.name, a.name), a.question, a.answer"
+            " FROM answers AS a LEFT JOIN viewers AS v ON v.respondent_id = a.respondent_id"
+            " ORDER BY a.id"
+        )
+        # Regroup consecutive rows of one submission into a record
+        current, key = None, None
+        for respondent_id, name, question, answer in cursor:
+            if current is None or key != (respondent_id, name) or question in current["answers"]:
+                if current is not None:
+                    yield current
+                current = {"respondent_id": respondent_id, "name": name, "answers": {}}
+                key = (respondent_id, name)
+            current["answers"][question] = answer
+        if current is not None:
+            yield current
+
+    def iter_answer_rows(self):
+        cursor = self._connect().execute(
+            "SELECT COALESCE(v.name, a.name, 'Unknown'), a.question, a.answer"
+            " FROM answers AS a LEFT JOIN viewers AS v ON v.respondent_id = a.respondent_id"
+            " ORDER BY a.id"
+        )
+        yield from cursor
+
+    def answer_row_source(self):
+        return SqliteRowSource(self)
+
+    def get_viewer(self, respondent_id):
+        row = self._connect().execute(
+            "SELECT respondent_id, name, age, sex, ethnicity, disabled FROM viewers WHERE respondent_id = ?",
+            (respondent_id,),
+        ).fetchone()
+        return dict(zip(VIEWER_COLUMNS, row)) if row else None
+
+    def last_respondent_id(self):
+        return self._connect().execute("SELECT MAX(respondent_id) FROM viewers").fetchone()[0]
+
+    def sync(self):
+        # Commits are not fsynced in WAL mode with synchronous=NORMAL; a checkpoint is
+        self._connect().execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class SqliteRowSource:
+    """Row source over the answers table, in ``id`` order.
+
+    IDs may have gaps (rolled-back inserts, deleted rows), so a window is
+    fetched by position with LIMIT and OFFSET rather than by ID.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def refresh(self):
+        """Pick up rows inserted since the last refresh."""
+        for batch in self.scan():
+            self.apply(batch)
+
+    def scan(self, cancel=None):
+        """Yield the new row count; the query is cheap, so there is a single batch."""
+        yield self.storage._connect().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def apply(self, batch):
+        self.total = batch
+
+    def progress(self):
+        return 1.0
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``."""
+        stop = min(stop, self.total)
+        if start >= stop:
+            return []
+        return self.storage._connect().execute(
+            "SELECT COALESCE(v.name, a.name, 'Unknown'), a.question, a.answer"
+            " FROM answers AS a LEFT JOIN viewers AS v ON v.respondent_id = a.respondent_id"
+            " ORDER BY a.id LIMIT ? OFFSET ?",
+            (stop - start, start),
+        ).fetchall()
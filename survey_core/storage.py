@@ -0,0 +1,498 @@
+"""Append-only storage backends for viewer and survey records."""
+import copy  # Importing copy for the cached view of a backend
+import importlib  # Importing importlib to load storage backends on demand
+import json  # Importing JSON module for decoding records
+import os  # Importing OS module for file and directory operations
+import struct  # Importing struct to pack fixed-width index entries
+from contextlib import contextmanager, nullcontext  # Importing context manager helpers for readers and locks
+
+from survey_core import metrics
+from survey_core.aggregates import AGGREGATES_FILE, AggregateStore, exact_summary
+from survey_core.config import get_config
+from survey_core.jsonstream import encode_record, iter_legacy_file
+from survey_core.locking import file_lock
+
+VIEWERS_FILE = "viewers_data.jsonl"  # One viewer (demographics) record per line
+ANSWERS_FILE = "survey_data.jsonl"  # One questionnaire record per line
+INDEX_SUFFIX = ".idx"  # Respondent ID -> byte offset index kept next to the viewers file
+LOCK_SUFFIX = ".lock"  # Lock file guarding appends to a data file
+INDEX_ENTRY = struct.Struct("<Q")  # One little-endian 64-bit offset per respondent
+LEGACY_VIEWERS_FILE = "viewers_data.json"  # Old single JSON array of viewers
+LEGACY_ANSWERS_FILE = "survey_data.json"  # Old concatenated JSON arrays of answers
+MIGRATED_SUFFIX = ".migrated"  # Suffix given to legacy files once they were imported
+MIGRATION_BATCH = 10000  # Number of legacy records appended per write while migrating
+MIGRATION_OFFSET_SUFFIX = ".offset"  # Entries of a legacy file already imported, to resume an interrupted migration
+
+
+class Storage:
+    """Base class for survey storage backends.
+
+    Every viewer record is given a ``respondent_id`` when it is appended.  IDs
+    start at 1, increase monotonically and are unique even when several
+    processes write to the same store.  Running aggregates over the viewers
+    are updated alongside every append, under the same lock as the records
+    (see :mod:`survey_core.aggregates`).
+    """
+
+    data_dir = "."
+    partitioned = False  # True for backends that support between()
+
+    def append_viewers(self, records):
+        """Append viewer records and return the respondent IDs assigned to them."""
+        if not records:
+            return []
+        with self._viewers_lock():
+            ids = self._write_viewers(records)
+            try:
+                self.aggregates.update(records, ids[-1])
+            except Exception as e:
+                # The records are stored; the stale aggregates are rebuilt when next read
+                print(f"Error while updating the viewer aggregates: {e}")
+        return ids
+
+    def _viewers_lock(self):
+        """Return the lock held while viewers are written and the aggregates updated."""
+        return nullcontext()
+
+    def _write_viewers(self, records):
+        """Write viewer records to the backend and return their respondent IDs; called with the lock held."""
+        raise NotImplementedError
+
+    def append_answers(self, records):
+        """Append questionnaire records."""
+        raise NotImplementedError
+
+    def iter_viewers(self):
+        """Yield viewer records in insertion order."""
+        raise NotImplementedError
+
+    def iter_answers(self):
+        """Yield questionnaire records in insertion order."""
+        raise NotImplementedError
+
+    def get_viewer(self, respondent_id):
+        """Return the viewer record with the given ID, or None."""
+        raise NotImplementedError
+
+    @contextmanager
+    def viewer_reader(self):
+        """Yield a ``get_viewer``-like function for many lookups in a row.
+
+        Backends may keep their files open for the duration, e.g. to join
+        every answer of an export to its viewer.
+        """
+        yield self.get_viewer
+
+    def last_respondent_id(self):
+        """Return the most recently assigned respondent ID, or None."""
+        raise NotImplementedError
+
+    def iter_answer_rows(self):
+        """Yield ``(name, question, answer)`` rows for the admin dashboard."""
+        for entry in self.iter_answers():
+            yield from answer_rows(entry)
+
+    def answer_row_source(self):
+        """Return a random-access view of the dashboard rows (see :mod:`survey_core.rowsource`)."""
+        raise NotImplementedError
+
+    @property
+    def aggregates(self):
+        """Sidecar store with the running viewer aggregates."""
+        return AggregateStore(os.path.join(self.data_dir, AGGREGATES_FILE))
+
+    def rebuild_aggregates(self):
+        """Recompute the running aggregates from every stored viewer."""
+        with self._viewers_lock():
+            return self.aggregates.rebuild(self.iter_viewers())
+
+    def viewer_stats(self, exact=False):
+        """Return the viewer count, mean and standard deviation of age, and number of females.
+
+        Figures come from the running aggregates, which cost the same to read
+        however many viewers there are; the median and the 10th and 90th
+        percentiles of age are estimated from a histogram.  ``exact=True``
+        scans the stored records instead and sorts the ages.
+        """
+        if exact:
+            return self._scan_viewer_stats()
+        store = self.aggregates
+        aggregates = store.load() if store.exists() else None
+        # Aggregates are created (or given an age histogram) on the first run after an upgrade,
+        # and rebuilt if they missed an append, e.g. after a crash before they were saved
+        if aggregates is None or not aggregates.complete or aggregates.last_id != self.last_respondent_id():
+            aggregates = self.rebuild_aggregates()
+        return aggregates.summary()
+
+    def _scan_viewer_stats(self):
+        """Compute viewer_stats() with a full pass over the stored records."""
+        return exact_summary(self.iter_viewers())
+
+    def cached(self):
+        """Return a view of this backend for repeated full reads, e.g. by the dashboard.
+
+        Backends that can serve reads from the in-process tail cache (see
+        :mod:`survey_core.tailcache`) return a copy that does; others
+        return themselves.
+        """
+        return self
+
+    def _view(self, **attributes):
+        """Return a shallow copy with ``attributes`` set, for cached().
+
+        Methods timed by :func:`open_storage` are bound methods stored on the
+        instance, so they are wrapped again around the copy's own methods.
+        """
+        view = copy.copy(self)
+        timed = [name for name in STORAGE_CALLS if name in vars(self)]
+        for name in timed:
+            del vars(view)[name]
+        vars(view).update(attributes)
+        return metrics.instrument(view, timed, "storage")
+
+    def between(self, start=None, end=None):
+        """Return a read-only view of the records stored between two dates (partitioned backends only)."""
+        raise NotImplementedError(f"{type(self).__name__} does not keep records by date")
+
+    def append_viewer(self, record):
+        """Append a single viewer record and return its respondent ID."""
+        return self.append_viewers([record])[0]
+
+    def append_answer(self, record):
+        """Append a single questionnaire record."""
+        self.append_answers([record])
+
+    def sync(self):
+        """Force everything written so far onto the disk."""
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class JsonLinesStorage(Storage):
+    """Store records as JSON Lines, so each submission is one appended line.
+
+    Viewers get a companion index file holding one fixed-width byte offset per
+    respondent, so the record for a given ID is found with two seeks.  The
+    index entry is written after the record itself and acts as the commit
+    point: bytes past the last indexed record are discarded on the next
+    append.
+    """
+
+    cached_reads = False  # Serve iter_viewers() and friends from the tail cache
+
+    def __init__(self, data_dir="."):
+        self.data_dir = data_dir
+        self.viewers_path = os.path.join(data_dir, VIEWERS_FILE)
+        self.answers_path = os.path.join(data_dir, ANSWERS_FILE)
+        self.index_path = self.viewers_path + INDEX_SUFFIX
+
+    def _viewers_lock(self):
+        return file_lock(self.viewers_path + LOCK_SUFFIX)
+
+    def _write_viewers(self, records):
+        with open(self.viewers_path, "ab") as data, open(self.index_path, "ab") as index:
+            committed = self._recover(data, index)
+            next_id = index.tell() // INDEX_ENTRY.size + 1
+
+            # Stamp each record with its ID and remember where its line starts
+            ids, lines, entries = [], [], []
+            offset = committed
+            for respondent_id, record in enumerate(records, start=next_id):
+                line = encode_record(dict(record, respondent_id=respondent_id)).encode("utf-8")
+                ids.append(respondent_id)
+                lines.append(line)
+                entries.append(INDEX_ENTRY.pack(offset))
+                offset += len(line)
+
+            data.write(b"".join(lines))
+            data.flush()
+            index.write(b"".join(entries))
+        return ids
+
+    def append_answers(self, records):
+        with file_lock(self.answers_path + LOCK_SUFFIX):
+            _append_lines(self.answers_path, records)
+
+    def iter_viewers(self):
+        return self._read(self.viewers_path)
+
+    def iter_answers(self):
+        return self._read(self.answers_path)
+
+    def _read(self, path):
+        if self.cached_reads:
+            from survey_core.tailcache import shared_cache
+            return iter(shared_cache().records(path))
+        return iter_json_lines(path)
+
+    def cached(self):
+        if not get_config()["tail_cache"]:
+            return self
+        return self._view(cached_reads=True)
+
+    def sync(self):
+        for path in (self.viewers_path, self.index_path, self.answers_path):
+            if os.path.exists(path):
+                fd = os.open(path, os.O_RDWR)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+    def answer_row_source(self):
+        if self.cached_reads:
+            from survey_core.tailcache import CachedRowSource, shared_cache
+            return CachedRowSource(shared_cache(), self.answers_path)
+        from survey_core.rowsource import JsonLinesRowSource
+        return JsonLinesRowSource(self.answers_path)
+
+    def get_viewer(self, respondent_id):
+        if not os.path.exists(self.index_path):
+            return None
+        with open(self.index_path, "rb") as index, open(self.viewers_path, "rb") as data:
+            return _read_viewer(index, data, respondent_id)
+
+    @contextmanager
+    def viewer_reader(self):
+        if not os.path.exists(self.index_path):
+            yield lambda respondent_id: None
+            return
+        with open(self.index_path, "rb") as index, open(self.viewers_path, "rb") as data:
+            yield lambda respondent_id: _read_viewer(index, data, respondent_id)
+
+    def last_respondent_id(self):
+        # A read: no lock and no files created; a torn index entry is left out by the division
+        try:
+            count = os.path.getsize(self.index_path) // INDEX_ENTRY.size
+        except FileNotFoundError:
+            if not os.path.exists(self.viewers_path):
+                return None
+            # Older files have no index yet; it is built on the next append, so count the records
+            with open(self.viewers_path, "rb") as data:
+                count = sum(1 for line in data if line.endswith(b"\n") and line.strip())
+        return count or None
+
+    def _recover(self, data, index):
+        """Bring the data file and index back in step and return the committed data size.
+
+        Must be called with the lock held.  Builds the index if it is missing
+        and drops any partially written entries or records left by a crash.
+        """
+        data_size = data.seek(0, os.SEEK_END)
+        index_size = index.seek(0, os.SEEK_END)
+        if index_size % INDEX_ENTRY.size:
+            index_size -= index_size % INDEX_ENTRY.size
+            index.truncate(index_size)
+        if index_size == 0 and data_size > 0:
+            return self._rebuild_index(data, index)
+        if index_size == 0:
+            return 0
+
+        # The committed size ends with the last indexed line
+        with open(self.index_path, "rb") as reader:
+            reader.seek(index_size - INDEX_ENTRY.size)
+            (last_offset,) = INDEX_ENTRY.unpack(reader.read(INDEX_ENTRY.size))
+        with open(self.viewers_path, "rb") as reader:
+            reader.seek(last_offset)
+            committed = last_offset + len(reader.readline())
+        if data_size > committed:
+            data.truncate(committed)
+        data.seek(0, os.SEEK_END)
+        return committed
+
+    def _rebuild_index(self, data, index):
+        """Index every complete line of an existing viewers file."""
+        entries = []
+        offset = 0
+        with open(self.viewers_path, "rb") as reader:
+            for line in reader:
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    entries.append(INDEX_ENTRY.pack(offset))
+                offset += len(line)
+        data.truncate(offset)
+        data.seek(0, os.SEEK_END)
+        index.write(b"".join(entries))
+        index.flush()
+        return offset
+
+
+def _read_viewer(index, data, respondent_id):
+    """Look a viewer up through the open ID index and viewers file."""
+    if respondent_id is None or respondent_id < 1:
+        return None
+    index.seek((respondent_id - 1) * INDEX_ENTRY.size)
+    entry = index.read(INDEX_ENTRY.size)
+    if len(entry) < INDEX_ENTRY.size:
+        return None
+    (offset,) = INDEX_ENTRY.unpack(entry)
+    data.seek(offset)
+    record = json.loads(data.readline())
+    # Records written before IDs existed are numbered by their position
+    record.setdefault("respondent_id", respondent_id)
+    return record
+
+
+def answer_rows(entry):
+    """Return the ``(name, question, answer)`` rows of one questionnaire record."""
+    name = entry.get("name") or "Unknown"
+    answers = entry.get("answers", {})
+    if not isinstance(answers, dict):  # Skip entries whose answers are not properly formatted
+        return []
+    return [(name, question, answer) for question, answer in answers.items()]
+
+
+def _append_lines(path, records):
+    """Append records to a JSON Lines file with a single write."""
+    payload = "".join(encode_record(record) for record in records)
+    if not payload:
+        return
+    # Append mode never touches existing bytes, so the cost does not grow with the file
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(payload)
+
+
+def iter_json_lines(path):
+    """Lazily yield the records of a JSON Lines file."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            # A line without a newline is a write that was cut short, so skip it
+            if not line.endswith("\n") or not line.strip():
+                continue
+            yield json.loads(line)
+
+
+def migrate_legacy_files(storage, data_dir=None):
+    """Import legacy JSON files into the storage backend once.
+
+    Legacy files are looked up in the backend's data directory unless
+    ``data_dir`` is given.  Each legacy file is renamed with a ``.migrated`` suffix after it has been
+    imported, so calling this again is a no-op.  Returns the number of
+    viewer and answer records imported.
+    """
+    steps = migration_steps(storage, data_dir)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def migration_steps(storage, data_dir=None, cancel=None):
+    """Import legacy JSON files batch by batch, yielding the counts so far; return the totals.
+
+    The number of entries imported from a file is saved after every batch
+    (in a ``.offset`` file next to it), so a migration that was cancelled
+    or cut short by a crash resumes where it stopped instead of importing
+    the same records again; at worst, a crash between a batch's append and
+    the offset update repeats that one batch.  Setting ``cancel`` stops
+    after the current batch.
+    """
+    data_dir = data_dir or storage.data_dir
+    counts = {"viewers": 0, "answers": 0}
+    legacy = [
+        (LEGACY_VIEWERS_FILE, storage.append_viewers, "viewers"),
+        (LEGACY_ANSWERS_FILE, storage.append_answers, "answers"),
+    ]
+    for filename, append, key in legacy:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            continue
+        offset_path = path + MIGRATION_OFFSET_SUFFIX
+        done = _read_migration_offset(offset_path)
+        # Stream the legacy entries so the file is never held in memory as a whole
+        batch = []
+        for position, entry in enumerate(iter_legacy_file(path)):
+            if position < done:
+                continue  # Imported before the migration was interrupted
+            batch.append(entry)
+            if len(batch) >= MIGRATION_BATCH:
+                append(batch)
+                done += len(batch)
+                counts[key] += len(batch)
+                batch = []
+                _write_migration_offset(offset_path, done)
+                yield dict(counts)
+                if cancel is not None and cancel.is_set():
+                    return counts
+        if batch:
+            append(batch)
+            counts[key] += len(batch)
+        os.replace(path, path + MIGRATED_SUFFIX)
+        if os.path.exists(offset_path):
+            os.remove(offset_path)
+        yield dict(counts)
+    return counts
+
+
+def _read_migration_offset(path):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return int(file.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_migration_offset(path, offset):
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(str(offset))
+    os.replace(temporary, path)
+
+
+class MigrationJob:
+    """Run :func:`migration_steps` through :class:`survey_ui.loader.BackgroundLoader`.
+
+    ``counts`` holds the records imported so far, updated on the Tk thread.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.counts = {"viewers": 0, "answers": 0}
+
+    def scan(self, cancel=None):
+        yield from migration_steps(self.storage, cancel=cancel)
+
+    def apply(self, counts):
+        self.counts = counts
+
+    def progress(self):
+        return 0.0
+
+
+STORAGE_CALLS = (
+    "append_viewers", "append_answers", "get_viewer", "last_respondent_id",
+    "viewer_stats", "rebuild_aggregates", "sync",
+)  # Storage methods covered by the latency metrics
+
+BACKENDS = {
+    "jsonl": "survey_core.storage:JsonLinesStorage",
+    "sqlite": "survey_core.sqlite_storage:SqliteStorage",
+    "partitioned": "survey_core.partitions:PartitionedStorage",
+}
+
+_default_storage = None
+
+
+def open_storage(backend="jsonl", data_dir="."):
+    """Create a storage backend by name."""
+    try:
+        module_name, class_name = BACKENDS[backend].split(":")
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}") from None
+    factory = getattr(importlib.import_module(module_name), class_name)
+    # Storage calls are timed whenever metrics are switched on
+    return metrics.instrument(factory(data_dir), STORAGE_CALLS, "storage")
+
+
+def get_storage():
+    """Return the storage backend selected in the application settings."""
+    global _default_storage
+    if _default_storage is None:
+        config = get_config()
+        _default_storage = open_storage(config["storage"], config["data_dir"])
+    return _default_storage
@@ -0,0 +1,79 @@
+"""Storing survey and questionnaire submissions, independent of any user interface."""
+from survey_core.storage import get_storage
+from survey_core.writer import get_writer
+
+
+def viewer_record(name, age, sex, ethnicity, disabled):
+    """Build the record stored for one viewer."""
+    return {
+        "name": name,
+        "age": age,
+        "sex": sex,
+        "ethnicity": ethnicity,
+        "disabled": disabled,
+    }
+
+
+def queue_data(name, age, sex, ethnicity, disabled):
+    """Hand a viewer record to the background writer and return its ticket."""
+    return get_writer().submit_viewer(viewer_record(name, age, sex, ethnicity, disabled))
+
+
+def queue_survey_answers(answers, ticket, name):
+    """Hand questionnaire answers (question key -> option) to the background writer.
+
+    They are stored after the viewer behind ``ticket``.
+    """
+    survey_entry = {
+        "name": name,
+        "answers": dict(answers),
+    }
+    get_writer().submit_answers(ticket, survey_entry)
+
+
+def store_data(name, age, sex, ethnicity, disabled):
+    """Store a viewer record immediately and return its respondent ID."""
+    # Append the new entry as a single record, without rewriting earlier ones
+    respondent_id = get_storage().append_viewer(viewer_record(name, age, sex, ethnicity, disabled))
+
+    print(f"Data stored successfully as respondent {respondent_id}")
+    return respondent_id
+
+
+def get_last_name():
+    """Return the name of the most recent respondent, or None."""
+    storage = get_storage()
+    # Look the last respondent up through the ID index instead of parsing the file
+    entry = storage.get_viewer(storage.last_respondent_id())
+    return entry.get("name") if entry else None
+
+
+def store_survey_answers(answers, respondent_id=None, name=None):
+    """Store questionnaire answers (question key -> option) immediately.
+
+    Without a ``respondent_id`` the answers are attributed to the most recent
+    respondent.
+    """
+    if respondent_id is None:
+        # Fall back to the most recent respondent when called without an ID
+        storage = get_storage()
+        respondent_id = storage.last_respondent_id()
+        entry = storage.get_viewer(respondent_id)
+        name = entry.get("name") if entry else None
+
+    if respondent_id is not None:
+        # Prepare the survey data with the respondent's ID and name
+        survey_entry = {
+            "respondent_id": respondent_id,
+            "name": name,
+            "answers": dict(answers),
+        }
+
+        # Append the new survey entry as a single record
+        try:
+            get_storage().append_answer(survey_entry)
+            print("Survey responses stored successfully")
+        except Exception as e:
+            print(f"Error while storing survey responses: {e}")
+    else:
+        print("Error: Could not find the respondent in the viewers data.")
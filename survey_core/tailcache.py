@@ -0,0 +1,195 @@
+"""In-process cache of parsed JSON Lines records, extended from the file's tail.
+
+The Admin Dashboard and the analysis window read the whole data files
+every time they open.  The cache keeps the records parsed last time with
+the identity of the file they came from: inode, size, modification time,
+the offset up to which the file was read and the bytes just before it.
+
+* Nothing changed: the cached records are returned as they are.
+* The file grew and the bytes before the old offset are unchanged: only
+  the appended lines are read and decoded.
+* The file was replaced, truncated or rewritten in place: it is read again
+  from the start.
+
+Records are shared between callers and must not be modified.  The cache
+is used through :meth:`survey_core.storage.Storage.cached`.
+"""
+import json  # Importing JSON module for decoding records
+import os  # Importing OS module for file identity checks
+import threading  # Importing threading to guard entries read from worker threads
+from array import array  # Importing array for the compact row offsets
+from bisect import bisect_right  # Importing bisect to find the record holding a row
+
+from survey_core.storage import answer_rows
+
+TAIL_BYTES = 64  # Bytes before the read offset compared to detect a rewrite
+CHUNK_LINES = 5000  # Lines decoded between updates of an entry
+
+
+class _Entry:
+    """The parsed records of one file and what the file looked like when read."""
+
+    def __init__(self, inode):
+        self.inode = inode
+        self.mtime = None
+        self.size = None
+        self.offset = 0  # End of the last complete line read
+        self.tail = b""  # The TAIL_BYTES bytes before ``offset``
+        self.records = []
+        self.row_starts = array("Q")  # First dashboard row of each record, computed on demand
+        self.rows = 0
+
+    def count_rows(self, count):
+        """Extend ``row_starts`` to the first ``count`` records."""
+        for record in self.records[len(self.row_starts):count]:
+            self.row_starts.append(self.rows)
+            self.rows += len(answer_rows(record))
+
+
+class TailCache:
+    """Cache of parsed records keyed by file path; safe to use from several threads."""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def records(self, path):
+        """Bring the entry for ``path`` up to date and return its records."""
+        entry, count = None, 0
+        for entry, count in self.updates(path):
+            pass
+        return entry.records[:count] if entry else []
+
+    def updates(self, path, cancel=None):
+        """Bring the entry for ``path`` up to date, yielding ``(entry, count)`` as records are added.
+
+        ``entry.records[:count]`` is a consistent snapshot: records are only
+        ever appended to an entry, and a file that has to be read again gets
+        a new entry.  Setting ``cancel`` stops after the current chunk.
+        """
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            with self.lock:
+                self.entries.pop(path, None)
+            return
+        with file:
+            status = os.fstat(file.fileno())
+            with self.lock:
+                entry = self.entries.get(path)
+                if entry is not None and not self._extends(entry, file, status):
+                    entry = None
+                if entry is None:
+                    entry = self.entries[path] = _Entry(status.st_ino)
+                entry.mtime, entry.size = status.st_mtime_ns, status.st_size
+                start = entry.offset
+                count = len(entry.records)
+            yield entry, count
+            if start >= status.st_size:
+                return
+
+            file.seek(start)
+            position, lines = start, []
+            while True:
+                line = file.readline()
+                complete = line.endswith(b"\n")  # A line without a newline is still being written
+                if complete:
+                    lines.append(line)
+                if len(lines) < CHUNK_LINES and complete:
+                    continue
+                records = [json.loads(line) for line in lines if line.strip()]
+                end = position + sum(len(line) for line in lines)
+                with self.lock:
+                    if entry.offset != position:
+                        # Another thread read these lines first; carry on from where it got to
+                        position, lines = entry.offset, []
+                        file.seek(position)
+                        continue
+                    entry.records.extend(records)
+                    entry.offset = end
+                    count = len(entry.records)
+                if end > position:
+                    yield entry, count
+                position, lines = end, []
+                if not complete or (cancel is not None and cancel.is_set()):
+                    break
+            file.seek(max(0, position - TAIL_BYTES))
+            tail = file.read(position - file.tell())
+            with self.lock:
+                if entry.offset == position:
+                    entry.tail = tail
+
+    @staticmethod
+    def _extends(entry, file, status):
+        """Return True if the file is the cached one with (at most) lines appended."""
+        if status.st_ino != entry.inode or status.st_size < entry.offset:
+            return False
+        if status.st_size == entry.size and status.st_mtime_ns != entry.mtime:
+            return False  # Same size but modified: rewritten in place
+        if entry.offset:
+            file.seek(max(0, entry.offset - len(entry.tail)))
+            if file.read(len(entry.tail)) != entry.tail:
+                return False
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CachedRowSource:
+    """Dashboard row source served from the records in a :class:`TailCache`.
+
+    ``scan()`` brings the cache up to date on a worker thread; rows are
+    then taken from the parsed records, without touching the file again.
+    """
+
+    def __init__(self, cache, path):
+        self.cache = cache
+        self.path = path
+        self.entry = None
+        self.count = 0  # Records of ``entry`` shown
+        self.total = 0
+        self.fraction = 0.0
+
+    def __len__(self):
+        return self.total
+
+    def refresh(self):
+        for batch in self.scan():
+            self.apply(batch)
+
+    def scan(self, cancel=None):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        for entry, count in self.cache.updates(self.path, cancel):
+            with self.cache.lock:
+                entry.count_rows(count)
+                rows = entry.row_starts[count - 1] + len(answer_rows(entry.records[count - 1])) if count else 0
+            yield entry, count, rows, min(1.0, entry.offset / size) if size else 1.0
+
+    def apply(self, batch):
+        self.entry, self.count, self.total, self.fraction = batch
+
+    def progress(self):
+        return self.fraction
+
+    def rows(self, start, stop):
+        """Return the rows in ``[start, stop)``."""
+        stop = min(stop, self.total)
+        if start >= stop:
+            return []
+        record = bisect_right(self.entry.row_starts, start, 0, self.count) - 1
+        skip = start - self.entry.row_starts[record]
+        result = []
+        while len(result) < stop - start + skip and record < self.count:
+            result.extend(answer_rows(self.entry.records[record]))
+            record += 1
+        return result[skip:skip + stop - start]
+
+
+_cache = TailCache()
+
+
+def shared_cache():
+    """Return the cache shared by every storage backend in this process."""
+    return _cache
@@ -0,0 +1,230 @@
+"""Write-behind queue: submissions are stored by a background thread.
+
+The kiosk hands each submission to :class:`WriteBehindQueue` and carries
+on immediately.  A writer thread drains the queue, commits everything that
+is pending as one batch (group commit) and syncs to disk according to the
+configured policy:
+
+``"record"``
+    write and fsync every record on its own (safest, slowest);
+``"batch"``
+    one write and one fsync per batch;
+``"interval"``
+    one write per batch, fsync at most every ``fsync_interval`` seconds.
+"""
+import os  # Importing OS module for the spool directory path
+import queue  # Importing queue for the bounded submission queue
+import threading  # Importing threading for the writer thread
+import time  # Importing time for the fsync interval and retry delays
+
+from survey_core.config import get_config
+from survey_core.storage import get_storage
+
+FSYNC_POLICIES = ("record", "batch", "interval")
+RETRY_ATTEMPTS = 3  # Times a failing batch is retried before it is reported and dropped
+RETRY_DELAY = 1.0  # Seconds between retries
+
+
+class Ticket:
+    """Handle for a queued record; a viewer's ticket receives its respondent ID once stored."""
+
+    def __init__(self):
+        self.respondent_id = None
+        self.error = None
+        self._stored = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the record is stored and return its respondent ID."""
+        self._stored.wait(timeout)
+        return self.respondent_id
+
+    def done(self):
+        """Return True once the record was stored (or given up on)."""
+        return self._stored.is_set()
+
+    def _resolve(self, respondent_id=None, error=None):
+        self.respondent_id = respondent_id
+        self.error = error
+        self._stored.set()
+
+
+class WriteBehindQueue:
+    """Store submissions on a dedicated thread with group commit."""
+
+    def __init__(self, storage, maxsize=1000, batch_size=100, fsync="batch", fsync_interval=1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.storage = storage
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._closed = False
+        self.thread = threading.Thread(target=self._run, name="survey-writer", daemon=True)
+        self.thread.start()
+
+    def submit_viewer(self, record):
+        """Queue a viewer record and return its :class:`Ticket`.
+
+        Blocks only if the queue is full, i.e. the disk has fallen far behind.
+        """
+        ticket = Ticket()
+        self._put(("viewer", record, ticket))
+        return ticket
+
+    def submit_answers(self, ticket, record):
+        """Queue a questionnaire record for the viewer behind ``ticket``.
+
+        ``ticket`` may be None for answers without a known viewer.  Returns a
+        :class:`Ticket` resolved once the answers are stored.
+        """
+        done = Ticket()
+        self._put(("answers", record, (ticket, done)))
+        return done
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self.queue.join()
+
+    def close(self):
+        """Write everything still queued, sync and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError("The write queue is closed")
+        self.queue.put(item)
+
+    def _run(self):
+        while True:
+            timeout = self.fsync_interval if self._unsynced else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()  # Interval policy: nothing new arrived, sync what is pending
+                continue
+
+            # Group commit: take whatever else is already waiting, up to the batch size
+            batch = [item]
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            stop = batch[-1] is None
+            items = [entry for entry in batch if entry is not None]
+            if items:
+                self._commit(items)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                self._sync()
+                return
+
+    def _commit(self, items):
+        """Store one batch: viewers first, so answers in the same batch can use their IDs."""
+        if self.fsync == "record":
+            # One write and sync per record, in submission order
+            for item in items:
+                self._write([item])
+                self._sync()
+            return
+        self._write(items)
+        if self.fsync == "batch" or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _write(self, items):
+        """Store one batch: viewers first, so answers in the same batch can use their IDs.
+
+        Viewers and answers are retried separately, so records already
+        written are never written again.  Answers whose viewer could not be
+        stored are not written; their tickets carry the error instead.
+        """
+        viewers = [(record, ticket) for kind, record, ticket in items if kind == "viewer"]
+        answers = [(record, ticket) for kind, record, ticket in items if kind == "answers"]
+        if viewers:
+            ids, error = self._retry(self.storage.append_viewers, [record for record, _ in viewers])
+            for position, (_, ticket) in enumerate(viewers):
+                ticket._resolve(ids[position] if ids else None, error)
+
+        records, tickets = [], []
+        for record, (viewer, done) in answers:
+            if viewer is not None and viewer.error is not None:
+                done._resolve(error=RuntimeError(f"Answers not stored because their viewer was not: {viewer.error}"))
+                print(f"Dropped answers from {record.get('name')!r}: their viewer could not be stored")
+                continue
+            records.append(dict(record, respondent_id=viewer.respondent_id) if viewer is not None else record)
+            tickets.append(done)
+        if records:
+            _, error = self._retry(self.storage.append_answers, records)
+            for done in tickets:
+                done._resolve(error=error)
+
+    def _retry(self, append, records):
+        """Call ``append(records)`` up to RETRY_ATTEMPTS times; return ``(result, error)``."""
+        for attempt in range(1, RETRY_ATTEMPTS + 1):
+            try:
+                result = append(records)
+            except Exception as e:
+                print(f"Error while storing submissions (attempt {attempt}): {e}")
+                if attempt < RETRY_ATTEMPTS:
+                    time.sleep(RETRY_DELAY)
+                    continue
+                print(f"Dropped {len(records)} submissions after {RETRY_ATTEMPTS} attempts")
+                return None, e
+            self._unsynced = True
+            return result, None
+
+    def _sync(self):
+        if self._unsynced:
+            try:
+                self.storage.sync()
+            except Exception as e:
+                print(f"Error while syncing survey data: {e}")
+            self._unsynced = False
+        self._last_sync = time.monotonic()
+
+
+_default_writer = None
+
+
+def get_writer(local=False):
+    """Return the writer shared by the application, starting it on first use.
+
+    This is a :class:`WriteBehindQueue` over the local storage, or, when an
+    ``ingest_url`` is configured (and ``local`` is false), an
+    :class:`~survey_core.ingest.IngestClient` sending to that server.
+    """
+    global _default_writer
+    if _default_writer is None:
+        config = get_config()
+        if config["ingest_url"] and not local:
+            from survey_core.ingest import HttpTransport, IngestClient
+
+            spool_dir = os.path.join(config["data_dir"], config["spool_dir"])
+            _default_writer = IngestClient(HttpTransport(config["ingest_url"]), spool_dir)
+            return _default_writer
+        _default_writer = WriteBehindQueue(
+            get_storage(),
+            maxsize=config["write_queue_size"],
+            batch_size=config["write_batch_size"],
+            fsync=config["fsync"],
+            fsync_interval=config["fsync_interval"],
+        )
+    return _default_writer
+
+
+def close_writer():
+    """Flush and stop the shared writer, if it was started."""
+    global _default_writer
+    if _default_writer is not None:
+        _default_writer.close()
+        _default_writer = None
@@ -0,0 +1 @@
+"""Reusable Tk widgets for the Singing Sculpture survey app."""
@@ -0,0 +1,96 @@
+"""Tabs with the detailed analysis shown in the Statistical Analysis window."""
+import tkinter as tk  # Importing tkinter for the canvas and labels
+from tkinter import ttk  # Importing ttk for the notebook and tables
+
+from survey_core.model import OPTIONS, QUESTION_KEYS, QUESTIONS
+
+BAR_COLOR = "#118AB2"  # Fill colour of the age histogram bars
+
+
+def build_analysis_notebook(parent, report):
+    """Return a notebook with answer, demographic and age tabs for an analytics report."""
+    notebook = ttk.Notebook(parent)
+    notebook.add(_answers_tab(notebook, report), text="Answers")
+    notebook.add(_demographics_tab(notebook, report), text="By Demographic")
+    notebook.add(_age_tab(notebook, report), text="Age Distribution")
+    return notebook
+
+
+def _table(parent, columns, widths):
+    """Create a headings-only Treeview with a vertical scrollbar."""
+    frame = ttk.Frame(parent)
+    tree = ttk.Treeview(frame, columns=columns, show="headings")
+    for column, width in zip(columns, widths):
+        tree.heading(column, text=column)
+        tree.column(column, width=width, anchor="center")
+    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    tree.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+    return frame, tree
+
+
+def _answers_tab(parent, report):
+    """Number of respondents choosing each option, per question."""
+    columns = ("Question",) + tuple(option.split(". ", 1)[-1] for option in OPTIONS)
+    frame, tree = _table(parent, columns, (240,) + (95,) * len(OPTIONS))
+    distribution = report["answer_distribution"]
+    for key, question in zip(QUESTION_KEYS, QUESTIONS):
+        tree.insert("", "end", values=(question, *distribution.get(key, [0] * len(OPTIONS))))
+    return frame
+
+
+def _demographics_tab(parent, report):
+    """Viewer counts, mean age and mean Likert score per demographic group."""
+    columns = ("Group", "Viewers", "Mean Age") + tuple(key.upper() for key in QUESTION_KEYS)
+    frame, tree = _table(parent, columns, (180, 90, 90) + (100,) * len(QUESTION_KEYS))
+    for field, counts in report["group_counts"].items():
+        parent_item = tree.insert("", "end", values=(field.capitalize(), "", "", *[""] * len(QUESTION_KEYS)), open=True)
+        for value, count in counts.items():
+            mean_age = report["mean_age"][field].get(value)
+            scores = report["mean_likert"][field].get(value, [None] * len(QUESTION_KEYS))
+            tree.insert(
+                parent_item,
+                "end",
+                values=(value, count, _format(mean_age), *[_format(score) for score in scores]),
+            )
+    tree.configure(show=("tree", "headings"))
+    tree.column("#0", width=20, stretch=False)
+    return frame
+
+
+def _age_tab(parent, report):
+    """Bar chart of the age histogram."""
+    return build_age_chart(parent, report["age_histogram"])
+
+
+def build_age_chart(parent, histogram):
+    """Return a canvas with a bar chart of an age histogram given as ``(counts, edges)``."""
+    counts, edges = histogram
+    canvas = tk.Canvas(parent, bg="#FFFFFF", highlightthickness=0)
+
+    def draw(event=None):
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if not counts or width < 50 or height < 50:
+            return
+        left, right, top, bottom = 40, width - 20, 20, height - 40
+        tallest = max(counts) or 1
+        bar_width = (right - left) / len(counts)
+        for i, count in enumerate(counts):
+            x1 = left + i * bar_width + 4
+            x2 = left + (i + 1) * bar_width - 4
+            y1 = bottom - (bottom - top) * count / tallest
+            canvas.create_rectangle(x1, y1, x2, bottom, fill=BAR_COLOR, outline="")
+            canvas.create_text((x1 + x2) / 2, y1 - 8, text=str(count), font=("Arial", 9), fill="#555555")
+            canvas.create_text(
+                (x1 + x2) / 2, bottom + 14, text=f"{edges[i]:g}-{edges[i + 1]:g}", font=("Arial", 9), fill="#555555"
+            )
+        canvas.create_line(left, bottom, right, bottom, fill="#999999")
+
+    canvas.bind("<Configure>", draw)
+    return canvas
+
+
+def _format(value):
+    return "-" if value is None else f"{value:.2f}"
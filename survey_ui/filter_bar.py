@@ -0,0 +1,61 @@
+"""Filter controls above the Admin Dashboard table."""
+import tkinter as tk  # Importing tkinter for the entry variable
+from tkinter import ttk  # Importing ttk for the entry and comboboxes
+
+from survey_ui.images import Debouncer
+
+TYPING_DELAY_MS = 150  # Quiet period after a keystroke before the name filter runs
+
+# Filter field -> combobox width in characters; the first entry of each box turns the filter off
+CHOICES = {"question": 12, "answer": 17, "sex": 10, "ethnicity": 12, "disabled": 12}
+
+
+class FilterBar:
+    """A name prefix entry and one combobox per categorical field.
+
+    ``on_change()`` is called whenever a filter changes; typing in the name
+    entry is debounced.  :meth:`filters` returns the current selection in
+    the form taken by :meth:`survey_core.search.RowIndex.query`.
+    """
+
+    def __init__(self, parent, on_change):
+        self.frame = ttk.Frame(parent)
+        self.name = tk.StringVar()
+        ttk.Label(self.frame, text="Name:").pack(side="left")
+        self.name_entry = ttk.Entry(self.frame, textvariable=self.name, width=14)
+        self.name_entry.pack(side="left", padx=(2, 6))
+        self.name_entry.bind("<KeyRelease>", Debouncer(parent, lambda *args: on_change(), TYPING_DELAY_MS))
+
+        self.boxes = {}
+        for field, width in CHOICES.items():
+            box = ttk.Combobox(self.frame, values=(_any(field),), width=width, state="readonly")
+            box.set(_any(field))
+            box.pack(side="left", padx=(0, 6))
+            box.bind("<<ComboboxSelected>>", lambda event: on_change())
+            self.boxes[field] = box
+        self.set_enabled(False)
+
+    def place(self, **options):
+        self.frame.place(**options)
+
+    def set_choices(self, vocabularies):
+        """Offer the values present in the data, e.g. ``RowIndex.vocabularies``."""
+        for field, box in self.boxes.items():
+            box.configure(values=(_any(field),) + tuple(str(value) for value in vocabularies.get(field, ())))
+
+    def set_enabled(self, enabled):
+        self.name_entry.configure(state="normal" if enabled else "disabled")
+        for box in self.boxes.values():
+            box.configure(state="readonly" if enabled else "disabled")
+
+    def filters(self):
+        """Return ``{field: value}`` for the active filters."""
+        selected = {"name": self.name.get().strip()}
+        for field, box in self.boxes.items():
+            if box.get() != _any(field):
+                selected[field] = box.get()
+        return {field: value for field, value in selected.items() if value}
+
+
+def _any(field):
+    return f"Any {field}"
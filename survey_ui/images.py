@@ -0,0 +1,116 @@
+"""Decoded-image cache and event debouncing for canvas illustrations.
+
+PIL is only imported when an image has to be decoded or resampled; sizes
+already baked into the disk cache are loaded by Tk's own PNG reader.
+"""
+import hashlib  # Importing hashlib to key baked images by their source contents
+import os  # Importing OS module for the disk cache paths
+import tkinter as tk  # Importing tkinter for the native PhotoImage
+from collections import OrderedDict  # Importing OrderedDict for the LRU of resized images
+
+from survey_core import metrics
+
+MAX_VARIANTS = 4  # Resized copies kept per image
+DEBOUNCE_MS = 60  # Quiet period before a burst of events is handled
+
+
+class ImageCache:
+    """Decode an image file once and keep the most recently used resized copies.
+
+    ``photo(size)`` returns a ``PhotoImage`` of the requested size; repeated
+    calls with a size already in the cache cost a dictionary lookup.  With a
+    ``cache_dir``, each size is also baked to a PNG keyed by the source hash,
+    so later runs skip PIL altogether.
+    """
+
+    def __init__(self, path, max_variants=MAX_VARIANTS, cache_dir=None):
+        self.path = path
+        self.max_variants = max_variants
+        self.cache_dir = cache_dir
+        self._source = None
+        self._digest = None
+        self._variants = OrderedDict()
+
+    def source(self):
+        """Return the decoded full-resolution image, reading the file on first use."""
+        if self._source is None:
+            from PIL import Image  # Importing PIL only when an image has to be decoded
+
+            with Image.open(self.path) as image:
+                image.load()
+                self._source = image.copy()
+        return self._source
+
+    def baked_path(self, size):
+        """Return the disk cache file for ``size``, named after the source's SHA-256."""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            with open(self.path, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._digest = digest.hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{self._digest}-{size[0]}x{size[1]}.png")
+
+    def photo(self, size):
+        """Return a ``PhotoImage`` resized to ``size`` (width, height)."""
+        size = (int(size[0]), int(size[1]))
+        photo = self._variants.get(size)
+        if photo is not None:
+            self._variants.move_to_end(size)
+            return photo
+        if self.cache_dir is None:
+            photo = self._render(size)
+        else:
+            photo = self._baked(size)
+        self._variants[size] = photo
+        if len(self._variants) > self.max_variants:
+            self._variants.popitem(last=False)
+        return photo
+
+    def _render(self, size):
+        """Resample the source with PIL."""
+        from PIL import Image, ImageTk  # Importing PIL only when an image has to be resampled
+
+        with metrics.timed("image.resize"):
+            return ImageTk.PhotoImage(self.source().resize(size, Image.LANCZOS))
+
+    def _baked(self, size):
+        """Load ``size`` from the disk cache, baking it with PIL on a miss."""
+        path = self.baked_path(size)
+        if not os.path.exists(path):
+            from PIL import Image  # Importing PIL only when an image has to be resampled
+
+            with metrics.timed("image.bake"):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temporary = f"{path}.{os.getpid()}.tmp"
+                self.source().resize(size, Image.LANCZOS).save(temporary, "PNG")
+                os.replace(temporary, path)
+        with metrics.timed("image.load_baked"):
+            return tk.PhotoImage(file=path)
+
+
+class Debouncer:
+    """Collapse a burst of calls into one call after a quiet period.
+
+    Wrap an event handler with it, e.g. ``canvas.bind("<Configure>",
+    Debouncer(canvas, handler))``; only the last event of a burst reaches
+    the handler.
+    """
+
+    def __init__(self, widget, callback, delay_ms=DEBOUNCE_MS):
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._args = ()
+
+    def __call__(self, *args):
+        self._args = args
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        self.callback(*self._args)
@@ -0,0 +1,91 @@
+"""Index a row source on a worker thread and hand the results to Tk in small steps."""
+import queue  # Importing queue to pass batches between threads
+import threading  # Importing threading for the worker
+
+POLL_MS = 15  # Delay between checks for new batches
+MAX_BATCHES_PER_TICK = 4  # Batches applied per check, so the event loop stays responsive
+QUEUE_SIZE = 16  # Batches the worker may run ahead before it waits
+
+
+class _Done:
+    """Marker put on the queue when the worker finishes."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class BackgroundLoader:
+    """Run ``source.scan()`` on a worker thread and apply the batches from ``after()`` callbacks.
+
+    ``on_batch(source)`` is called on the Tk thread after every tick that
+    applied new batches, and ``on_done(source, error)`` once when loading
+    finished, failed or was cancelled.
+    """
+
+    def __init__(self, widget, source, on_batch=None, on_done=None):
+        self.widget = widget
+        self.source = source
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.cancelled = threading.Event()
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.thread = threading.Thread(target=self._work, name="dashboard-loader", daemon=True)
+        self._after_id = None
+
+    def start(self):
+        self.thread.start()
+        self._after_id = self.widget.after(POLL_MS, self._poll)
+
+    def cancel(self):
+        """Stop loading; rows already applied stay visible."""
+        self.cancelled.set()
+
+    def _work(self):
+        error = None
+        try:
+            for batch in self.source.scan(self.cancelled):
+                if not self._put(batch):
+                    return
+        except Exception as e:
+            error = e
+        self._put(_Done(error))
+
+    def _put(self, item):
+        """Queue an item, giving up if the load is cancelled while the queue is full."""
+        while True:
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self.cancelled.is_set():
+                    return False
+
+    def _poll(self):
+        self._after_id = None
+        if self.cancelled.is_set():
+            self._finish(None)
+            return
+        applied = False
+        for _ in range(MAX_BATCHES_PER_TICK):
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _Done):
+                if applied and self.on_batch:
+                    self.on_batch(self.source)
+                self._finish(item.error)
+                return
+            self.source.apply(item)
+            applied = True
+        if applied and self.on_batch:
+            self.on_batch(self.source)
+        try:
+            self._after_id = self.widget.after(POLL_MS, self._poll)
+        except Exception:
+            # The widget was destroyed; make sure the worker stops too
+            self.cancel()
+
+    def _finish(self, error):
+        if self.on_done:
+            self.on_done(self.source, error)
@@ -0,0 +1,91 @@
+"""Event-loop lag monitor and the admin Performance panel."""
+import time  # Importing time to measure how late timer callbacks fire
+import tkinter as tk  # Importing tkinter for the panel window
+from tkinter import ttk  # Importing ttk for the metrics table
+
+from survey_core import metrics
+
+LAG_INTERVAL_MS = 100  # How often the event loop is probed
+REFRESH_MS = 1000  # How often the Performance panel re-reads the histograms
+COLUMNS = ("Metric", "Count", "Mean ms", "p50 ms", "p95 ms", "p99 ms", "Max ms")
+
+
+class LagMonitor:
+    """Record how late a periodic ``after`` callback runs as ``tk.event_loop_lag``.
+
+    A late callback means the main loop was busy (building a page, waiting
+    on storage) and the window could not repaint or react to input.
+    """
+
+    def __init__(self, widget, interval_ms=LAG_INTERVAL_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._expected = None
+        self._after_id = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        if metrics.enabled():
+            metrics.record("tk.event_loop_lag", max(0.0, now - self._expected))
+        self._expected = now + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+
+def open_performance_panel(parent):
+    """Show a window listing every latency histogram, refreshed once a second."""
+    window = tk.Toplevel(parent)
+    window.title("Performance")
+    window.geometry("760x420")
+
+    collecting = tk.BooleanVar(value=metrics.enabled())
+    toolbar = ttk.Frame(window)
+    toolbar.pack(fill="x", padx=10, pady=(10, 0))
+    ttk.Checkbutton(
+        toolbar, text="Collect metrics", variable=collecting, command=lambda: metrics.enable(collecting.get())
+    ).pack(side="left")
+    ttk.Button(toolbar, text="Reset", command=lambda: (metrics.reset(), refresh(reschedule=False))).pack(side="right")
+
+    frame = ttk.Frame(window)
+    frame.pack(fill="both", expand=True, padx=10, pady=10)
+    tree = ttk.Treeview(frame, columns=COLUMNS, show="headings")
+    for column in COLUMNS:
+        tree.heading(column, text=column)
+        tree.column(column, width=220 if column == "Metric" else 85, anchor="w" if column == "Metric" else "e")
+    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    tree.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+
+    after_id = None
+
+    def refresh(reschedule=True):
+        nonlocal after_id
+        if not window.winfo_exists():
+            return
+        tree.delete(*tree.get_children())
+        for name, summary in metrics.snapshot().items():
+            tree.insert("", "end", values=(
+                name,
+                summary["count"],
+                *(f"{summary[key]:.2f}" for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")),
+            ))
+        if reschedule:
+            after_id = window.after(REFRESH_MS, refresh)
+
+    def stop(event):
+        # <Destroy> also fires for every child widget; only the window itself ends the refreshes
+        if event.widget is window and after_id is not None:
+            window.after_cancel(after_id)
+
+    window.bind("<Destroy>", stop)
+    refresh()
+    return window
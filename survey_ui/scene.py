@@ -0,0 +1,64 @@
+"""Retained-mode canvas layout: create items once, move them on resize."""
+
+BUTTON_FONT = ("Helvetica", 14, "bold")  # Font used for rounded button labels
+
+
+class Scene:
+    """Canvas items positioned by layout functions of the canvas size.
+
+    Each item is created once with a ``layout(width, height)`` callable
+    returning its coordinates.  :meth:`layout` applies them with
+    ``canvas.coords``, so a resize touches only coordinates and never
+    recreates items or rebinds their handlers.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = []  # (item id, layout function) pairs in stacking order
+
+    def add(self, item, layout):
+        """Register an existing canvas item with its layout function."""
+        self._items.append((item, layout))
+        return item
+
+    def oval(self, layout, **options):
+        return self.add(self.canvas.create_oval(0, 0, 0, 0, **options), layout)
+
+    def rectangle(self, layout, **options):
+        return self.add(self.canvas.create_rectangle(0, 0, 0, 0, **options), layout)
+
+    def text(self, layout, **options):
+        return self.add(self.canvas.create_text(0, 0, **options), layout)
+
+    def image(self, layout, **options):
+        return self.add(self.canvas.create_image(0, 0, **options), layout)
+
+    def button(self, layout, width, height, text, bg, fg, command):
+        """Add a rounded button centred on the point returned by ``layout``.
+
+        All parts of the button share one tag, which is bound to ``command``
+        once.  Returns the tag.
+        """
+        tag = f"button{len(self._items)}"
+        radius = height // 2
+
+        def part(offset):
+            # Coordinates of one part relative to the button centre
+            def layout_part(canvas_width, canvas_height):
+                x, y = layout(canvas_width, canvas_height)
+                x1, y1 = x - width // 2, y - height // 2
+                return x1 + offset[0], y1 + offset[1], x1 + offset[2], y1 + offset[3]
+            return layout_part
+
+        self.oval(part((0, 0, height, height)), fill=bg, outline=bg, tags=tag)  # Left circle
+        self.oval(part((width - height, 0, width, height)), fill=bg, outline=bg, tags=tag)  # Right circle
+        self.rectangle(part((radius, 0, width - radius, height)), fill=bg, outline=bg, tags=tag)  # Center rectangle
+        self.text(layout, text=text, font=BUTTON_FONT, fill=fg, tags=tag)
+        self.canvas.tag_bind(tag, "<Button-1>", lambda event: command())
+        return tag
+
+    def layout(self, width, height):
+        """Move every item to its position for a canvas of the given size."""
+        coords = self.canvas.coords
+        for item, layout in self._items:
+            coords(item, *layout(width, height))
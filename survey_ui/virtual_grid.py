@@ -0,0 +1,119 @@
+"""A Treeview that only materializes the rows currently in view."""
+from tkinter import ttk  # Importing ttk for the Treeview and Scrollbar widgets
+
+ROW_HEIGHT = 20  # Height of one Treeview row in pixels (the default ttk theme)
+HEADING_HEIGHT = 25  # Height reserved for the column headings
+PAGE_SIZE = 200  # Rows fetched from the source per request
+BUFFER_ROWS = 50  # Rows kept around the visible window so small scrolls need no fetch
+
+
+class VirtualGrid:
+    """Scrollable table backed by a row source (see :mod:`survey_core.rowsource`).
+
+    The Treeview holds exactly one item per visible line; scrolling rewrites
+    their values instead of inserting new items, so the widget's memory use
+    does not depend on how many rows the source has.
+    """
+
+    def __init__(self, parent, columns, source=None, widths=None, on_heading=None):
+        self.columns = columns
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", selectmode="browse")
+        for column in columns:
+            # on_heading(column) is called when a heading is clicked, e.g. to sort
+            command = (lambda column=column: on_heading(column)) if on_heading else ""
+            self.tree.heading(column, text=column, command=command)
+            self.tree.column(column, width=(widths or {}).get(column, 200), anchor="center")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+
+        self.source = source
+        self.first = 0  # Index of the top visible row
+        self.visible = 1  # Number of rows that fit in the widget
+        self._cache_start = 0
+        self._cache = []
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible))
+
+    def place(self, x, y, width, height, scrollbar_width=17):
+        """Place the table and its scrollbar like ``Widget.place``."""
+        self.tree.place(x=x, y=y, width=width, height=height)
+        self.scrollbar.place(x=x + width, y=y, width=scrollbar_width, height=height)
+
+    def set_source(self, source):
+        """Show a different row source, scrolled back to the top."""
+        self.source = source
+        self.first = 0
+        self.invalidate()
+
+    def set_sort_indicator(self, column, descending=False):
+        """Mark ``column`` (or none, if None) as the sort column in the headings."""
+        for name in self.columns:
+            arrow = (" \u25BC" if descending else " \u25B2") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+
+    def invalidate(self):
+        """Drop cached rows and redraw, e.g. after the source grew."""
+        self._cache_start, self._cache = 0, []
+        self.refresh()
+
+    def total(self):
+        return len(self.source) if self.source is not None else 0
+
+    def scroll_to(self, first):
+        """Make ``first`` the top visible row."""
+        self.first = max(0, min(int(first), self.total() - self.visible))
+        self.refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def refresh(self):
+        """Redraw the visible window and update the scrollbar."""
+        rows = self._window(self.first, self.first + self.visible)
+        items = self.tree.get_children()
+
+        # Reuse existing items, adding or removing only the difference
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.tree.insert("", "end", values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+
+        total = self.total()
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _window(self, start, stop):
+        """Return rows ``[start, stop)``, fetching a new page only when needed."""
+        cache_stop = self._cache_start + len(self._cache)
+        stop = min(stop, self.total())
+        if start < self._cache_start or stop > cache_stop:
+            fetch_start = max(0, start - BUFFER_ROWS)
+            fetch_stop = max(stop + BUFFER_ROWS, fetch_start + PAGE_SIZE)
+            self._cache_start = fetch_start
+            self._cache = self.source.rows(fetch_start, fetch_stop) if self.source is not None else []
+        offset = start - self._cache_start
+        return self._cache[offset:offset + stop - start]
+
+    def _on_configure(self, event):
+        self.visible = max(1, (event.height - HEADING_HEIGHT) // ROW_HEIGHT)
+        self.scroll_to(self.first)
+
+    def _on_mousewheel(self, event):
+        # Windows and macOS report wheel movement in multiples of 120 (or single steps on macOS)
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-3 * step)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * self.total())
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_by(amount * (self.visible if unit == "pages" else 1))
@@ -0,0 +1,39 @@
+"""Tests for the running viewer aggregates."""
+import random  # Importing random to generate ages
+import unittest  # Importing unittest for the test cases
+
+from survey_core.aggregates import QUANTILES, Aggregates, AgeHistogram, age_quantiles, exact_summary
+
+
+class AgeQuantileTest(unittest.TestCase):
+    """Histogram quantiles must match the exact ones for whole-year ages."""
+
+    def check(self, ages):
+        histogram = AgeHistogram()
+        histogram.add_many(ages)
+        expected = age_quantiles(sorted(ages))
+        for key, q in QUANTILES.items():
+            self.assertAlmostEqual(histogram.quantile(q), expected[key], msg=key)
+
+    def test_single_age(self):
+        self.check([30] * 25)
+
+    def test_random_ages(self):
+        generator = random.Random(7)
+        for size in (1, 2, 3, 10, 101, 1000):
+            self.check([generator.randint(1, 100) for _ in range(size)])
+
+    def test_summary_matches_exact_summary(self):
+        generator = random.Random(11)
+        records = [{"age": generator.randint(18, 90), "sex": "Female"} for _ in range(500)]
+        summary = Aggregates.from_records(records).summary()
+        exact = exact_summary(records)
+        for key in QUANTILES:
+            self.assertAlmostEqual(summary[key], exact[key], msg=key)
+
+    def test_empty(self):
+        self.assertIsNone(AgeHistogram().quantile(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the bulk importer."""
+import csv  # Importing csv to write CSV input
+import json  # Importing JSON module to write JSON Lines input
+import os  # Importing OS module for file paths
+import random  # Importing random to generate messy rows
+import tempfile  # Importing tempfile for throwaway input files and data directories
+import unittest  # Importing unittest for the test cases
+
+from survey_core import importer
+from survey_core.model import DEMOGRAPHICS, OPTIONS, QUESTION_KEYS, ValidationError
+from survey_core.storage import open_storage
+
+BATCH = 97  # Small batches, so rows of every kind fall on both sides of a batch boundary
+
+
+def messy_rows(count, seed=5):
+    """Return rows mixing valid respondents with every kind of mistake the validators catch."""
+    generator = random.Random(seed)
+    ages = [30, "41", 0, -3, "x", True, None, 2.5, float("nan"), "inf", [1]]
+    rows = []
+    for _ in range(count):
+        if generator.random() < 0.01:
+            rows.append(generator.choice(["{bad json", [1, 2], 5]))
+            continue
+        row = {"name": generator.choice(["Ann", "", None, "Bob"]), "age": generator.choice(ages)}
+        for field, allowed in DEMOGRAPHICS.items():
+            row[field] = generator.choice(list(allowed) * 3 + ["bogus", None, ""])
+        kind = generator.random()
+        if kind < 0.4:
+            for key in QUESTION_KEYS:
+                row[key] = generator.choice(list(OPTIONS) * 4 + ["", "nope"])
+        elif kind < 0.5:
+            row["answers"] = generator.choice([{key: OPTIONS[0] for key in QUESTION_KEYS}, {"q1": OPTIONS[0]}, "text", [1]])
+        rows.append(row)
+    return rows
+
+
+def row_by_row(path):
+    """Validate every row of a file on its own with validate_row()."""
+    viewers, answers, rejected, number = [], [], [], 0
+    for _, as_row, rows in importer.read_batches(path, BATCH):
+        for row in rows:
+            number += 1
+            try:
+                viewer, chosen = importer.validate_row(as_row(row))
+            except ValidationError as e:
+                rejected.append((number, str(e)))
+                continue
+            viewers.append(viewer)
+            answers.append(chosen)
+    return viewers, answers, rejected
+
+
+class ImporterTest(unittest.TestCase):
+    """The column-wise validation must accept and reject exactly the rows validate_row() does."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.rows = messy_rows(3000)
+
+    def write_jsonl(self):
+        path = os.path.join(self.directory, "rows.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            for row in self.rows:
+                file.write(row + "\n" if isinstance(row, str) else json.dumps(row) + "\n")
+        return path
+
+    def write_csv(self):
+        path = os.path.join(self.directory, "rows.csv")
+        fields = importer.VIEWER_FIELDS + QUESTION_KEYS
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for row in self.rows:
+                if isinstance(row, dict):
+                    writer.writerow(["" if row.get(field) is None else row[field] for field in fields])
+                else:
+                    writer.writerow(["Ann", "30"])  # A short row
+        return path
+
+    def check_matches_validate_row(self, path):
+        viewers, answers, report = importer.validate_batches(importer.read_batches(path, BATCH))
+        expected_viewers, expected_answers, expected_rejected = row_by_row(path)
+        self.assertTrue(expected_rejected and expected_viewers)
+        self.assertEqual([(number, error) for number, error, _ in report.rejected], expected_rejected)
+        self.assertEqual(viewers, expected_viewers)
+        self.assertEqual(answers, expected_answers)
+        self.assertEqual(report.accepted, len(expected_viewers))
+
+    def test_jsonl_matches_validate_row(self):
+        self.check_matches_validate_row(self.write_jsonl())
+
+    def test_csv_matches_validate_row(self):
+        self.check_matches_validate_row(self.write_csv())
+
+    def test_import_stores_accepted_rows(self):
+        path = self.write_jsonl()
+        storage = open_storage("jsonl", tempfile.mkdtemp())
+        report = importer.import_file(storage, path)
+        expected_viewers, expected_answers, _ = row_by_row(path)
+        self.assertEqual(len(list(storage.iter_viewers())), len(expected_viewers))
+        self.assertEqual(
+            [record["answers"] for record in storage.iter_answers()],
+            [chosen for chosen in expected_answers if chosen],
+        )
+        self.assertEqual(report.answered, sum(1 for chosen in expected_answers if chosen))
+
+        rejects = os.path.join(self.directory, "rejects.csv")
+        report.write_rejects(rejects)
+        with open(rejects, encoding="utf-8", newline="") as file:
+            written = list(csv.reader(file))
+        self.assertEqual(tuple(written[0]), importer.REJECT_COLUMNS)
+        self.assertEqual([int(row[0]) for row in written[1:]], [number for number, _, _ in report.rejected])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the ingestion service and the kiosk's spooling client."""
+import json  # Importing JSON module to read the rejects file
+import os  # Importing OS module for file paths
+import tempfile  # Importing tempfile for throwaway data and spool directories
+import threading  # Importing threading to notice the first failed send
+import unittest  # Importing unittest for the test cases
+
+from survey_core import ingest, writer
+from survey_core.model import OPTIONS, QUESTION_KEYS
+from survey_core.storage import open_storage
+
+VIEWER = {"name": "Ann", "age": 30, "sex": "Female", "ethnicity": "White", "disabled": "No"}
+ANSWERS = {"answers": {key: OPTIONS[0] for key in QUESTION_KEYS}}
+
+
+class FlakyTransport(ingest.LoopbackTransport):
+    """Loopback transport whose ``refused`` event is set on the first send made while offline."""
+
+    def __init__(self, service):
+        super().__init__(service)
+        self.refused = threading.Event()
+
+    def send(self, batch):
+        if not self.online:
+            self.refused.set()
+        return super().send(batch)
+
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = open_storage("jsonl", tempfile.mkdtemp())
+        self.writer = writer.WriteBehindQueue(self.storage)
+        self.keys_path = os.path.join(tempfile.mkdtemp(), ingest.KEYS_FILE)
+        self.service = ingest.IngestService(self.writer, self.keys_path)
+        self.transport = FlakyTransport(self.service)
+        self.client = ingest.IngestClient(self.transport, tempfile.mkdtemp())
+
+    def tearDown(self):
+        self.client.close()
+        self.writer.close()
+
+    def stored(self):
+        return len(list(self.storage.iter_viewers())), len(list(self.storage.iter_answers()))
+
+    def test_spool_is_resent_once_the_server_is_back(self):
+        self.transport.online = False
+        ticket = self.client.submit_viewer(VIEWER)
+        self.client.submit_answers(ticket, ANSWERS)
+        self.assertTrue(self.transport.refused.wait(5))
+        self.assertEqual(self.stored(), (0, 0))
+        self.assertGreater(self.client.pending(), 0)
+
+        self.transport.online = True
+        self.client.close()
+        self.assertEqual(self.client.pending(), 0)
+        self.assertEqual(self.stored(), (1, 1))
+        self.assertEqual(next(iter(self.storage.iter_answers()))["respondent_id"], 1)
+
+    def test_resent_batch_is_stored_once(self):
+        batch = {"submissions": [{"key": "k1", "viewer": VIEWER}, {"key": "k1", "answers": ANSWERS}]}
+        self.assertEqual(self.service.ingest(batch), 2)
+        # The acknowledgement was lost, so the kiosk sends the batch again
+        self.assertEqual(self.service.ingest(batch), 0)
+        # ... or sends it to a restarted server
+        restarted = ingest.IngestService(self.writer, self.keys_path)
+        self.assertEqual(restarted.ingest(batch), 0)
+        self.assertEqual(self.stored(), (1, 1))
+
+    def test_refused_submissions_are_set_aside(self):
+        self.client.submit_viewer(VIEWER)
+        self.client.submit_viewer(dict(VIEWER, age="thirty"))
+        self.client.submit_viewer(VIEWER)
+        self.client.close()
+
+        self.assertEqual(self.client.pending(), 0)
+        self.assertEqual(self.stored(), (2, 0))
+        with open(self.client.rejects_path, encoding="utf-8") as file:
+            rejects = [json.loads(line) for line in file]
+        self.assertEqual(len(rejects), 1)
+        self.assertEqual(rejects[0]["submission"]["viewer"]["age"], "thirty")
+        self.assertIn("age", rejects[0]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for the incremental decoding of legacy JSON files."""
+import io  # Importing io to feed text to the decoder
+import json  # Importing JSON module to build the legacy files
+import os  # Importing OS module for the compacted file
+import tempfile  # Importing tempfile for throwaway files
+import unittest  # Importing unittest for the test cases
+
+from survey_core.jsonstream import compact_legacy_file, iter_json_documents, iter_legacy_entries
+
+FIRST = [{"name": "Ann", "age": 31}, {"name": "Bob", "age": 1234}]
+SECOND = [{"name": "Cy", "answers": {"q1": "1. Strongly Agree"}}]
+
+
+class LegacyEntriesTest(unittest.TestCase):
+    """Concatenated arrays decode the same whatever the chunk size."""
+
+    def test_array_boundary_split_across_chunks(self):
+        text = json.dumps(FIRST) + json.dumps(SECOND)
+        boundary = text.index("][")
+        # Chunk sizes that cut the text right before, inside and after "]["
+        for chunk_size in range(1, len(text) + 1):
+            with self.subTest(chunk_size=chunk_size, cut=boundary % chunk_size):
+                self.assertEqual(list(iter_legacy_entries(io.StringIO(text), chunk_size)), FIRST + SECOND)
+
+    def test_number_cut_at_chunk_boundary(self):
+        text = "[1234][5]"
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(list(iter_legacy_entries(io.StringIO(text), chunk_size)), [1234, 5])
+
+    def test_whitespace_and_empty_arrays(self):
+        text = ' [ ] \n[{"a": 1} , {"b": 2}]\n[]'
+        self.assertEqual(list(iter_legacy_entries(io.StringIO(text), 3)), [{"a": 1}, {"b": 2}])
+
+    def test_unterminated_array(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_legacy_entries(io.StringIO('[{"a": 1}, {"b"'), 4))
+
+    def test_documents(self):
+        text = json.dumps(FIRST) + json.dumps(SECOND)
+        self.assertEqual(list(iter_json_documents(io.StringIO(text), 5)), [FIRST, SECOND])
+
+
+class CompactTest(unittest.TestCase):
+
+    def test_compact_writes_one_record_per_line(self):
+        directory = tempfile.mkdtemp()
+        source, destination = os.path.join(directory, "a.json"), os.path.join(directory, "a.jsonl")
+        with open(source, "w", encoding="utf-8") as file:
+            file.write(json.dumps(FIRST) + json.dumps(SECOND))
+        self.assertEqual(compact_legacy_file(source, destination, chunk_size=7), 3)
+        with open(destination, encoding="utf-8") as file:
+            self.assertEqual([json.loads(line) for line in file], FIRST + SECOND)
+
+
+if __name__ == "__main__":
+    unittest.main()
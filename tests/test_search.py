@@ -0,0 +1,65 @@
+"""Tests for the dashboard row index."""
+import os  # Importing OS module for file paths
+import tempfile  # Importing tempfile for throwaway data directories
+import unittest  # Importing unittest for the test cases
+
+from survey_core import archive, search
+from survey_core.storage import open_storage
+
+
+class _Records:
+    """Hides an archive behind its record iterators, so the index is built record by record."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def iter_viewers(self):
+        return self.data.iter_viewers()
+
+    def iter_answers(self):
+        return self.data.iter_answers()
+
+
+@unittest.skipUnless(search.available(), "NumPy is not installed")
+class ArchiveIndexTest(unittest.TestCase):
+    """An index built from an archive's columns must match one built from its records."""
+
+    def setUp(self):
+        data_dir = tempfile.mkdtemp()
+        storage = open_storage("jsonl", data_dir)
+        ids = storage.append_viewers([
+            {"name": "ann", "age": 30, "sex": "Female", "ethnicity": "White", "disabled": "No"},
+            {"name": "Bob", "age": 41, "sex": "Male", "ethnicity": "", "disabled": "Yes"},
+            {"name": "", "age": 19, "sex": "Other", "ethnicity": "Chinese", "disabled": "No"},
+        ])
+        storage.append_answers([
+            {"respondent_id": ids[0], "answers": {"q1": "2. Agree", "q2": "4. Disagree", "q3": "2. Agree"}},
+            {"respondent_id": ids[2], "answers": {"q3": "1. Strongly Agree"}},
+            {"name": "Bob", "answers": {"q1": "5. Strongly Disagree", "q2": "2. Agree"}},  # Legacy, joined by name
+            {"respondent_id": 99, "name": "Zed", "answers": {"q2": "3. Neither Agree"}},  # Unknown viewer
+            {"respondent_id": ids[1], "answers": {}},
+        ])
+        path = os.path.join(data_dir, archive.ARCHIVE_FILE)
+        archive.convert_storage(storage, path)
+        self.archive = archive.Archive(path)
+
+    def tearDown(self):
+        self.archive.close()
+
+    def test_columns_match_records(self):
+        columns = search.RowIndex.build(self.archive)
+        records = search.RowIndex.build(_Records(self.archive))
+        self.assertEqual(len(columns), self.archive.header["rows"])
+        for field in search.FIELDS:
+            self.assertEqual(columns.vocabularies[field], records.vocabularies[field], field)
+            self.assertEqual(columns.codes[field].tolist(), records.codes[field].tolist(), field)
+
+        source = self.archive.answer_row_source()
+        view = columns.query()
+        self.assertEqual(view.rows(0, len(view)), source.rows(0, len(source)))
+        view = columns.query({"sex": "Male"}, sort="answer")
+        self.assertEqual(view.rows(0, len(view)), [("Bob", "q2", "2. Agree"), ("Bob", "q1", "5. Strongly Disagree")])
+
+
+if __name__ == "__main__":
+    unittest.main()
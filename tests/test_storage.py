@@ -0,0 +1,42 @@
+"""Tests for the storage backends."""
+import tempfile  # Importing tempfile for throwaway data directories
+import unittest  # Importing unittest for the test cases
+
+from survey_core import metrics
+from survey_core.storage import STORAGE_CALLS, open_storage
+
+
+class CachedViewTest(unittest.TestCase):
+    """The cached view of a backend must run its timed methods on itself."""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        metrics.enable(True)
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.enable(False)
+        metrics.reset()
+
+    def check_backend(self, backend):
+        storage = open_storage(backend, self.data_dir)
+        storage.append_viewers([{"name": "Ann", "age": 30, "sex": "Female"}])
+        view = storage.cached()
+        self.assertTrue(view.cached_reads)
+        for name in STORAGE_CALLS:
+            self.assertIs(getattr(view, name).__wrapped__.__self__, view, name)
+
+        stats = view.viewer_stats()
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(view.get_viewer(1)["name"], "Ann")
+        self.assertEqual(metrics.snapshot()["storage.viewer_stats"]["count"], 1)
+
+    def test_jsonl(self):
+        self.check_backend("jsonl")
+
+    def test_partitioned(self):
+        self.check_backend("partitioned")
+
+
+if __name__ == "__main__":
+    unittest.main()
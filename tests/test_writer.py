@@ -0,0 +1,122 @@
+"""Tests for the write-behind queue."""
+import threading  # Importing threading to hold the writer back
+import unittest  # Importing unittest for the test cases
+from unittest import mock  # Importing mock to skip the retry delay
+
+from survey_core import writer
+
+
+class FakeStorage:
+    """Records every call; ``fail_viewers`` makes append_viewers raise."""
+
+    def __init__(self):
+        self.viewer_batches = []
+        self.answer_batches = []
+        self.syncs = 0
+        self.fail_viewers = False
+        self.gate = None  # Event append_viewers waits for on its first call
+        self.entered = threading.Event()  # Set once the writer is waiting on the gate
+
+    def append_viewers(self, records):
+        if self.gate is not None:
+            gate, self.gate = self.gate, None
+            self.entered.set()
+            gate.wait(5)
+        if self.fail_viewers:
+            raise OSError("disk full")
+        start = sum(len(batch) for batch in self.viewer_batches) + 1
+        self.viewer_batches.append(list(records))
+        return list(range(start, start + len(records)))
+
+    def append_answers(self, records):
+        self.answer_batches.append(list(records))
+
+    def sync(self):
+        self.syncs += 1
+
+
+@mock.patch.object(writer, "RETRY_DELAY", 0)
+class WriteBehindQueueTest(unittest.TestCase):
+
+    def test_group_commit(self):
+        storage = FakeStorage()
+        gate = storage.gate = threading.Event()
+        queue = writer.WriteBehindQueue(storage, batch_size=100)
+        first = queue.submit_viewer({"name": "first"})
+        storage.entered.wait(5)
+        # The writer is held in the first append, so these queue up and go in one batch
+        tickets = [queue.submit_viewer({"name": f"v{i}"}) for i in range(10)]
+        gate.set()
+        queue.close()
+        self.assertEqual([len(batch) for batch in storage.viewer_batches], [1, 10])
+        self.assertEqual(first.respondent_id, 1)
+        self.assertEqual([ticket.wait(1) for ticket in tickets], list(range(2, 12)))
+
+    def test_answers_get_their_viewer_id(self):
+        storage = FakeStorage()
+        queue = writer.WriteBehindQueue(storage)
+        ticket = queue.submit_viewer({"name": "Ann"})
+        done = queue.submit_answers(ticket, {"name": "Ann", "answers": {"q1": "1. Strongly Agree"}})
+        queue.close()
+        self.assertIsNone(done.error)
+        self.assertEqual(storage.answer_batches[0][0]["respondent_id"], ticket.respondent_id)
+
+    def test_failed_viewer_fails_its_answers(self):
+        storage = FakeStorage()
+        storage.fail_viewers = True
+        queue = writer.WriteBehindQueue(storage)
+        with mock.patch("builtins.print"):
+            ticket = queue.submit_viewer({"name": "Ann"})
+            done = queue.submit_answers(ticket, {"name": "Ann", "answers": {}})
+            unlinked = queue.submit_answers(None, {"name": "Bob", "answers": {}})
+            queue.close()
+        self.assertIsInstance(ticket.error, OSError)
+        self.assertIsNone(ticket.respondent_id)
+        self.assertIsNotNone(done.error)
+        self.assertIsNone(unlinked.error)
+        # Only the answers without a failed viewer were written
+        self.assertEqual([[record["name"] for record in batch] for batch in storage.answer_batches], [["Bob"]])
+
+    def test_fsync_record(self):
+        storage = FakeStorage()
+        gate = storage.gate = threading.Event()
+        queue = writer.WriteBehindQueue(storage, fsync="record")
+        queue.submit_viewer({"name": "first"})
+        storage.entered.wait(5)
+        for i in range(3):
+            queue.submit_viewer({"name": f"v{i}"})
+        gate.set()
+        queue.close()
+        self.assertEqual(len(storage.viewer_batches), 4)
+        self.assertEqual(storage.syncs, 4)
+
+    def test_fsync_batch(self):
+        storage = FakeStorage()
+        gate = storage.gate = threading.Event()
+        queue = writer.WriteBehindQueue(storage, fsync="batch")
+        queue.submit_viewer({"name": "first"})
+        storage.entered.wait(5)
+        for i in range(3):
+            queue.submit_viewer({"name": f"v{i}"})
+        gate.set()
+        queue.close()
+        self.assertEqual(len(storage.viewer_batches), 2)
+        self.assertEqual(storage.syncs, 2)
+
+    def test_fsync_interval(self):
+        storage = FakeStorage()
+        queue = writer.WriteBehindQueue(storage, fsync="interval", fsync_interval=60)
+        for i in range(3):
+            queue.submit_viewer({"name": f"v{i}"})
+        queue.flush()
+        self.assertEqual(storage.syncs, 0)  # Within the interval nothing is synced yet
+        queue.close()
+        self.assertEqual(storage.syncs, 1)  # Closing syncs what is pending
+
+    def test_unknown_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            writer.WriteBehindQueue(FakeStorage(), fsync="never")
+
+
+if __name__ == "__main__":
+    unittest.main()